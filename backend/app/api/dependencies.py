@@ -3,9 +3,20 @@ from fastapi import Depends
 from app.application.services.user_service import UserService
 from app.application.services.auth_service import AuthService
 from app.application.services.efficiency_service import EfficiencyService
+from app.application.services.ingest_service import IngestService
 
 from app.domain.ports.cache_service import CacheService
-from app.infrastructure.cache import cache_service
+from app.infrastructure.tiered_cache import tiered_cache_service
+
+from app.domain.ports.building_index import BuildingIndex
+from app.infrastructure.building_index import building_index
+from app.domain.ports.building_leaderboard import BuildingLeaderboard
+from app.infrastructure.building_leaderboard import building_leaderboard
+
+from app.domain.ports.calculation_executor import CalculationExecutor
+from app.infrastructure.executor import calculation_executor
+from app.infrastructure.memory_cache import LRUCache, calculation_memo
+from app.infrastructure.single_flight import SingleFlight, cache_single_flight
 
 from app.domain.ports.user_repository import UserRepository
 from app.domain.ports.auth_repository import AuthRepository
@@ -29,7 +40,7 @@ def get_user_repository() -> UserRepository:
 
 def get_cache_service() -> CacheService:
     """Get cache service instance"""
-    return cache_service
+    return tiered_cache_service
 
 
 def get_user_service(
@@ -69,9 +80,55 @@ def get_efficiency_repository() -> EfficiencyRepository:
     return MongodbEfficiencyRepository()
 
 
+def get_calculation_executor() -> CalculationExecutor:
+    """Get calculation executor instance"""
+    return calculation_executor
+
+
+def get_calculation_memo() -> LRUCache:
+    """Get calculation memo instance"""
+    return calculation_memo
+
+
+def get_single_flight() -> SingleFlight:
+    """Get single-flight instance for cache-miss loads"""
+    return cache_single_flight
+
+
+def get_building_index() -> BuildingIndex:
+    """Get building index instance"""
+    return building_index
+
+
+def get_building_leaderboard() -> BuildingLeaderboard:
+    """Get building leaderboard instance"""
+    return building_leaderboard
+
+
 def get_efficiency_service(
     efficiency_repository: EfficiencyRepository = Depends(get_efficiency_repository),
     cache_service: CacheService = Depends(get_cache_service),
+    calculation_executor: CalculationExecutor = Depends(get_calculation_executor),
+    calculation_memo: LRUCache = Depends(get_calculation_memo),
+    building_index: BuildingIndex = Depends(get_building_index),
+    building_leaderboard: BuildingLeaderboard = Depends(get_building_leaderboard),
+    single_flight: SingleFlight = Depends(get_single_flight),
 ) -> EfficiencyService:
     """Get efficiency service instance with dependencies"""
-    return EfficiencyService(efficiency_repository, cache_service)
+    return EfficiencyService(
+        efficiency_repository,
+        cache_service,
+        calculation_executor,
+        calculation_memo,
+        building_index,
+        building_leaderboard,
+        single_flight
+    )
+
+
+def get_ingest_service(
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+    cache_service: CacheService = Depends(get_cache_service),
+) -> IngestService:
+    """Get ingest service instance with dependencies"""
+    return IngestService(efficiency_service, cache_service)
@@ -0,0 +1,30 @@
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+
+def encode_cursor(sort_value: datetime, tie_breaker: str) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor token"""
+    payload = json.dumps([sort_value.isoformat(), tie_breaker], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor token back into its (sort value, tie breaker) key"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, tie_breaker = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), str(tie_breaker)
+    except (ValueError, TypeError) as e:
+        # Malformed base64, JSON or timestamp, or a payload of the wrong shape
+        raise ValueError("Invalid cursor") from e
+
+
+def decode_object_id_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor token whose tie breaker is a document ObjectId"""
+    sort_value, tie_breaker = decode_cursor(cursor)
+    if not ObjectId.is_valid(tie_breaker):
+        raise ValueError("Invalid cursor")
+    return sort_value, tie_breaker
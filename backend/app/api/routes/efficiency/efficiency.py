@@ -1,13 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional
+from uuid import uuid4
 
-from app.api.dependencies import get_efficiency_service
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api.dependencies import get_efficiency_service, get_ingest_service
 from app.application.services.efficiency_service import EfficiencyService
-from app.domain.entities.efficiency import PeriodData
+from app.application.services.ingest_service import INGEST_FORMATS, INGEST_ID_PATTERN, IngestService
+from app.domain.entities.ingest import IngestReport
+from app.domain.entities.efficiency import (
+    CalculationRequest,
+    EfficiencyCalculation,
+    EfficiencySummary,
+    PeriodData,
+    PeriodEfficiencyMetrics,
+    RateRange,
+)
 from app.domain.entities.auth import AuthUser
 from app.api.middleware.auth import get_current_user
+from app.api.pagination import decode_cursor, decode_object_id_cursor, encode_cursor
+from app.infrastructure.config import settings
+from app.infrastructure.logging import get_logger
 from app.api.routes.efficiency.schemas import (
+    BatchCalculateEfficiencyRequest,
+    BatchCalculateEfficiencyResponse,
+    BatchCalculationItemResponse,
+    BuildingAutocompleteResponse,
+    BuildingChartResponse,
+    BuildingRankResponse,
+    ChartPointResponse,
+    ChartSeriesResponse,
     CalculateEfficiencyRequest,
     CalculateEfficiencyResponse,
+    IngestReportResponse,
+    IngestRowErrorResponse,
+    LeaderboardEntryResponse,
+    LeaderboardResponse,
+    MeasureAnalyticsListResponse,
+    MeasureAnalyticsResponse,
+    PeriodDataRequest,
+    PortfolioResponse,
+    PortfolioTotalsResponse,
+    PreviewEfficiencyResponse,
+    TariffSweepRequest,
+    TariffSweepResponse,
     BuildingEfficiencySummaryResponse,
     BuildingCalculationsResponse,
     PeriodEfficiencyMetricsResponse,
@@ -15,9 +54,101 @@ from app.api.routes.efficiency.schemas import (
     AllBuildingsSummaryResponse
 )
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/efficiency", tags=["efficiency"])
 
 
+def _to_period_data(period: PeriodDataRequest) -> PeriodData:
+    """Convert a request period to a domain entity"""
+    return PeriodData(
+        period=period.period,
+        time_range=period.time_range,
+        days=period.days,
+        current_electric_kwh=period.current_electric_kwh,
+        current_gas_therms=period.current_gas_therms,
+        baseline_electric_kwh=period.baseline_electric_kwh,
+        baseline_gas_therms=period.baseline_gas_therms,
+        electric_rate=period.electric_rate,
+        gas_rate=period.gas_rate
+    )
+
+
+def _to_period_responses(periods: List[PeriodEfficiencyMetrics]) -> List[PeriodEfficiencyMetricsResponse]:
+    """Convert period metrics to response format"""
+    return [
+        PeriodEfficiencyMetricsResponse(
+            period=period.period,
+            time_range=period.time_range,
+            days=period.days,
+            electric_savings_kwh=period.electric_savings_kwh,
+            gas_savings_therms=period.gas_savings_therms,
+            electric_cost_savings=period.electric_cost_savings,
+            gas_cost_savings=period.gas_cost_savings,
+            total_cost_savings=period.total_cost_savings,
+            electric_efficiency_improvement=period.electric_efficiency_improvement,
+            gas_efficiency_improvement=period.gas_efficiency_improvement,
+            overall_efficiency_improvement=period.overall_efficiency_improvement
+        )
+        for period in periods
+    ]
+
+
+def _to_summary_response(summary: EfficiencySummary) -> EfficiencySummaryResponse:
+    """Convert an efficiency summary to response format"""
+    return EfficiencySummaryResponse(
+        total_electric_savings_kwh=summary.total_electric_savings_kwh,
+        total_gas_savings_therms=summary.total_gas_savings_therms,
+        total_electric_cost_savings=summary.total_electric_cost_savings,
+        total_gas_cost_savings=summary.total_gas_cost_savings,
+        total_cost_savings=summary.total_cost_savings,
+        average_electric_efficiency_improvement=summary.average_electric_efficiency_improvement,
+        average_gas_efficiency_improvement=summary.average_gas_efficiency_improvement,
+        overall_efficiency_improvement=summary.overall_efficiency_improvement,
+        performance_grade=summary.performance_grade
+    )
+
+
+def _to_calculation_response(calculation: EfficiencyCalculation) -> CalculateEfficiencyResponse:
+    """Convert a stored efficiency calculation to response format"""
+    # The repository sets both when storing a calculation
+    assert calculation.id is not None and calculation.created_at is not None
+    return CalculateEfficiencyResponse(
+        id=calculation.id,
+        building_id=calculation.building_id,
+        measure_name=calculation.measure_name,
+        calculation_timestamp=calculation.calculation_timestamp,
+        periods=_to_period_responses(calculation.periods),
+        summary=_to_summary_response(calculation.summary),
+        created_at=calculation.created_at
+    )
+
+
+def _ingest_owner(user: AuthUser) -> str:
+    """Owner id that scopes a user's ingest progress"""
+    return user.id or user.email
+
+
+def _to_ingest_report_response(report: IngestReport) -> IngestReportResponse:
+    """Convert an ingest report to response format"""
+    return IngestReportResponse(
+        ingest_id=report.ingest_id,
+        format=report.format,
+        status=report.status,
+        rows_read=report.rows_read,
+        rows_rejected=report.rows_rejected,
+        calculations_created=report.calculations_created,
+        calculations_failed=report.calculations_failed,
+        error_count=report.error_count,
+        errors=[
+            IngestRowErrorResponse(line=error.line, building_id=error.building_id, error=error.error)
+            for error in report.errors
+        ],
+        started_at=report.started_at,
+        updated_at=report.updated_at
+    )
+
+
 @router.post("/calculate", response_model=CalculateEfficiencyResponse, status_code=status.HTTP_201_CREATED)
 async def calculate_efficiency(
     request: CalculateEfficiencyRequest,
@@ -27,20 +158,7 @@ async def calculate_efficiency(
     """Calculate energy efficiency metrics for a building"""
     try:
         # Convert request periods to domain entities
-        periods = [
-            PeriodData(
-                period=period.period,
-                time_range=period.time_range,
-                days=period.days,
-                current_electric_kwh=period.current_electric_kwh,
-                current_gas_therms=period.current_gas_therms,
-                baseline_electric_kwh=period.baseline_electric_kwh,
-                baseline_gas_therms=period.baseline_gas_therms,
-                electric_rate=period.electric_rate,
-                gas_rate=period.gas_rate
-            )
-            for period in request.periods
-        ]
+        periods = [_to_period_data(period) for period in request.periods]
         
         # Calculate efficiency
         calculation = await efficiency_service.calculate_efficiency(
@@ -49,44 +167,41 @@ async def calculate_efficiency(
             periods=periods
         )
         
-        # Convert to response format
-        period_responses = [
-            PeriodEfficiencyMetricsResponse(
-                period=period.period,
-                time_range=period.time_range,
-                days=period.days,
-                electric_savings_kwh=period.electric_savings_kwh,
-                gas_savings_therms=period.gas_savings_therms,
-                electric_cost_savings=period.electric_cost_savings,
-                gas_cost_savings=period.gas_cost_savings,
-                total_cost_savings=period.total_cost_savings,
-                electric_efficiency_improvement=period.electric_efficiency_improvement,
-                gas_efficiency_improvement=period.gas_efficiency_improvement,
-                overall_efficiency_improvement=period.overall_efficiency_improvement
-            )
-            for period in calculation.periods
-        ]
-        
-        summary_response = EfficiencySummaryResponse(
-            total_electric_savings_kwh=calculation.summary.total_electric_savings_kwh,
-            total_gas_savings_therms=calculation.summary.total_gas_savings_therms,
-            total_electric_cost_savings=calculation.summary.total_electric_cost_savings,
-            total_gas_cost_savings=calculation.summary.total_gas_cost_savings,
-            total_cost_savings=calculation.summary.total_cost_savings,
-            average_electric_efficiency_improvement=calculation.summary.average_electric_efficiency_improvement,
-            average_gas_efficiency_improvement=calculation.summary.average_gas_efficiency_improvement,
-            overall_efficiency_improvement=calculation.summary.overall_efficiency_improvement,
-            performance_grade=calculation.summary.performance_grade
+        return _to_calculation_response(calculation)
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid input data: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate efficiency: {str(e)}"
+        )
+
+
+@router.post("/calculate/preview", response_model=PreviewEfficiencyResponse)
+async def preview_efficiency(
+    request: CalculateEfficiencyRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Calculate energy efficiency metrics without storing them (what-if scenarios)"""
+    try:
+        calculation = await efficiency_service.calculate_efficiency(
+            building_id=request.building_id,
+            measure_name=request.measure_name,
+            periods=[_to_period_data(period) for period in request.periods],
+            preview=True
         )
         
-        return CalculateEfficiencyResponse(
-            id=calculation.id,
+        return PreviewEfficiencyResponse(
             building_id=calculation.building_id,
             measure_name=calculation.measure_name,
             calculation_timestamp=calculation.calculation_timestamp,
-            periods=period_responses,
-            summary=summary_response,
-            created_at=calculation.created_at
+            periods=_to_period_responses(calculation.periods),
+            summary=_to_summary_response(calculation.summary)
         )
     
     except ValueError as e:
@@ -97,142 +212,367 @@ async def calculate_efficiency(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to calculate efficiency: {str(e)}"
+            detail=f"Failed to preview efficiency: {str(e)}"
         )
 
 
-@router.get("/building/{building_id}", response_model=BuildingCalculationsResponse)
-async def get_building_calculations(
-    building_id: str,
+@router.post("/calculate/batch", response_model=BatchCalculateEfficiencyResponse)
+async def calculate_efficiency_batch(
+    request: BatchCalculateEfficiencyRequest,
     current_user: AuthUser = Depends(get_current_user),
     efficiency_service: EfficiencyService = Depends(get_efficiency_service),
 ):
-    """Get all efficiency calculations for a building"""
+    """Calculate and store many efficiency calculations in one request"""
+    if len(request.calculations) > settings.efficiency_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size must not exceed {settings.efficiency_batch_max_size}"
+        )
+    
     try:
-        calculations = await efficiency_service.get_building_calculations(building_id)
-        
-        # Convert to response format
-        calculation_responses = []
-        for calculation in calculations:
-            period_responses = [
-                PeriodEfficiencyMetricsResponse(
-                    period=period.period,
-                    time_range=period.time_range,
-                    days=period.days,
-                    electric_savings_kwh=period.electric_savings_kwh,
-                    gas_savings_therms=period.gas_savings_therms,
-                    electric_cost_savings=period.electric_cost_savings,
-                    gas_cost_savings=period.gas_cost_savings,
-                    total_cost_savings=period.total_cost_savings,
-                    electric_efficiency_improvement=period.electric_efficiency_improvement,
-                    gas_efficiency_improvement=period.gas_efficiency_improvement,
-                    overall_efficiency_improvement=period.overall_efficiency_improvement
+        # Validate each item on its own so one bad item does not reject the batch
+        results = {}
+        valid_indexes = []
+        domain_requests = []
+        for index, item in enumerate(request.calculations):
+            try:
+                item_request = CalculateEfficiencyRequest.model_validate(item)
+            except ValidationError as e:
+                results[index] = BatchCalculationItemResponse(
+                    index=index,
+                    id=None,
+                    building_id=item.get("building_id") if isinstance(item.get("building_id"), str) else None,
+                    error="Invalid input data: " + "; ".join(
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    )
                 )
-                for period in calculation.periods
-            ]
+                continue
             
-            summary_response = EfficiencySummaryResponse(
-                total_electric_savings_kwh=calculation.summary.total_electric_savings_kwh,
-                total_gas_savings_therms=calculation.summary.total_gas_savings_therms,
-                total_electric_cost_savings=calculation.summary.total_electric_cost_savings,
-                total_gas_cost_savings=calculation.summary.total_gas_cost_savings,
-                total_cost_savings=calculation.summary.total_cost_savings,
-                average_electric_efficiency_improvement=calculation.summary.average_electric_efficiency_improvement,
-                average_gas_efficiency_improvement=calculation.summary.average_gas_efficiency_improvement,
-                overall_efficiency_improvement=calculation.summary.overall_efficiency_improvement,
-                performance_grade=calculation.summary.performance_grade
+            valid_indexes.append(index)
+            domain_requests.append(CalculationRequest(
+                building_id=item_request.building_id,
+                measure_name=item_request.measure_name,
+                periods=[_to_period_data(period) for period in item_request.periods]
+            ))
+        
+        # Calculate and store valid items
+        batch_results = await efficiency_service.calculate_efficiency_batch(domain_requests)
+        
+        for index, batch_result in zip(valid_indexes, batch_results):
+            domain_request = domain_requests[batch_result.index]
+            results[index] = BatchCalculationItemResponse(
+                index=index,
+                id=batch_result.calculation.id if batch_result.calculation else None,
+                building_id=domain_request.building_id,
+                error=batch_result.error
             )
-            
-            calculation_response = CalculateEfficiencyResponse(
-                id=calculation.id,
-                building_id=calculation.building_id,
-                measure_name=calculation.measure_name,
-                calculation_timestamp=calculation.calculation_timestamp,
-                periods=period_responses,
-                summary=summary_response,
-                created_at=calculation.created_at
+        
+        ordered_results = [results[index] for index in range(len(request.calculations))]
+        failed_count = sum(1 for result in ordered_results if result.error)
+        
+        return BatchCalculateEfficiencyResponse(
+            results=ordered_results,
+            created_count=len(ordered_results) - failed_count,
+            failed_count=failed_count
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate efficiency batch: {str(e)}"
+        )
+
+
+@router.post("/sweep", response_model=TariffSweepResponse)
+async def sweep_tariffs(
+    request: TariffSweepRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Total cost savings of a calculation over a grid of electric and gas rates"""
+    try:
+        sweep = await efficiency_service.sweep_tariffs(
+            calculation_id=request.calculation_id,
+            electric_rates=RateRange(**request.electric_rates.model_dump()),
+            gas_rates=RateRange(**request.gas_rates.model_dump())
+        )
+        
+        if not sweep:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Calculation {request.calculation_id} not found"
             )
-            calculation_responses.append(calculation_response)
         
-        return BuildingCalculationsResponse(
-            building_id=building_id,
-            calculations=calculation_responses,
-            total_count=len(calculation_responses)
+        return TariffSweepResponse(
+            calculation_id=sweep.calculation_id,
+            building_id=sweep.building_id,
+            electric_rates=sweep.electric_rates,
+            gas_rates=sweep.gas_rates,
+            total_cost_savings=sweep.total_cost_savings,
+            min_total_cost_savings=sweep.min_total_cost_savings,
+            max_total_cost_savings=sweep.max_total_cost_savings,
+            performance_grade=sweep.performance_grade
         )
     
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid input data: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get building calculations: {str(e)}"
+            detail=f"Failed to sweep tariffs: {str(e)}"
         )
 
 
+@router.post("/ingest", response_model=IngestReportResponse)
+async def ingest_period_data(
+    request: Request,
+    data_format: Optional[str] = Query(None, alias="format", description="csv or ndjson; defaults from Content-Type"),
+    ingest_id: Optional[str] = Query(
+        None,
+        pattern=INGEST_ID_PATTERN,
+        description="Client chosen id for polling progress, scoped to the current user"
+    ),
+    current_user: AuthUser = Depends(get_current_user),
+    ingest_service: IngestService = Depends(get_ingest_service),
+):
+    """Stream a CSV or NDJSON export of period rows into efficiency calculations
+    
+    Rows are grouped into calculations by consecutive building_id and measure_name.
+    CSV needs a header row; the days column is separated by "|".
+    """
+    if data_format is None:
+        content_type = request.headers.get("content-type", "")
+        data_format = "ndjson" if "json" in content_type else "csv"
+    
+    if data_format not in INGEST_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format must be one of: {', '.join(INGEST_FORMATS)}"
+        )
+    
+    try:
+        report = await ingest_service.ingest(
+            request.stream(), data_format, ingest_id or uuid4().hex, _ingest_owner(current_user)
+        )
+        return _to_ingest_report_response(report)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to ingest period data: {str(e)}"
+        )
+
+
+@router.get("/ingest/{ingest_id}", response_model=IngestReportResponse)
+async def get_ingest_progress(
+    ingest_id: str,
+    current_user: AuthUser = Depends(get_current_user),
+    ingest_service: IngestService = Depends(get_ingest_service),
+):
+    """Get progress of a running or recently finished ingest started by the current user"""
+    report = await ingest_service.get_progress(ingest_id, _ingest_owner(current_user))
+    
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ingest {ingest_id} not found"
+        )
+    
+    return _to_ingest_report_response(report)
+
+
+@router.get("/building/{building_id}", response_model=BuildingCalculationsResponse)
+async def get_building_calculations(
+    building_id: str,
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.history_max_limit, description="Page size; without limit and cursor, the whole history"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    created_from: Optional[datetime] = Query(None, description="Only calculations created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only calculations created before this time"),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson streams every matching calculation"),
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get efficiency calculations for a building, newest first"""
+    return await _get_calculation_history(
+        efficiency_service, building_id, None, limit, cursor, created_from, created_to, format
+    )
+
+
 @router.get("/building/{building_id}/period/{period}", response_model=BuildingCalculationsResponse)
 async def get_building_calculations_by_period(
     building_id: str,
     period: str,
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.history_max_limit, description="Page size; without limit and cursor, the whole history"
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    created_from: Optional[datetime] = Query(None, description="Only calculations created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only calculations created before this time"),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson streams every matching calculation"),
     current_user: AuthUser = Depends(get_current_user),
     efficiency_service: EfficiencyService = Depends(get_efficiency_service),
 ):
     """Get efficiency calculations for a building and specific period"""
+    return await _get_calculation_history(
+        efficiency_service, building_id, period, limit, cursor, created_from, created_to, format
+    )
+
+
+async def _get_calculation_history(
+    efficiency_service: EfficiencyService,
+    building_id: str,
+    period: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    format: str
+):
+    """Shared implementation of the calculation history endpoints
+    
+    JSON responses hold the whole history unless a limit or cursor is given; paging
+    is opt-in, with pages of limit (default HISTORY_DEFAULT_LIMIT) calculations and a
+    next_cursor. total_count always counts every matching calculation. NDJSON
+    responses write one calculation per line as the database cursor yields them,
+    covering the whole range unless a limit is given.
+    """
     try:
-        calculations = await efficiency_service.get_building_calculations_by_period(
-            building_id, period
+        after = decode_object_id_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    detail = "Failed to get building calculations" if period is None else "Failed to get building calculations for period"
+    
+    if format == "ndjson":
+        calculations = efficiency_service.stream_building_calculations(
+            building_id, period, limit, after, created_from, created_to
         )
+        try:
+            # Fetch the first calculation before sending headers, so a failing query is a 500
+            first = await anext(calculations, None)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"{detail}: {str(e)}"
+            )
+        return StreamingResponse(_stream_ndjson(first, calculations, detail), media_type="application/x-ndjson")
+    
+    try:
+        paginated = limit is not None or after is not None
+        if paginated:
+            limit = limit or settings.history_default_limit
         
-        # Convert to response format (same as above)
-        calculation_responses = []
-        for calculation in calculations:
-            period_responses = [
-                PeriodEfficiencyMetricsResponse(
-                    period=period.period,
-                    time_range=period.time_range,
-                    days=period.days,
-                    electric_savings_kwh=period.electric_savings_kwh,
-                    gas_savings_therms=period.gas_savings_therms,
-                    electric_cost_savings=period.electric_cost_savings,
-                    gas_cost_savings=period.gas_cost_savings,
-                    total_cost_savings=period.total_cost_savings,
-                    electric_efficiency_improvement=period.electric_efficiency_improvement,
-                    gas_efficiency_improvement=period.gas_efficiency_improvement,
-                    overall_efficiency_improvement=period.overall_efficiency_improvement
-                )
-                for period in calculation.periods
-            ]
-            
-            summary_response = EfficiencySummaryResponse(
-                total_electric_savings_kwh=calculation.summary.total_electric_savings_kwh,
-                total_gas_savings_therms=calculation.summary.total_gas_savings_therms,
-                total_electric_cost_savings=calculation.summary.total_electric_cost_savings,
-                total_gas_cost_savings=calculation.summary.total_gas_cost_savings,
-                total_cost_savings=calculation.summary.total_cost_savings,
-                average_electric_efficiency_improvement=calculation.summary.average_electric_efficiency_improvement,
-                average_gas_efficiency_improvement=calculation.summary.average_gas_efficiency_improvement,
-                overall_efficiency_improvement=calculation.summary.overall_efficiency_improvement,
-                performance_grade=calculation.summary.performance_grade
+        if period is None:
+            page = await efficiency_service.get_building_calculations(
+                building_id, limit, after, created_from, created_to
             )
-            
-            calculation_response = CalculateEfficiencyResponse(
-                id=calculation.id,
-                building_id=calculation.building_id,
-                measure_name=calculation.measure_name,
-                calculation_timestamp=calculation.calculation_timestamp,
-                periods=period_responses,
-                summary=summary_response,
-                created_at=calculation.created_at
+        else:
+            page = await efficiency_service.get_building_calculations_by_period(
+                building_id, period, limit, after, created_from, created_to
             )
-            calculation_responses.append(calculation_response)
+        
+        total_count = len(page)
+        next_cursor = None
+        if paginated:
+            total_count = await efficiency_service.count_building_calculations(
+                building_id, period, created_from, created_to
+            )
+            last = page[-1] if len(page) == limit else None
+            if last and last.created_at and last.id:
+                next_cursor = encode_cursor(last.created_at, last.id)
         
         return BuildingCalculationsResponse(
             building_id=building_id,
-            calculations=calculation_responses,
-            total_count=len(calculation_responses)
+            calculations=[_to_calculation_response(calculation) for calculation in page],
+            total_count=total_count,
+            next_cursor=next_cursor
         )
     
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get building calculations for period: {str(e)}"
+            detail=f"{detail}: {str(e)}"
+        )
+
+
+async def _stream_ndjson(
+    first: Optional[EfficiencyCalculation],
+    calculations: AsyncIterator[EfficiencyCalculation],
+    detail: str
+) -> AsyncIterator[str]:
+    """Serialize calculations to NDJSON lines as they arrive
+    
+    Headers are already sent when a later read fails, so the stream then ends with
+    an {"error": ...} line, which no calculation line can be mistaken for.
+    """
+    if first is None:
+        return
+    
+    try:
+        yield _to_calculation_response(first).model_dump_json() + "\n"
+        async for calculation in calculations:
+            yield _to_calculation_response(calculation).model_dump_json() + "\n"
+    except Exception as e:
+        logger.error("Calculation history stream failed", error=str(e))
+        yield json.dumps({"error": f"{detail}: {str(e)}"}) + "\n"
+
+
+@router.get("/building/{building_id}/chart", response_model=BuildingChartResponse)
+async def get_building_chart(
+    building_id: str,
+    metric: str = Query("total_cost_savings", description="Period metric to chart"),
+    bucket: Literal["hour", "day", "week", "month"] = Query("day", description="Time bucket size"),
+    period: Optional[str] = Query(None, description="Only chart this period"),
+    created_from: Optional[datetime] = Query(None, description="Only calculations created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only calculations created before this time"),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=settings.chart_max_points, description="Downsample each series to at most this many points"
+    ),
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get a period metric of a building over time, aggregated into time buckets"""
+    try:
+        chart = await efficiency_service.get_building_chart(
+            building_id, metric, bucket, period, created_from, created_to, max_points
+        )
+        
+        return BuildingChartResponse(
+            building_id=chart.building_id,
+            metric=chart.metric,
+            bucket=chart.bucket,
+            series=[
+                ChartSeriesResponse(
+                    period=series.period,
+                    points=[
+                        ChartPointResponse(timestamp=point.timestamp, value=point.value, count=point.count)
+                        for point in series.points
+                    ]
+                )
+                for series in chart.series
+            ]
+        )
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get building chart: {str(e)}"
         )
 
 
@@ -298,9 +638,12 @@ async def get_building_summary(
             building_id=summary.building_id,
             total_calculations=summary.total_calculations,
             latest_calculation=latest_calculation_response,
+            latest_measure_name=summary.latest_measure_name,
             best_performance_grade=summary.best_performance_grade,
             average_efficiency_improvement=summary.average_efficiency_improvement,
             total_cost_savings=summary.total_cost_savings,
+            efficiency_improvement_percentile=summary.efficiency_improvement_percentile,
+            cost_savings_percentile=summary.cost_savings_percentile,
             created_at=summary.created_at
         )
     
@@ -313,15 +656,189 @@ async def get_building_summary(
         )
 
 
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    metric: Literal["total_cost_savings", "average_efficiency_improvement"] = Query(
+        "total_cost_savings", description="Metric to rank buildings by"
+    ),
+    order: Literal["top", "bottom"] = Query("top", description="top (highest first) or bottom (lowest first)"),
+    limit: int = Query(10, ge=1, le=100, description="Number of buildings"),
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get the highest or lowest ranked buildings for a metric"""
+    try:
+        leaderboard = await efficiency_service.get_leaderboard(metric, order, limit)
+        
+        return LeaderboardResponse(
+            metric=leaderboard.metric,
+            order=leaderboard.order,
+            entries=[LeaderboardEntryResponse(**entry.model_dump()) for entry in leaderboard.entries],
+            total_buildings=leaderboard.total_buildings
+        )
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get leaderboard: {str(e)}"
+        )
+
+
+@router.get("/building/{building_id}/rank", response_model=BuildingRankResponse)
+async def get_building_rank(
+    building_id: str,
+    metric: Literal["total_cost_savings", "average_efficiency_improvement"] = Query(
+        "total_cost_savings", description="Metric to rank buildings by"
+    ),
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get the rank of a building for a metric"""
+    try:
+        rank = await efficiency_service.get_building_rank(metric, building_id)
+        
+        if rank.rank is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No efficiency calculations found for building {building_id}"
+            )
+        
+        return BuildingRankResponse(**rank.model_dump())
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get building rank: {str(e)}"
+        )
+
+
+@router.get("/measures", response_model=MeasureAnalyticsListResponse)
+async def get_measure_analytics(
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Compare measure effectiveness across the portfolio"""
+    try:
+        measures = await efficiency_service.get_measure_analytics()
+        
+        return MeasureAnalyticsListResponse(
+            measures=[MeasureAnalyticsResponse(**measure.model_dump()) for measure in measures]
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get measure analytics: {str(e)}"
+        )
+
+
+@router.get("/measures/{measure_name}", response_model=MeasureAnalyticsResponse)
+async def get_measure(
+    measure_name: str,
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get the effectiveness of one measure across the portfolio"""
+    try:
+        measure = await efficiency_service.get_measure(measure_name)
+        
+        if not measure:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No efficiency calculations found for measure {measure_name}"
+            )
+        
+        return MeasureAnalyticsResponse(**measure.model_dump())
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get measure analytics: {str(e)}"
+        )
+
+
+@router.get("/portfolio", response_model=PortfolioResponse)
+async def get_portfolio(
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Get portfolio-wide savings, grade distribution and per-measure / per-period breakdowns"""
+    try:
+        portfolio = await efficiency_service.get_portfolio()
+        
+        if not portfolio:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No efficiency calculations found"
+            )
+        
+        return PortfolioResponse(
+            total_buildings=portfolio.total_buildings,
+            totals=PortfolioTotalsResponse(**portfolio.totals.model_dump()),
+            by_measure=[PortfolioTotalsResponse(**rollup.model_dump()) for rollup in portfolio.by_measure],
+            by_period=[PortfolioTotalsResponse(**rollup.model_dump()) for rollup in portfolio.by_period],
+            reconciled_at=portfolio.reconciled_at
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get portfolio: {str(e)}"
+        )
+
+
+@router.get("/buildings/autocomplete", response_model=BuildingAutocompleteResponse)
+async def autocomplete_buildings(
+    q: str = Query(..., min_length=1, max_length=100, description="Building ID prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    current_user: AuthUser = Depends(get_current_user),
+    efficiency_service: EfficiencyService = Depends(get_efficiency_service),
+):
+    """Suggest building IDs starting with a prefix (case-insensitive)"""
+    try:
+        building_ids = await efficiency_service.autocomplete_buildings(q, limit)
+        
+        return BuildingAutocompleteResponse(query=q, building_ids=building_ids)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to autocomplete buildings: {str(e)}"
+        )
+
+
 @router.get("/buildings", response_model=AllBuildingsSummaryResponse)
 async def get_all_buildings_summary(
     page: int = 1,
     limit: int = 100,
-    search: str = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    view: Literal["compact", "full"] = "full",
     current_user: AuthUser = Depends(get_current_user),
     efficiency_service: EfficiencyService = Depends(get_efficiency_service),
 ):
-    """Get summary for all buildings with pagination and search"""
+    """Get summary for all buildings with pagination and search
+    
+    search matches any case-insensitive substring of the building ID, taken
+    literally; /buildings/autocomplete serves indexed prefix lookups for autocomplete.
+    """
     try:
         # Validate pagination parameters
         if page < 1:
@@ -335,8 +852,18 @@ async def get_all_buildings_summary(
                 detail="Limit must be between 1 and 1000"
             )
         
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
         skip = (page - 1) * limit
-        summaries, total_count = await efficiency_service.get_all_buildings_summary(skip, limit, search)
+        summaries, total_count = await efficiency_service.get_all_buildings_summary(
+            skip, limit, search, after, include_total, view
+        )
         
         # Convert to response format
         building_summaries = []
@@ -382,22 +909,37 @@ async def get_all_buildings_summary(
                 building_id=summary.building_id,
                 total_calculations=summary.total_calculations,
                 latest_calculation=latest_calculation_response,
+                latest_measure_name=summary.latest_measure_name,
                 best_performance_grade=summary.best_performance_grade,
                 average_efficiency_improvement=summary.average_efficiency_improvement,
                 total_cost_savings=summary.total_cost_savings,
+                efficiency_improvement_percentile=summary.efficiency_improvement_percentile,
+                cost_savings_percentile=summary.cost_savings_percentile,
                 created_at=summary.created_at
             ))
         
+        next_cursor = None
+        if len(summaries) == limit and summaries[-1].created_at:
+            next_cursor = encode_cursor(summaries[-1].created_at, summaries[-1].building_id)
+        
+        if after or total_count is None:
+            has_next = next_cursor is not None
+        else:
+            has_next = page * limit < total_count
+        
         return AllBuildingsSummaryResponse(
             buildings=building_summaries,
             total_buildings=total_count,
             page=page,
             limit=limit,
-            total_pages=(total_count + limit - 1) // limit,
-            has_next=page * limit < total_count,
-            has_prev=page > 1
+            total_pages=(total_count + limit - 1) // limit if total_count is not None else None,
+            has_next=has_next,
+            has_prev=page > 1 or after is not None,
+            next_cursor=next_cursor if has_next else None
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
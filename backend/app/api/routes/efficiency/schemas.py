@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -24,6 +24,32 @@ class CalculateEfficiencyRequest(BaseModel):
     periods: List[PeriodDataRequest] = Field(..., min_items=1, description="Period data for calculations")
 
 
+class BatchCalculateEfficiencyRequest(BaseModel):
+    """Request schema for batch efficiency calculation"""
+    # Raw dicts rather than List[CalculateEfficiencyRequest]: a typed list would make
+    # one invalid item reject the whole batch with a 422, while the endpoint validates
+    # each item itself and reports failures per index next to the saved calculations
+    calculations: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description="Calculations, each in CalculateEfficiencyRequest format; validated per item"
+    )
+
+
+class RateRangeRequest(BaseModel):
+    """Evenly spaced rate range request schema"""
+    start: float = Field(..., ge=0, description="First rate")
+    stop: float = Field(..., ge=0, description="Last rate (inclusive)")
+    steps: int = Field(..., ge=1, description="Number of rates in the range")
+
+
+class TariffSweepRequest(BaseModel):
+    """Request schema for a tariff sensitivity sweep"""
+    calculation_id: str = Field(..., description="Calculation to re-price")
+    electric_rates: RateRangeRequest = Field(..., description="Electric rates per kWh to sweep")
+    gas_rates: RateRangeRequest = Field(..., description="Gas rates per therm to sweep")
+
+
 # Response Schemas
 class PeriodEfficiencyMetricsResponse(BaseModel):
     """Period efficiency metrics response schema"""
@@ -64,14 +90,60 @@ class CalculateEfficiencyResponse(BaseModel):
     created_at: datetime = Field(..., description="When the calculation was created")
 
 
+class PreviewEfficiencyResponse(BaseModel):
+    """Response schema for a non-persisted efficiency calculation"""
+    building_id: str = Field(..., description="Building identifier")
+    measure_name: str = Field(..., description="Energy efficiency measure name")
+    calculation_timestamp: datetime = Field(..., description="When the calculation was performed")
+    periods: List[PeriodEfficiencyMetricsResponse] = Field(..., description="Efficiency metrics for each period")
+    summary: EfficiencySummaryResponse = Field(..., description="Aggregated summary of all periods")
+
+
+class TariffSweepResponse(BaseModel):
+    """Response schema for a tariff sensitivity sweep"""
+    calculation_id: str = Field(..., description="Calculation ID")
+    building_id: str = Field(..., description="Building identifier")
+    electric_rates: List[float] = Field(..., description="Swept electric rates")
+    gas_rates: List[float] = Field(..., description="Swept gas rates")
+    total_cost_savings: List[List[float]] = Field(
+        ...,
+        description="Total cost savings rounded to cents; rows follow electric_rates, columns gas_rates"
+    )
+    min_total_cost_savings: float = Field(..., description="Lowest total cost savings in the grid")
+    max_total_cost_savings: float = Field(..., description="Highest total cost savings in the grid")
+    performance_grade: str = Field(..., description="Performance grade, the same for every rate pair")
+
+
+class BatchCalculationItemResponse(BaseModel):
+    """Outcome of one calculation in a batch"""
+    index: int = Field(..., description="Position of the calculation in the request")
+    id: Optional[str] = Field(None, description="Calculation ID when created")
+    building_id: Optional[str] = Field(None, description="Building identifier")
+    error: Optional[str] = Field(None, description="Validation or write error when not created")
+
+
+class BatchCalculateEfficiencyResponse(BaseModel):
+    """Response schema for batch efficiency calculation"""
+    results: List[BatchCalculationItemResponse] = Field(..., description="Per-item outcome, in request order")
+    created_count: int = Field(..., description="Number of calculations created")
+    failed_count: int = Field(..., description="Number of calculations that failed")
+
+
 class BuildingEfficiencySummaryResponse(BaseModel):
     """Building efficiency summary response schema"""
     building_id: str
     total_calculations: int
     latest_calculation: Optional[CalculateEfficiencyResponse] = None
+    latest_measure_name: Optional[str] = None
     best_performance_grade: Optional[str] = None
     average_efficiency_improvement: Optional[float] = None
     total_cost_savings: Optional[float] = None
+    efficiency_improvement_percentile: Optional[float] = Field(
+        None, description="Share of buildings with a lower average efficiency improvement, in percent"
+    )
+    cost_savings_percentile: Optional[float] = Field(
+        None, description="Share of buildings with lower total cost savings, in percent"
+    )
     created_at: datetime
 
 
@@ -79,19 +151,145 @@ class BuildingCalculationsResponse(BaseModel):
     """Response schema for building calculations"""
     building_id: str
     calculations: List[CalculateEfficiencyResponse]
-    total_count: int
+    total_count: int = Field(..., description="Number of matching calculations across all pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class AllBuildingsSummaryResponse(BaseModel):
     """All buildings summary response schema"""
     
     buildings: List[BuildingEfficiencySummaryResponse] = Field(..., description="List of building summaries")
-    total_buildings: int = Field(..., description="Total number of buildings")
+    total_buildings: Optional[int] = Field(..., description="Total number of buildings, null when include_total=false")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(..., description="Total number of pages, null when include_total=false")
     has_next: bool = Field(..., description="Whether there is a next page")
     has_prev: bool = Field(..., description="Whether there is a previous page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+
+
+class ChartPointResponse(BaseModel):
+    """Chart point response schema"""
+    
+    timestamp: datetime = Field(..., description="Start of the time bucket")
+    value: float = Field(..., description="Metric value for the bucket")
+    count: int = Field(..., description="Number of period entries in the bucket")
+
+
+class ChartSeriesResponse(BaseModel):
+    """Chart series response schema"""
+    
+    period: str = Field(..., description="Period name")
+    points: List[ChartPointResponse] = Field(..., description="Points in time order")
+
+
+class BuildingChartResponse(BaseModel):
+    """Building chart response schema"""
+    
+    building_id: str = Field(..., description="Building identifier")
+    metric: str = Field(..., description="Charted metric")
+    bucket: str = Field(..., description="Time bucket size")
+    series: List[ChartSeriesResponse] = Field(..., description="One series per period")
+
+
+class BuildingAutocompleteResponse(BaseModel):
+    """Building ID autocomplete response schema"""
+    
+    query: str = Field(..., description="Prefix that was searched")
+    building_ids: List[str] = Field(..., description="Matching building IDs in alphabetical order")
+
+
+class LeaderboardEntryResponse(BaseModel):
+    """Leaderboard entry response schema"""
+    
+    building_id: str = Field(..., description="Building identifier")
+    score: float = Field(..., description="Metric value")
+    rank: int = Field(..., description="1-based rank, highest score first")
+
+
+class LeaderboardResponse(BaseModel):
+    """Building leaderboard response schema"""
+    
+    metric: str = Field(..., description="Ranked metric")
+    order: str = Field(..., description="top (highest first) or bottom (lowest first)")
+    entries: List[LeaderboardEntryResponse] = Field(..., description="Ranked buildings")
+    total_buildings: int = Field(..., description="Number of ranked buildings")
+
+
+class BuildingRankResponse(BaseModel):
+    """Building rank response schema"""
+    
+    building_id: str = Field(..., description="Building identifier")
+    metric: str = Field(..., description="Ranked metric")
+    rank: int = Field(..., description="1-based rank, highest score first")
+    score: float = Field(..., description="Metric value")
+    total_buildings: int = Field(..., description="Number of ranked buildings")
+
+
+class MeasureAnalyticsResponse(BaseModel):
+    """Measure effectiveness response schema"""
+    
+    measure_name: str = Field(..., description="Measure name")
+    count: int = Field(..., description="Number of calculations for the measure")
+    mean_efficiency_improvement: Optional[float] = Field(None, description="Mean overall efficiency improvement")
+    median_efficiency_improvement: Optional[float] = Field(None, description="Median overall efficiency improvement")
+    p90_efficiency_improvement: Optional[float] = Field(None, description="90th percentile overall efficiency improvement")
+    total_electric_savings_kwh: float = Field(..., description="Total electric savings in kWh")
+    total_gas_savings_therms: float = Field(..., description="Total gas savings in therms")
+    total_cost_savings: float = Field(..., description="Total cost savings")
+    grade_distribution: Dict[str, int] = Field(..., description="Calculations per performance grade")
+
+
+class MeasureAnalyticsListResponse(BaseModel):
+    """Measure effectiveness list response schema"""
+    
+    measures: List[MeasureAnalyticsResponse] = Field(..., description="Analytics per measure, by measure name")
+
+
+class PortfolioTotalsResponse(BaseModel):
+    """Portfolio totals response schema"""
+    
+    key: Optional[str] = Field(None, description="Measure or period name; null for the whole portfolio")
+    count: int = Field(..., description="Number of calculations (period entries for period breakdowns)")
+    total_electric_savings_kwh: float = Field(..., description="Total electric savings in kWh")
+    total_gas_savings_therms: float = Field(..., description="Total gas savings in therms")
+    total_electric_cost_savings: float = Field(..., description="Total electric cost savings")
+    total_gas_cost_savings: float = Field(..., description="Total gas cost savings")
+    total_cost_savings: float = Field(..., description="Total cost savings")
+    average_efficiency_improvement: Optional[float] = Field(None, description="Average overall efficiency improvement")
+    grade_distribution: Dict[str, int] = Field(..., description="Calculations per performance grade")
+
+
+class PortfolioResponse(BaseModel):
+    """Portfolio analytics response schema"""
+    
+    total_buildings: int = Field(..., description="Number of buildings with calculations")
+    totals: PortfolioTotalsResponse = Field(..., description="Totals over all calculations")
+    by_measure: List[PortfolioTotalsResponse] = Field(..., description="Totals per measure name")
+    by_period: List[PortfolioTotalsResponse] = Field(..., description="Totals per period name")
+    reconciled_at: Optional[datetime] = Field(None, description="When the rollups were last recomputed from scratch")
+
+
+class IngestRowErrorResponse(BaseModel):
+    """Row-level ingest error response schema"""
+    line: Optional[int] = Field(None, description="Line number in the uploaded file")
+    building_id: Optional[str] = Field(None, description="Building identifier")
+    error: str = Field(..., description="Error message")
+
+
+class IngestReportResponse(BaseModel):
+    """Ingest progress and outcome response schema"""
+    ingest_id: str = Field(..., description="Ingest identifier, usable to poll progress")
+    format: str = Field(..., description="Input format (csv or ndjson)")
+    status: str = Field(..., description="running, completed or failed")
+    rows_read: int = Field(..., description="Data rows read so far")
+    rows_rejected: int = Field(..., description="Rows rejected by validation")
+    calculations_created: int = Field(..., description="Calculations stored")
+    calculations_failed: int = Field(..., description="Calculations that could not be stored")
+    error_count: int = Field(..., description="Total number of errors")
+    errors: List[IngestRowErrorResponse] = Field(..., description="First errors, capped")
+    started_at: Optional[datetime] = Field(None, description="When the ingest started")
+    updated_at: Optional[datetime] = Field(None, description="Last progress update")
 
 
 class ErrorResponse(BaseModel):
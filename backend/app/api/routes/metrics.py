@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import (
+    get_cache_service,
+    get_calculation_executor,
+    get_calculation_memo,
+    get_single_flight,
+)
+from app.api.middleware.auth import get_current_user
+from app.domain.entities.auth import AuthUser
+from app.domain.ports.cache_service import CacheService
+from app.domain.ports.calculation_executor import CalculationExecutor
+from app.infrastructure.memory_cache import LRUCache
+from app.infrastructure.single_flight import SingleFlight
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_model=dict)
+async def get_metrics(
+    current_user: Annotated[AuthUser, Depends(get_current_user)],
+    calculation_executor: Annotated[
+        CalculationExecutor, Depends(get_calculation_executor)
+    ],
+    calculation_memo: Annotated[LRUCache, Depends(get_calculation_memo)],
+    cache_service: Annotated[CacheService, Depends(get_cache_service)],
+    single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+):
+    """Runtime metrics of in-process components (authenticated, as they expose internals)"""
+    return {
+        "calculation_executor": calculation_executor.metrics(),
+        "calculation_memo": calculation_memo.stats(),
+        "cache": cache_service.stats(),
+        "cache_single_flight": single_flight.stats(),
+    }
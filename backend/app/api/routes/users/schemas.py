@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, EmailStr
 
@@ -22,6 +22,7 @@ class PaginationParams(BaseModel):
     """Schema for pagination parameters"""
     skip: int = Field(default=0, ge=0, description="Number of items to skip")
     limit: int = Field(default=10, ge=1, le=100, description="Number of items to return")
+    cursor: Optional[str] = Field(default=None, description="Cursor from a previous page; replaces skip")
 
 
 class CreateUserRequest(BaseModel):
@@ -44,3 +45,4 @@ class PaginatedResponse(BaseModel):
     limit: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
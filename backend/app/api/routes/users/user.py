@@ -4,6 +4,7 @@ from app.api.dependencies import get_user_service, get_auth_service
 from app.application.services.user_service import UserService
 from app.application.services.auth_service import AuthService
 from app.api.middleware.auth import get_current_user
+from app.api.pagination import decode_object_id_cursor, encode_cursor
 from app.api.routes.users.schemas import (
     PaginatedResponse,
     PaginationParams, 
@@ -23,10 +24,13 @@ async def get_users(
 ):
     """Get paginated users"""
     try:
+        after = decode_object_id_cursor(pagination.cursor) if pagination.cursor else None
+        
         # Get users and total count
         users = await user_service.get_users_paginated(
             skip=pagination.skip,
-            limit=pagination.limit
+            limit=pagination.limit,
+            after=after
         )
         total = await user_service.get_users_count()
         
@@ -41,18 +45,33 @@ async def get_users(
         ]
         
         # Calculate pagination info
-        has_next = pagination.skip + pagination.limit < total
-        has_prev = pagination.skip > 0
+        next_cursor = None
+        last_user = users[-1] if len(users) == pagination.limit else None
+        if last_user and last_user.created_at and last_user.id:
+            next_cursor = encode_cursor(last_user.created_at, last_user.id)
+        
+        if after:
+            has_next = next_cursor is not None
+            has_prev = True
+        else:
+            has_next = pagination.skip + pagination.limit < total
+            has_prev = pagination.skip > 0
         
         return PaginatedResponse(
             items=user_responses,
             total=total,
-            skip=pagination.skip,
+            skip=0 if after else pagination.skip,
             limit=pagination.limit,
             has_next=has_next,
-            has_prev=has_prev
+            has_prev=has_prev,
+            next_cursor=next_cursor if has_next else None
         )
     
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
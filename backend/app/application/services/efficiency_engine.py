@@ -0,0 +1,282 @@
+from collections.abc import Sequence
+from operator import attrgetter
+
+import numpy as np
+
+from app.domain.entities.efficiency import (
+    EfficiencySummary,
+    PeriodData,
+    PeriodEfficiencyMetrics,
+)
+
+# Input columns, in the order they are packed into the float64 matrix
+INPUT_COLUMNS = (
+    "baseline_electric_kwh",
+    "current_electric_kwh",
+    "baseline_gas_therms",
+    "current_gas_therms",
+    "electric_rate",
+    "gas_rate",
+)
+
+# Per-period metrics that are summed / averaged into the summary
+SUMMED_METRICS = (
+    "electric_savings_kwh",
+    "gas_savings_therms",
+    "electric_cost_savings",
+    "gas_cost_savings",
+    "total_cost_savings",
+)
+AVERAGED_METRICS = (
+    "electric_efficiency_improvement",
+    "gas_efficiency_improvement",
+    "overall_efficiency_improvement",
+)
+
+# Same thresholds as EfficiencyService._calculate_performance_grade
+GRADE_THRESHOLDS = ((25, "A"), (15, "B"), (10, "C"), (5, "D"))
+LOWEST_GRADE = "F"
+
+_input_values = attrgetter(*INPUT_COLUMNS)
+
+CalculationResult = tuple[list[PeriodEfficiencyMetrics], EfficiencySummary]
+
+
+def to_columns(
+    batches: Sequence[Sequence[PeriodData]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pack a batch of period lists into a (columns, periods) float64 matrix and per-batch counts"""
+    counts = np.fromiter(
+        (len(periods) for periods in batches), dtype=np.int64, count=len(batches)
+    )
+    rows = [_input_values(period) for periods in batches for period in periods]
+    matrix = np.array(rows, dtype=np.float64).reshape(-1, len(INPUT_COLUMNS))
+    return np.ascontiguousarray(matrix.T), counts
+
+
+def compute_period_columns(columns: np.ndarray) -> dict[str, np.ndarray]:
+    """Vectorized per-period metrics, operation-for-operation with the pure-Python path"""
+    (
+        baseline_electric,
+        current_electric,
+        baseline_gas,
+        current_gas,
+        electric_rates,
+        gas_rates,
+    ) = columns
+
+    electric_savings = baseline_electric - current_electric
+    gas_savings = baseline_gas - current_gas
+
+    electric_cost_savings = electric_savings * electric_rates
+    gas_cost_savings = gas_savings * gas_rates
+    total_cost_savings = electric_cost_savings + gas_cost_savings
+
+    total_baseline = baseline_electric + baseline_gas
+    total_current = current_electric + current_gas
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        electric_efficiency = np.where(
+            baseline_electric > 0, (electric_savings / baseline_electric) * 100, 0.0
+        )
+        gas_efficiency = np.where(
+            baseline_gas > 0, (gas_savings / baseline_gas) * 100, 0.0
+        )
+        overall_efficiency = np.where(
+            total_baseline > 0,
+            ((total_baseline - total_current) / total_baseline) * 100,
+            0.0,
+        )
+
+    return {
+        "electric_savings_kwh": electric_savings,
+        "gas_savings_therms": gas_savings,
+        "electric_cost_savings": electric_cost_savings,
+        "gas_cost_savings": gas_cost_savings,
+        "total_cost_savings": total_cost_savings,
+        "electric_efficiency_improvement": electric_efficiency,
+        "gas_efficiency_improvement": gas_efficiency,
+        "overall_efficiency_improvement": overall_efficiency,
+    }
+
+
+def python_sum(matrix: np.ndarray) -> np.ndarray:
+    """Sum along the last axis bit-identically to the builtin sum()
+
+    Since Python 3.12 sum() of floats uses Neumaier compensated summation, which
+    differs from NumPy's pairwise reduction. This replays it one column at a time,
+    vectorized over every leading axis. Zero padding is neutral.
+    """
+    result = 0.0 + matrix[..., 0]
+    compensation = np.zeros_like(result)
+    for j in range(1, matrix.shape[-1]):
+        value = matrix[..., j]
+        total = result + value
+        compensation += np.where(
+            np.abs(result) >= np.abs(value),
+            (result - total) + value,
+            (value - total) + result,
+        )
+        result = total
+    return np.where(
+        (compensation != 0) & np.isfinite(compensation), result + compensation, result
+    )
+
+
+def performance_grades(efficiency_improvement: np.ndarray) -> np.ndarray:
+    """Vectorized performance grade"""
+    return np.select(
+        [efficiency_improvement >= threshold for threshold, _ in GRADE_THRESHOLDS],
+        [grade for _, grade in GRADE_THRESHOLDS],
+        LOWEST_GRADE,
+    )
+
+
+def segment_sums(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-calculation sums of flat (metrics, periods) values, matching the builtin sum()
+
+    Wide batches (many short calculations) replay the compensated sum across a zero
+    padded (metrics, calculations, max_periods) matrix; a few long calculations are
+    cheaper to hand to sum() directly, one contiguous slice at a time.
+    """
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    max_periods = int(counts.max())
+
+    if max_periods > len(counts):
+        bounds = list(zip(offsets.tolist(), (offsets + counts).tolist()))
+        return np.array(
+            [[sum(row[start:end]) for start, end in bounds] for row in values.tolist()],
+            dtype=np.float64,
+        )
+
+    rows = np.repeat(np.arange(len(counts)), counts)
+    cols = np.arange(values.shape[-1]) - np.repeat(offsets, counts)
+    padded = np.zeros((values.shape[0], len(counts), max_periods), dtype=np.float64)
+    padded[:, rows, cols] = values
+    return python_sum(padded)
+
+
+def calculate_batch(batches: Sequence[Sequence[PeriodData]]) -> list[CalculationResult]:
+    """Calculate period metrics and summaries for many calculations in one NumPy pass"""
+    if not batches:
+        return []
+    if any(not periods for periods in batches):
+        raise ValueError("Every calculation needs at least one period")
+
+    columns, counts = to_columns(batches)
+    metrics = compute_period_columns(columns)
+
+    sums = segment_sums(
+        np.stack([metrics[name] for name in SUMMED_METRICS + AVERAGED_METRICS]), counts
+    )
+    averages = sums[len(SUMMED_METRICS) :] / counts
+    grades = performance_grades(averages[-1]).tolist()
+
+    metric_rows = zip(
+        *(metrics[name].tolist() for name in SUMMED_METRICS + AVERAGED_METRICS)
+    )
+    summary_rows = zip(
+        *sums[: len(SUMMED_METRICS)].tolist(), *averages.tolist(), grades
+    )
+
+    results: list[CalculationResult] = []
+    for periods, summary_row in zip(batches, summary_rows):
+        period_metrics = []
+        for period, row in zip(periods, metric_rows):
+            period_metrics.append(
+                PeriodEfficiencyMetrics(
+                    period=period.period,
+                    time_range=period.time_range,
+                    days=period.days,
+                    electric_savings_kwh=row[0],
+                    gas_savings_therms=row[1],
+                    electric_cost_savings=row[2],
+                    gas_cost_savings=row[3],
+                    total_cost_savings=row[4],
+                    electric_efficiency_improvement=row[5],
+                    gas_efficiency_improvement=row[6],
+                    overall_efficiency_improvement=row[7],
+                )
+            )
+
+        summary = EfficiencySummary(
+            total_electric_savings_kwh=summary_row[0],
+            total_gas_savings_therms=summary_row[1],
+            total_electric_cost_savings=summary_row[2],
+            total_gas_cost_savings=summary_row[3],
+            total_cost_savings=summary_row[4],
+            average_electric_efficiency_improvement=summary_row[5],
+            average_gas_efficiency_improvement=summary_row[6],
+            overall_efficiency_improvement=summary_row[7],
+            performance_grade=summary_row[8],
+        )
+        results.append((period_metrics, summary))
+
+    return results
+
+
+def rate_grid(start: float, stop: float, steps: int) -> np.ndarray:
+    """Evenly spaced rates, both ends included"""
+    return np.linspace(start, stop, steps, dtype=np.float64)
+
+
+def tariff_sweep(
+    electric_savings: Sequence[float],
+    gas_savings: Sequence[float],
+    electric_rates: np.ndarray,
+    gas_rates: np.ndarray,
+) -> np.ndarray:
+    """Total cost savings for every (electric rate, gas rate) pair
+
+    Applies the period cost formulas with every period priced at the swept rates:
+    (periods, electric) and (periods, gas) cost matrices are summed over periods
+    and combined by broadcasting into an (electric, gas) grid.
+    """
+    electric = np.asarray(electric_savings, dtype=np.float64)
+    gas = np.asarray(gas_savings, dtype=np.float64)
+
+    electric_cost_savings = electric[:, np.newaxis] * electric_rates[np.newaxis, :]
+    gas_cost_savings = gas[:, np.newaxis] * gas_rates[np.newaxis, :]
+
+    return (
+        electric_cost_savings.sum(axis=0)[:, np.newaxis]
+        + gas_cost_savings.sum(axis=0)[np.newaxis, :]
+    )
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], max_points: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling
+
+    The first and last points are always kept, and the interior is split into
+    max_points - 2 buckets. Each bucket keeps the point forming the largest
+    triangle with the previously kept point and the next bucket's average. Bucket
+    edges and averages are computed in one pass; the walk over buckets is
+    sequential (each choice depends on the previous one) with vectorized areas.
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n = len(xs)
+    if max_points < 3 or n <= max_points:
+        return np.arange(n)
+
+    buckets = max_points - 2
+    edges = np.floor(np.linspace(1, n - 1, buckets + 1)).astype(np.int64)
+    counts = np.diff(edges)
+
+    # Third triangle vertex: average of the following bucket, or the last point
+    next_x = np.append((np.add.reduceat(xs[: n - 1], edges[:-1]) / counts)[1:], xs[-1])
+    next_y = np.append((np.add.reduceat(ys[: n - 1], edges[:-1]) / counts)[1:], ys[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for bucket, (start, end) in enumerate(zip(edges[:-1].tolist(), edges[1:].tolist())):
+        anchor_x, anchor_y = xs[anchor], ys[anchor]
+        areas = np.abs(
+            (anchor_x - next_x[bucket]) * (ys[start:end] - anchor_y)
+            - (anchor_x - xs[start:end]) * (next_y[bucket] - anchor_y)
+        )
+        anchor = start + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+
+    return selected
@@ -1,42 +1,102 @@
-from typing import List, Optional
+import asyncio
+import time
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple, TypeVar
+import hashlib
 import json
 
+from app.application.services import efficiency_engine
+from app.domain.entities.chart import CHART_BUCKETS, CHART_METRICS, BuildingChart, ChartSeries
+from app.domain.entities.leaderboard import (
+    LEADERBOARD_METRICS,
+    LEADERBOARD_ORDERS,
+    BuildingRank,
+    Leaderboard,
+)
+from app.domain.entities.portfolio import MeasureAnalytics, PortfolioRollup
 from app.domain.entities.efficiency import (
+    BatchItemResult,
+    CalculationRequest,
     EfficiencyCalculation, 
+    RateRange,
+    TariffSweep,
     PeriodData, 
     PeriodEfficiencyMetrics, 
     EfficiencySummary,
     BuildingEfficiencySummary
 )
+from app.domain.ports.building_index import BuildingIndex
+from app.domain.ports.building_leaderboard import BuildingLeaderboard
 from app.domain.ports.efficiency_repository import EfficiencyRepository
 from app.domain.ports.cache_service import CacheService
+from app.domain.ports.calculation_executor import CalculationExecutor
+from app.infrastructure.config import settings
 from app.infrastructure.logging import get_logger
+from app.infrastructure.memory_cache import LRUCache
+from app.infrastructure.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Per-building cache entry families, each tagged for bulk invalidation
+EFFICIENCY_CACHE_FAMILIES = (
+    "building_summary",
+    "latest_calculation",
+    "building_calculations",
+    "building_period",
+    "chart",
+)
+
 
 class EfficiencyService:
     """Efficiency calculation application service with Redis caching"""
 
-    def __init__(self, efficiency_repository: EfficiencyRepository, cache_service: CacheService):
+    def __init__(
+        self,
+        efficiency_repository: EfficiencyRepository,
+        cache_service: CacheService,
+        calculation_executor: Optional[CalculationExecutor] = None,
+        calculation_memo: Optional[LRUCache] = None,
+        building_index: Optional[BuildingIndex] = None,
+        building_leaderboard: Optional[BuildingLeaderboard] = None,
+        single_flight: Optional[SingleFlight] = None
+    ):
         """Initialize efficiency service with dependencies"""
         self.efficiency_repository = efficiency_repository
         self.cache_service = cache_service
-        self._cache_ttl = 300  # 5 minutes
+        self.calculation_executor = calculation_executor
+        self.calculation_memo = calculation_memo
+        self.building_index = building_index
+        self.building_leaderboard = building_leaderboard
+        self.single_flight = single_flight
+        self._cache_ttl = settings.efficiency_cache_ttl
+        self._cache_soft_ttl = settings.efficiency_cache_soft_ttl
 
     async def calculate_efficiency(
         self, 
         building_id: str, 
         measure_name: str, 
-        periods: List[PeriodData]
+        periods: List[PeriodData],
+        preview: bool = False
     ) -> EfficiencyCalculation:
-        """Calculate efficiency metrics for all periods"""
+        """Calculate efficiency metrics for all periods
+        
+        In preview mode nothing is stored, and results are memoized by a hash of the
+        period inputs so repeated what-if submissions skip the calculation.
+        """
         
-        # Period metrics
-        period_metrics = self._calculate_period_metrics(periods)
+        if preview:
+            period_metrics, summary = await self._calculate_memoized(periods)
+            return EfficiencyCalculation(
+                building_id=building_id,
+                measure_name=measure_name,
+                periods=period_metrics,
+                summary=summary
+            )
         
-        # Calculate summary
-        summary = self._calculate_summary(period_metrics)
+        # Period metrics and summary
+        period_metrics, summary = (await self._run_calculations([periods]))[0]
         
         # Create efficiency calculation
         calculation = EfficiencyCalculation(
@@ -47,53 +107,160 @@ class EfficiencyService:
         )
         
         # Save to repository
-        return await self.efficiency_repository.create(calculation)
+        created = await self.efficiency_repository.create(calculation)
+        await self._invalidate_buildings([created.building_id])
+        await self._index_buildings([created.building_id])
+        await self._update_leaderboards([created.building_id])
+        
+        return created
 
-    def _calculate_period_metrics(self, period_data: PeriodData) -> PeriodEfficiencyMetrics:
-        """Calculate efficiency metrics for a single period"""
+    async def calculate_efficiency_batch(self, requests: List[CalculationRequest]) -> List[BatchItemResult]:
+        """Calculate efficiency metrics for many calculations and persist them in bulk"""
+        if not requests:
+            return []
+        
+        # All calculations in one pass
+        metrics = await self._run_calculations([request.periods for request in requests])
+        
+        calculations = [
+            EfficiencyCalculation(
+                building_id=request.building_id,
+                measure_name=request.measure_name,
+                periods=period_metrics,
+                summary=summary
+            )
+            for request, (period_metrics, summary) in zip(requests, metrics)
+        ]
         
-        # Energy savings
-        electric_savings = period_data.baseline_electric_kwh - period_data.current_electric_kwh
-        gas_savings = period_data.baseline_gas_therms - period_data.current_gas_therms
+        # Save to repository
+        results = await self.efficiency_repository.create_many(calculations)
+        building_ids = [result.calculation.building_id for result in results if result.calculation]
+        await self._invalidate_buildings(building_ids)
+        await self._index_buildings(building_ids)
+        await self._update_leaderboards(building_ids)
         
-        # Cost savings
-        electric_cost_savings = electric_savings * period_data.electric_rate
-        gas_cost_savings = gas_savings * period_data.gas_rate
-        total_cost_savings = electric_cost_savings + gas_cost_savings
+        return results
+
+    async def autocomplete_buildings(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get building IDs starting with prefix, from the building index or the database"""
+        if self.building_index:
+            building_ids = await self.building_index.search(prefix, limit)
+            if building_ids is not None:
+                return building_ids
+        
+        return await self.efficiency_repository.search_building_ids(prefix, limit)
+
+    async def _index_buildings(self, building_ids: List[str]):
+        """Keep the building autocomplete index in sync with stored calculations"""
+        if self.building_index and building_ids:
+            await self.building_index.add(sorted(set(building_ids)))
+
+    async def get_leaderboard(self, metric: str, order: str = "top", limit: int = 10) -> Leaderboard:
+        """Get the top or bottom buildings for a metric, from the leaderboards or the database"""
+        self._validate_leaderboard_metric(metric)
+        if order not in LEADERBOARD_ORDERS:
+            raise ValueError(f"Unknown order: {order}")
+        
+        if self.building_leaderboard:
+            leaderboard = await self.building_leaderboard.get_leaderboard(metric, order, limit)
+            if leaderboard is not None:
+                return leaderboard
+        
+        return await self.efficiency_repository.get_leaderboard(metric, order, limit)
+
+    async def get_building_rank(self, metric: str, building_id: str) -> BuildingRank:
+        """Get the rank of a building for a metric, from the leaderboards or the database"""
+        self._validate_leaderboard_metric(metric)
         
-        # Efficiency improvements (percentage)
-        electric_efficiency_improvement = (
-            (electric_savings / period_data.baseline_electric_kwh) * 100
-            if period_data.baseline_electric_kwh > 0 else 0
-        )
-        gas_efficiency_improvement = (
-            (gas_savings / period_data.baseline_gas_therms) * 100
-            if period_data.baseline_gas_therms > 0 else 0
-        )
+        if self.building_leaderboard:
+            rank = await self.building_leaderboard.get_rank(metric, building_id)
+            if rank is not None:
+                return rank
         
-        # Overall efficiency improvement (weighted average)
-        total_baseline_energy = period_data.baseline_electric_kwh + period_data.baseline_gas_therms
-        total_current_energy = period_data.current_electric_kwh + period_data.current_gas_therms
-        overall_efficiency_improvement = (
-            ((total_baseline_energy - total_current_energy) / total_baseline_energy) * 100
-            if total_baseline_energy > 0 else 0
-        )
+        return await self.efficiency_repository.get_building_rank(metric, building_id)
+
+    def _validate_leaderboard_metric(self, metric: str):
+        """Reject metrics that have no leaderboard"""
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+    async def _update_leaderboards(self, building_ids: List[str]):
+        """Copy the updated summary totals of buildings into the leaderboards"""
+        if not self.building_leaderboard or not building_ids:
+            return
         
-        return PeriodEfficiencyMetrics(
-            period=period_data.period,
-            time_range=period_data.time_range,
-            days=period_data.days,
-            electric_savings_kwh=electric_savings,
-            gas_savings_therms=gas_savings,
-            electric_cost_savings=electric_cost_savings,
-            gas_cost_savings=gas_cost_savings,
-            total_cost_savings=total_cost_savings,
-            electric_efficiency_improvement=electric_efficiency_improvement,
-            gas_efficiency_improvement=gas_efficiency_improvement,
-            overall_efficiency_improvement=overall_efficiency_improvement
+        try:
+            scores = await self.efficiency_repository.get_building_scores(sorted(set(building_ids)))
+            await self.building_leaderboard.update(scores)
+        except Exception as e:
+            logger.error(f"Error updating leaderboards: {e}")
+
+    async def _calculate_memoized(
+        self,
+        periods: List[PeriodData]
+    ) -> Tuple[List[PeriodEfficiencyMetrics], EfficiencySummary]:
+        """Calculate metrics for one calculation, reusing results for identical inputs"""
+        if self.calculation_memo is None:
+            return (await self._run_calculations([periods]))[0]
+        
+        key = self.periods_hash(periods)
+        cached = self.calculation_memo.get(key)
+        if cached is not None:
+            return cached
+        
+        result = (await self._run_calculations([periods]))[0]
+        self.calculation_memo.set(key, result)
+        return result
+
+    @staticmethod
+    def periods_hash(periods: List[PeriodData]) -> str:
+        """Canonical content hash of period inputs"""
+        canonical = json.dumps(
+            [period.model_dump() for period in periods],
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def _run_calculations(
+        self,
+        batches: Sequence[List[PeriodData]]
+    ) -> List[Tuple[List[PeriodEfficiencyMetrics], EfficiencySummary]]:
+        """Calculate metrics, handing large batches to the calculation executor"""
+        if not self.calculation_executor:
+            return self.calculate_metrics(batches)
+        
+        total_periods = sum(len(periods) for periods in batches)
+        return await self.calculation_executor.run(
+            EfficiencyService.calculate_metrics,
+            list(batches),
+            size=total_periods
         )
 
-    def _calculate_period_metrics(self, periods: List[PeriodData]) -> List[PeriodEfficiencyMetrics]:
+    @staticmethod
+    def calculate_metrics(
+        batches: Sequence[List[PeriodData]]
+    ) -> List[Tuple[List[PeriodEfficiencyMetrics], EfficiencySummary]]:
+        """Calculate period metrics and summary for one or many calculations
+        
+        Large inputs go through the vectorized NumPy engine, small ones through the
+        pure-Python path below; both produce identical results.
+        """
+        total_periods = sum(len(periods) for periods in batches)
+        if (
+            settings.efficiency_vectorized_engine
+            and total_periods >= settings.efficiency_vectorize_min_periods
+        ):
+            return efficiency_engine.calculate_batch(batches)
+        
+        results = []
+        for periods in batches:
+            period_metrics = EfficiencyService._calculate_period_metrics(periods)
+            results.append((period_metrics, EfficiencyService._calculate_summary(period_metrics)))
+        return results
+
+    @staticmethod
+    def _calculate_period_metrics(periods: List[PeriodData]) -> List[PeriodEfficiencyMetrics]:
         """Calculation for all periods at once"""
         
         # Extract all values into arrays
@@ -148,7 +315,8 @@ class EfficiencyService:
         
         return period_metrics
 
-    def _calculate_summary(self, period_metrics: List[PeriodEfficiencyMetrics]) -> EfficiencySummary:
+    @staticmethod
+    def _calculate_summary(period_metrics: List[PeriodEfficiencyMetrics]) -> EfficiencySummary:
         """Calculate aggregated summary from all period metrics"""
         
         # Aggregate totals
@@ -177,7 +345,7 @@ class EfficiencyService:
         )
         
         # Calculate performance grade
-        performance_grade = self._calculate_performance_grade(overall_efficiency_improvement)
+        performance_grade = EfficiencyService._calculate_performance_grade(overall_efficiency_improvement)
         
         return EfficiencySummary(
             total_electric_savings_kwh=total_electric_savings,
@@ -191,7 +359,8 @@ class EfficiencyService:
             performance_grade=performance_grade
         )
 
-    def _calculate_performance_grade(self, efficiency_improvement: float) -> str:
+    @staticmethod
+    def _calculate_performance_grade(efficiency_improvement: float) -> str:
         """Calculate performance grade based on efficiency"""
         if efficiency_improvement >= 25:
             return "A"
@@ -204,107 +373,259 @@ class EfficiencyService:
         else:
             return "F"
 
-    async def get_building_calculations(self, building_id: str) -> List[EfficiencyCalculation]:
-        """Get all efficiency calculations for a building with Redis caching"""
-        cache_key = f"efficiency:building_calculations:{building_id}"
-        
-        cached_data = await self.cache_service.get(cache_key)
-        if cached_data:
-            try:
-                calculations_data = json.loads(cached_data)
-                logger.info("Getting building calculations from cache")
-                return [EfficiencyCalculation(**calc) for calc in calculations_data]
-            except Exception as e:
-                logger.error(f"Error deserializing building calculations: {e}") 
+    async def sweep_tariffs(
+        self,
+        calculation_id: str,
+        electric_rates: RateRange,
+        gas_rates: RateRange
+    ) -> Optional[TariffSweep]:
+        """Total cost savings of a stored calculation over a grid of rates, without storing anything"""
+        for rate_range in (electric_rates, gas_rates):
+            if rate_range.steps > settings.tariff_sweep_max_steps:
+                raise ValueError(f"Rate steps must not exceed {settings.tariff_sweep_max_steps}")
+            if rate_range.stop < rate_range.start:
+                raise ValueError("Rate range stop must not be lower than start")
+        
+        calculation = await self.efficiency_repository.get_by_id(calculation_id)
+        if not calculation:
+            return None
+        
+        electric_grid = efficiency_engine.rate_grid(electric_rates.start, electric_rates.stop, electric_rates.steps)
+        gas_grid = efficiency_engine.rate_grid(gas_rates.start, gas_rates.stop, gas_rates.steps)
+        
+        total_cost_savings = efficiency_engine.tariff_sweep(
+            [period.electric_savings_kwh for period in calculation.periods],
+            [period.gas_savings_therms for period in calculation.periods],
+            electric_grid,
+            gas_grid
+        )
         
-        calculations = await self.efficiency_repository.get_by_building_id(building_id)
+        # Grades follow overall efficiency improvement, which does not depend on rates
+        return TariffSweep(
+            calculation_id=calculation_id,
+            building_id=calculation.building_id,
+            electric_rates=electric_grid.tolist(),
+            gas_rates=gas_grid.tolist(),
+            total_cost_savings=total_cost_savings.round(2).tolist(),
+            min_total_cost_savings=float(total_cost_savings.min()),
+            max_total_cost_savings=float(total_cost_savings.max()),
+            performance_grade=calculation.summary.performance_grade
+        )
+
+    async def get_building_calculations(
+        self,
+        building_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[EfficiencyCalculation]:
+        """Get efficiency calculations for a building with Redis caching
         
-        # Cache in Redis
-        try:
-            calculations_data = [calc.model_dump(mode='json') for calc in calculations]
-            await self.cache_service.set(cache_key, json.dumps(calculations_data), self._cache_ttl)
-        except Exception as e:
-            logger.error(f"Error caching building calculations: {e}")
+        Without a limit, every calculation from after (or the newest) onwards is returned.
+        """
+        cache_key = await self._building_cache_key(
+            building_id, "building_calculations", self._history_page_key(limit, after, created_from, created_to)
+        )
         
-        return calculations
+        return await self._cached(
+            cache_key,
+            lambda: self.efficiency_repository.get_by_building_id(building_id, limit, after, created_from, created_to),
+            self._decode_calculations,
+            self._encode_calculations,
+            building_id,
+            "building_calculations"
+        ) or []
 
     async def get_building_calculations_by_period(
         self, 
         building_id: str, 
-        period: str
+        period: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
     ) -> List[EfficiencyCalculation]:
-        """Get efficiency calculations for a building and specific period with Redis caching"""
-        cache_key = f"efficiency:building_period:{building_id}:{period}"
+        """Get efficiency calculations for a building and specific period with Redis caching
         
-        cached_data = await self.cache_service.get(cache_key)
-        if cached_data:
-            try:
-                calculations_data = json.loads(cached_data)
-                return [EfficiencyCalculation(**calc) for calc in calculations_data]
-            except Exception as e:
-                logger.error(f"Error deserializing building calculations: {e}")
+        Without a limit, every calculation from after (or the newest) onwards is returned.
+        """
+        cache_key = await self._building_cache_key(
+            building_id, "building_period", f"{period}:{self._history_page_key(limit, after, created_from, created_to)}"
+        )
         
-        # Get from database
-        calculations = await self.efficiency_repository.get_by_building_and_period(building_id, period)
+        return await self._cached(
+            cache_key,
+            lambda: self.efficiency_repository.get_by_building_and_period(
+                building_id, period, limit, after, created_from, created_to
+            ),
+            self._decode_calculations,
+            self._encode_calculations,
+            building_id,
+            "building_period"
+        ) or []
+
+    async def count_building_calculations(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> int:
+        """Count the calculations of a building, optionally for one period, with Redis caching"""
+        family = "building_calculations" if period is None else "building_period"
+        cache_key = await self._building_cache_key(
+            building_id,
+            family,
+            f"count:{period or 'all'}:{self._history_page_key(None, None, created_from, created_to)}"
+        )
         
-        try:
-            calculations_data = [calc.model_dump(mode='json') for calc in calculations]
-            await self.cache_service.set(cache_key, json.dumps(calculations_data), self._cache_ttl)
-        except Exception as e:
-            logger.error(f"Error caching building calculations: {e}")
+        return await self._cached(
+            cache_key,
+            lambda: self.efficiency_repository.count_by_building_id(building_id, period, created_from, created_to),
+            int,
+            str,
+            building_id,
+            family
+        ) or 0
+
+    def stream_building_calculations(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[EfficiencyCalculation]:
+        """Stream efficiency calculations for a building straight from the database, uncached"""
+        return self.efficiency_repository.iter_by_building_id(
+            building_id, period, limit, after, created_from, created_to
+        )
+
+    async def get_building_chart(
+        self,
+        building_id: str,
+        metric: str,
+        bucket: str = "day",
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        max_points: Optional[int] = None
+    ) -> BuildingChart:
+        """Get time-bucketed metric series for a building's periods
+        
+        With max_points, each series is downsampled with LTTB and the result is cached
+        per building and resolution, so the payload size does not grow with history.
+        """
+        if metric not in CHART_METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Expected one of: {', '.join(CHART_METRICS)}")
+        if bucket not in CHART_BUCKETS:
+            raise ValueError(f"Unknown bucket: {bucket}. Expected one of: {', '.join(CHART_BUCKETS)}")
+        
+        async def load_chart() -> BuildingChart:
+            series = await self.efficiency_repository.get_metric_series(
+                building_id, metric, bucket, period, created_from, created_to
+            )
+            if max_points:
+                series = [self._downsample_series(chart_series, max_points) for chart_series in series]
+            return BuildingChart(building_id=building_id, metric=metric, bucket=bucket, series=series)
+        
+        if not max_points:
+            return await load_chart()
+        
+        cache_key = await self._building_cache_key(
+            building_id,
+            "chart",
+            f"{metric}:{bucket}:{period or 'all'}:"
+            f"{created_from.isoformat() if created_from else 'any'}:"
+            f"{created_to.isoformat() if created_to else 'any'}:{max_points}"
+        )
+        chart = await self._cached(
+            cache_key, load_chart, BuildingChart.model_validate_json, BuildingChart.model_dump_json, building_id, "chart"
+        )
+        # load_chart never returns None, so neither does the cache
+        assert chart is not None
+        return chart
+
+    @staticmethod
+    def _downsample_series(series: ChartSeries, max_points: int) -> ChartSeries:
+        """Reduce a series to at most max_points with Largest-Triangle-Three-Buckets"""
+        if len(series.points) <= max_points:
+            return series
+        
+        kept = efficiency_engine.lttb_indices(
+            [point.timestamp.timestamp() for point in series.points],
+            [point.value for point in series.points],
+            max_points
+        )
         
-        return calculations
+        return ChartSeries(period=series.period, points=[series.points[index] for index in kept.tolist()])
+
+    def _history_page_key(
+        self,
+        limit: Optional[int],
+        after: Optional[Tuple[datetime, str]],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> str:
+        """Cache key suffix identifying one page of calculation history"""
+        after_key = f"{after[0].isoformat()}/{after[1]}" if after else "first"
+        from_key = created_from.isoformat() if created_from else "any"
+        to_key = created_to.isoformat() if created_to else "any"
+        return f"{limit or 'all'}:{after_key}:{from_key}:{to_key}"
 
     async def get_building_summary(self, building_id: str) -> Optional[BuildingEfficiencySummary]:
         """Get building efficiency summary with Redis caching"""
-        cache_key = f"efficiency:building_summary:{building_id}"
-        
-        cached_data = await self.cache_service.get(cache_key)
-        if cached_data:
-            try:
-                summary_data = json.loads(cached_data)
-                return BuildingEfficiencySummary(**summary_data)
-            except Exception as e:
-                logger.error(f"Error deserializing building summary: {e}")
-        
-        # Get from database
-        summary = await self.efficiency_repository.get_building_summary(building_id)
-        
-        # Cache in Redis
-        if summary:
-            try:
-                await self.cache_service.set(cache_key, json.dumps(summary.model_dump(mode='json')), self._cache_ttl)
-            except Exception as e:
-                logger.error(f"Error caching building summary: {e}")
-        
-        return summary
+        cache_key = await self._building_cache_key(building_id, "building_summary")
+        
+        return await self._cached(
+            cache_key,
+            lambda: self.efficiency_repository.get_building_summary(building_id),
+            BuildingEfficiencySummary.model_validate_json,
+            BuildingEfficiencySummary.model_dump_json,
+            building_id,
+            "building_summary"
+        )
+
+    async def get_portfolio(self) -> Optional[PortfolioRollup]:
+        """Get portfolio-wide analytics from the incrementally maintained rollups (aggregated until reconciled)"""
+        return await self.efficiency_repository.get_portfolio_rollup()
+
+    async def get_measure_analytics(self) -> List[MeasureAnalytics]:
+        """Get effectiveness analytics of every measure"""
+        return await self.efficiency_repository.get_measure_analytics()
+
+    async def get_measure(self, measure_name: str) -> Optional[MeasureAnalytics]:
+        """Get effectiveness analytics of one measure"""
+        analytics = await self.efficiency_repository.get_measure_analytics(measure_name)
+        return analytics[0] if analytics else None
 
     async def get_latest_calculation(self, building_id: str) -> Optional[EfficiencyCalculation]:
         """Get the latest efficiency calculation for a building with Redis caching"""
-        cache_key = f"efficiency:latest_calculation:{building_id}"
-        
-        cached_data = await self.cache_service.get(cache_key)
-        if cached_data:
-            try:
-                calculation_data = json.loads(cached_data)
-                return EfficiencyCalculation(**calculation_data)
-            except Exception as e:
-                logger.error(f"Error deserializing latest calculation: {e}")
-        
-        calculation = await self.efficiency_repository.get_latest_by_building_id(building_id)
-        
-        # Cache in Redis
-        if calculation:
-            try:
-                await self.cache_service.set(cache_key, json.dumps(calculation.model_dump(mode='json')), self._cache_ttl)
-            except Exception as e:
-                logger.error(f"Error caching latest calculation: {e}")
-
-        return calculation
+        cache_key = await self._building_cache_key(building_id, "latest_calculation")
+        
+        return await self._cached(
+            cache_key,
+            lambda: self.efficiency_repository.get_latest_by_building_id(building_id),
+            EfficiencyCalculation.model_validate_json,
+            EfficiencyCalculation.model_dump_json,
+            building_id,
+            "latest_calculation"
+        )
 
-    async def get_all_buildings_summary(self, skip: int = 0, limit: int = 100, search: str = None) -> tuple[List[BuildingEfficiencySummary], int]:
+    async def get_all_buildings_summary(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        include_total: bool = True,
+        view: str = "full"
+    ) -> tuple[List[BuildingEfficiencySummary], Optional[int]]:
         """Get summary for all buildings with Redis caching, pagination, and search"""
-        cache_key = f"efficiency:all_buildings_summary:{skip}:{limit}:{search or 'all'}"
+        page_key = f"after:{after[0].isoformat()}:{after[1]}" if after else skip
+        cache_key = f"efficiency:all_buildings_summary:{page_key}:{limit}:{search or 'all'}:{int(include_total)}:{view}"
 
         cached_data = None #await self.cache_service.get(cache_key)
         if cached_data:
@@ -317,22 +638,212 @@ class EfficiencyService:
                 logger.error(f"Error deserializing all buildings summary: {e}")
         
         # Get from database
-        summaries, total_count = await self.efficiency_repository.get_all_buildings_summary(skip, limit, search)
+        summaries, total_count = await self.efficiency_repository.get_all_buildings_summary(
+            skip, limit, search, after, include_total, view
+        )
         
         return summaries, total_count
 
     async def clear_cache(self, building_id: str = None):
         """Clear cached data for a building or all efficiency data"""
         if building_id:
-            # Clear specific building cache
-            patterns = [
-                f"efficiency:building_calculations:{building_id}",
-                f"efficiency:building_summary:{building_id}",
-                f"efficiency:latest_calculation:{building_id}",
-                f"efficiency:building_period:{building_id}:*"
-            ]
-            for pattern in patterns:
-                await self.cache_service.delete_pattern(pattern)
+            # Readers move to the new generation at once; the tag frees the old entries
+            await self._invalidate_buildings([building_id])
+            await self.cache_service.delete_tags([f"efficiency:building:{building_id}"])
         else:
-            # Clear all efficiency cache
-            await self.cache_service.delete_pattern("efficiency:*")
+            # Clear all efficiency cache family by family; scan only when nothing was tracked
+            tracked = await self.cache_service.delete_tags(
+                [f"efficiency:family:{family}" for family in EFFICIENCY_CACHE_FAMILIES]
+            )
+            if not tracked:
+                await self.cache_service.delete_pattern("efficiency:*")
+
+    async def _building_cache_key(self, building_id: str, name: str, suffix: Optional[str] = None) -> str:
+        """Cache key for a building's data, versioned by the building's generation counter"""
+        generation = await self.cache_service.get_generation(self._generation_key(building_id))
+        cache_key = f"efficiency:{name}:{building_id}:g{generation}"
+        return f"{cache_key}:{suffix}" if suffix else cache_key
+
+    async def _cached(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        decode: Callable[[str], T],
+        encode: Callable[[T], str],
+        building_id: str,
+        family: str
+    ) -> Optional[T]:
+        """Get a building's value from the cache, loading and caching it on a miss
+        
+        Concurrent misses for the same key in this process share one load. None
+        results (nothing found) are not cached. An entry past its soft expiry is
+        returned as is while a background task refreshes it (reloaded inline when
+        there is no single-flight to run the task).
+        """
+        cached_entry = await self._get_cached(cache_key, self._entry_decoder(decode), family)
+        if cached_entry is not None:
+            value, refresh_at = cached_entry
+            if time.time() < refresh_at:
+                return value
+            if self.single_flight:
+                self.single_flight.start(
+                    ("refresh", cache_key),
+                    lambda: self._refresh_cached(cache_key, loader, encode, building_id, family)
+                )
+                return value
+        
+        async def load() -> Optional[T]:
+            return await self._load_and_cache(cache_key, loader, decode, encode, building_id, family)
+        
+        if self.single_flight:
+            return await self.single_flight.do(cache_key, load)
+        return await load()
+
+    async def _load_and_cache(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        decode: Callable[[str], T],
+        encode: Callable[[T], str],
+        building_id: str,
+        family: str
+    ) -> Optional[T]:
+        """Load a missing value and cache it
+        
+        With cache locking enabled, only the node holding the key's lock loads it;
+        the others poll the cache for its result for up to cache_lock_wait seconds,
+        then load it themselves.
+        """
+        lock_token = None
+        if settings.cache_lock_enabled:
+            lock_token = await self.cache_service.acquire_lock(cache_key, settings.cache_lock_ttl)
+            if lock_token is None:
+                cached_entry = await self._wait_for_cached(cache_key, self._entry_decoder(decode), family)
+                if cached_entry is not None:
+                    return cached_entry[0]
+        
+        try:
+            value = await loader()
+            if value is not None:
+                await self._set_cached(cache_key, value, encode, building_id, family)
+            return value
+        finally:
+            if lock_token:
+                await self.cache_service.release_lock(cache_key, lock_token)
+
+    async def _refresh_cached(
+        self,
+        cache_key: str,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        encode: Callable[[T], str],
+        building_id: str,
+        family: str
+    ):
+        """Reload a stale entry in the background
+        
+        With cache locking enabled, the key's lock keeps replicas from refreshing the
+        same entry at once; a replica that does not get it leaves the refresh to the
+        holder.
+        """
+        lock_token = None
+        if settings.cache_lock_enabled:
+            lock_token = await self.cache_service.acquire_lock(cache_key, settings.cache_lock_ttl)
+            if lock_token is None:
+                return
+        
+        try:
+            value = await loader()
+            if value is not None:
+                await self._set_cached(cache_key, value, encode, building_id, family)
+        except Exception as e:
+            logger.error(f"Error refreshing {family.replace('_', ' ')}: {e}")
+        finally:
+            if lock_token:
+                await self.cache_service.release_lock(cache_key, lock_token)
+
+    async def _wait_for_cached(self, cache_key: str, decode: Callable[[str], T], family: str) -> Optional[T]:
+        """Poll the cache for a value another node is loading"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.cache_lock_wait
+        while loop.time() < deadline:
+            await asyncio.sleep(settings.cache_lock_poll_interval)
+            cached_value = await self._get_cached(cache_key, decode, family)
+            if cached_value is not None:
+                return cached_value
+        return None
+
+    async def _get_cached(self, cache_key: str, decode: Callable[[str], T], family: str) -> Optional[T]:
+        """Get a cached value, treating entries that fail to decode as misses
+        
+        Values may come from the in-process tier shared by concurrent requests, so
+        callers must not mutate them.
+        """
+        try:
+            return await self.cache_service.get_object(cache_key, decode)
+        except Exception as e:
+            logger.error(f"Error deserializing {family.replace('_', ' ')}: {e}")
+            return None
+
+    async def _set_cached(
+        self,
+        cache_key: str,
+        value: T,
+        encode: Callable[[T], str],
+        building_id: str,
+        family: str
+    ):
+        """Cache a building's value with its soft expiry, tagged with its building and family"""
+        refresh_at = time.time() + self._cache_soft_ttl if self._cache_soft_ttl else float("inf")
+        try:
+            await self.cache_service.set_object(
+                cache_key,
+                (value, refresh_at),
+                self._entry_encoder(encode),
+                self._cache_ttl,
+                tags=self._cache_tags(building_id, family)
+            )
+        except Exception as e:
+            logger.error(f"Error caching {family.replace('_', ' ')}: {e}")
+
+    @staticmethod
+    def _entry_encoder(encode: Callable[[T], str]) -> Callable[[Tuple[T, float]], str]:
+        """Serialize a (value, refresh_at) entry as the soft expiry line followed by the value
+        
+        Encoded values are JSON, which never contains a raw newline.
+        """
+        return lambda entry: f"{entry[1]!r}\n{encode(entry[0])}"
+
+    @staticmethod
+    def _entry_decoder(decode: Callable[[str], T]) -> Callable[[str], Tuple[T, float]]:
+        """Deserialize an entry written with _entry_encoder"""
+        def decode_entry(cached_data) -> Tuple[T, float]:
+            if isinstance(cached_data, bytes):
+                cached_data = cached_data.decode()
+            refresh_at, encoded = cached_data.split("\n", 1)
+            return decode(encoded), float(refresh_at)
+        return decode_entry
+
+    @staticmethod
+    def _encode_calculations(calculations: List[EfficiencyCalculation]) -> str:
+        """Serialize a page of calculations for the cache"""
+        return json.dumps([calculation.model_dump(mode='json') for calculation in calculations])
+
+    @staticmethod
+    def _decode_calculations(cached_data: str) -> List[EfficiencyCalculation]:
+        """Deserialize a cached page of calculations"""
+        return [EfficiencyCalculation(**calculation) for calculation in json.loads(cached_data)]
+
+    def _cache_tags(self, building_id: str, name: str) -> List[str]:
+        """Invalidation tags of a building cache entry: its building and its family"""
+        return [f"efficiency:building:{building_id}", f"efficiency:family:{name}"]
+
+    async def _invalidate_buildings(self, building_ids: List[str]):
+        """Invalidate every cached entry of the buildings by bumping their generations"""
+        if building_ids:
+            await self.cache_service.bump_generations(
+                [self._generation_key(building_id) for building_id in sorted(set(building_ids))]
+            )
+
+    def _generation_key(self, building_id: str) -> str:
+        """Generation counter key of a building"""
+        return f"efficiency:generation:{building_id}"
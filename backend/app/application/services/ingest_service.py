@@ -0,0 +1,357 @@
+import csv
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.application.services.efficiency_service import EfficiencyService
+from app.domain.entities.efficiency import CalculationRequest, PeriodData
+from app.domain.entities.ingest import IngestReport, IngestRowError
+from app.domain.ports.cache_service import CacheService
+from app.infrastructure.config import settings
+from app.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+INGEST_FORMATS = ("csv", "ndjson")
+
+# Client chosen ingest ids, used in progress cache keys
+INGEST_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+# Separator for the days column in CSV exports (e.g. "Mon|Tue|Wed")
+DAYS_SEPARATOR = "|"
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class IngestService:
+    """Streaming ingest of period data exports into efficiency calculations
+
+    The body is parsed line by line (CSV records may span lines inside quoted
+    fields). Consecutive rows with the same building_id and measure_name form one
+    calculation, and calculations are written in fixed-size bulk batches, so memory
+    stays bounded by the flush size rather than the file size.
+
+    Progress is stored per owner, so an ingest id only resolves for the user who
+    started the ingest.
+    """
+
+    def __init__(
+        self, efficiency_service: EfficiencyService, cache_service: CacheService
+    ):
+        """Initialize ingest service with dependencies"""
+        self.efficiency_service = efficiency_service
+        self.cache_service = cache_service
+
+    async def ingest(
+        self,
+        chunks: AsyncIterator[bytes],
+        data_format: str,
+        ingest_id: str,
+        owner_id: str,
+    ) -> IngestReport:
+        """Ingest a CSV or NDJSON stream of period rows"""
+        if data_format not in INGEST_FORMATS:
+            raise ValueError(f"Unsupported format: {data_format}")
+
+        now = datetime.now(UTC)
+        report = IngestReport(
+            ingest_id=ingest_id,
+            owner_id=owner_id,
+            format=data_format,
+            started_at=now,
+            updated_at=now,
+        )
+        await self._save_progress(report)
+
+        header: list[str] | None = None
+        group_key: tuple[str, str] | None = None
+        group_line = 0
+        group_periods: list[PeriodData] = []
+        pending: list[tuple[int, CalculationRequest]] = []
+
+        lines = self._iter_lines(chunks, report)
+        records = (
+            self._iter_csv_records(lines, report) if data_format == "csv" else lines
+        )
+
+        try:
+            async for line_number, line in records:
+                if not line.strip():
+                    continue
+
+                if data_format == "csv" and header is None:
+                    header = [column.strip() for column in next(csv.reader([line]))]
+                    continue
+
+                report.rows_read += 1
+                try:
+                    row = (
+                        self._parse_csv_row(line, header)
+                        if header is not None
+                        else self._parse_ndjson_row(line)
+                    )
+                    key, period = self._row_to_period(row)
+                except (ValueError, TypeError, ValidationError) as e:
+                    report.rows_rejected += 1
+                    self._record_error(
+                        report,
+                        IngestRowError(line=line_number, error=self._format_error(e)),
+                    )
+                    continue
+
+                # Close the current calculation when the key changes or it grows too large
+                if (
+                    key != group_key
+                    or len(group_periods) >= settings.ingest_max_periods_per_calculation
+                ):
+                    if group_key and group_periods:
+                        pending.append(
+                            (group_line, self._to_request(group_key, group_periods))
+                        )
+                    group_key, group_line, group_periods = key, line_number, []
+
+                    if len(pending) >= settings.ingest_flush_size:
+                        await self._flush(pending, report)
+                        pending = []
+
+                group_periods.append(period)
+
+            if group_key and group_periods:
+                pending.append((group_line, self._to_request(group_key, group_periods)))
+            if pending:
+                await self._flush(pending, report)
+
+        except Exception:
+            report.status = "failed"
+            await self._save_progress(report)
+            raise
+
+        report.status = "completed"
+        await self._save_progress(report)
+        logger.info(
+            "Ingest completed",
+            ingest_id=ingest_id,
+            rows_read=report.rows_read,
+            calculations_created=report.calculations_created,
+            error_count=report.error_count,
+        )
+
+        return report
+
+    async def get_progress(self, ingest_id: str, owner_id: str) -> IngestReport | None:
+        """Get progress of a running or recently finished ingest of an owner"""
+        cached_data = await self.cache_service.get(
+            self._progress_key(owner_id, ingest_id)
+        )
+        if not cached_data:
+            return None
+
+        try:
+            return IngestReport(**json.loads(cached_data))
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error deserializing ingest progress: {e}")
+            return None
+
+    async def _iter_lines(
+        self, chunks: AsyncIterator[bytes], report: IngestReport
+    ) -> AsyncIterator[tuple[int, str]]:
+        """Split a byte stream into numbered text lines without buffering the whole body
+
+        Lines are split on raw bytes (a newline byte never occurs inside a multi-byte
+        UTF-8 sequence), so the line limit is measured in bytes. Oversized lines are
+        rejected; their bytes are dropped as they arrive rather than buffered.
+        """
+        buffer = b""
+        line_number = 0
+        discarding = False
+        first = True
+
+        async for chunk in chunks:
+            buffer += chunk
+            if first and len(buffer) >= len(UTF8_BOM):
+                buffer = buffer.removeprefix(UTF8_BOM)
+                first = False
+
+            lines = buffer.split(b"\n")
+            buffer = lines.pop()
+
+            for line in lines:
+                line_number += 1
+                if discarding:
+                    # Tail of an oversized line, already rejected
+                    discarding = False
+                    continue
+                if len(line) > settings.ingest_max_line_bytes:
+                    self._reject_oversized(report, line_number)
+                    continue
+                yield line_number, line.decode("utf-8", errors="replace").rstrip("\r")
+
+            if len(buffer) > settings.ingest_max_line_bytes:
+                if not discarding:
+                    self._reject_oversized(report, line_number + 1)
+                discarding = True
+                buffer = b""
+
+        if first:
+            buffer = buffer.removeprefix(UTF8_BOM)
+        if buffer and not discarding:
+            yield line_number + 1, buffer.decode("utf-8", errors="replace").rstrip("\r")
+
+    async def _iter_csv_records(
+        self, lines: AsyncIterator[tuple[int, str]], report: IngestReport
+    ) -> AsyncIterator[tuple[int, str]]:
+        """Join lines into CSV records, numbered by their first line
+
+        A record continues while it has an unterminated quoted field (an odd number of
+        quote characters, as embedded quotes are doubled). Records are held to the same
+        byte limit as lines.
+        """
+        record: str | None = None
+        record_line = 0
+
+        async for line_number, line in lines:
+            if record is None:
+                record, record_line = line, line_number
+            else:
+                record = f"{record}\n{line}"
+
+            if record.count('"') % 2:
+                if len(record.encode("utf-8")) > settings.ingest_max_line_bytes:
+                    self._reject_oversized(report, record_line)
+                    record = None
+                continue
+
+            yield record_line, record
+            record = None
+
+        if record is not None:
+            report.rows_read += 1
+            report.rows_rejected += 1
+            self._record_error(
+                report,
+                IngestRowError(line=record_line, error="Unterminated quoted field"),
+            )
+
+    def _reject_oversized(self, report: IngestReport, line_number: int):
+        """Count a line over the byte limit as a rejected row"""
+        report.rows_read += 1
+        report.rows_rejected += 1
+        self._record_error(
+            report,
+            IngestRowError(
+                line=line_number,
+                error=f"Line exceeds {settings.ingest_max_line_bytes} bytes",
+            ),
+        )
+
+    def _parse_csv_row(self, record: str, header: list[str]) -> dict[str, Any]:
+        """Parse a CSV record into a row dict"""
+        try:
+            values = next(csv.reader([record], strict=True))
+        except csv.Error as e:
+            raise ValueError(f"Invalid CSV: {e}")
+        if len(values) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+
+        row: dict[str, Any] = dict(zip(header, values))
+        if "days" in row:
+            row["days"] = [
+                day.strip() for day in row["days"].split(DAYS_SEPARATOR) if day.strip()
+            ]
+        return row
+
+    def _parse_ndjson_row(self, line: str) -> dict[str, Any]:
+        """Parse an NDJSON line into a row dict"""
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}")
+
+        if not isinstance(row, dict):
+            raise TypeError("Expected a JSON object")
+        if isinstance(row.get("days"), str):
+            row["days"] = [
+                day.strip() for day in row["days"].split(DAYS_SEPARATOR) if day.strip()
+            ]
+        return row
+
+    def _row_to_period(self, row: dict[str, Any]) -> tuple[tuple[str, str], PeriodData]:
+        """Validate a row and split it into its calculation key and period data"""
+        building_id = str(row.get("building_id") or "").strip()
+        measure_name = str(row.get("measure_name") or "").strip()
+        if not building_id:
+            raise ValueError("building_id is required")
+        if not measure_name:
+            raise ValueError("measure_name is required")
+
+        period = PeriodData.model_validate(
+            {field: row.get(field) for field in PeriodData.model_fields}
+        )
+        return (building_id, measure_name), period
+
+    def _to_request(
+        self, key: tuple[str, str], periods: list[PeriodData]
+    ) -> CalculationRequest:
+        """Build a calculation request for a group of rows"""
+        building_id, measure_name = key
+        return CalculationRequest(
+            building_id=building_id, measure_name=measure_name, periods=periods
+        )
+
+    async def _flush(
+        self, pending: list[tuple[int, CalculationRequest]], report: IngestReport
+    ):
+        """Calculate and store a batch of grouped calculations"""
+        results = await self.efficiency_service.calculate_efficiency_batch(
+            [request for _, request in pending]
+        )
+
+        for result in results:
+            if result.error:
+                line, request = pending[result.index]
+                report.calculations_failed += 1
+                self._record_error(
+                    report,
+                    IngestRowError(
+                        line=line, building_id=request.building_id, error=result.error
+                    ),
+                )
+            else:
+                report.calculations_created += 1
+
+        report.updated_at = datetime.now(UTC)
+        await self._save_progress(report)
+
+    def _record_error(self, report: IngestReport, error: IngestRowError):
+        """Count an error, keeping only the first few for the report"""
+        report.error_count += 1
+        if len(report.errors) < settings.ingest_max_reported_errors:
+            report.errors.append(error)
+
+    def _format_error(self, error: Exception) -> str:
+        """Readable message for a row validation error"""
+        if isinstance(error, ValidationError):
+            return "; ".join(
+                f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+                for item in error.errors()
+            )
+        return str(error)
+
+    async def _save_progress(self, report: IngestReport):
+        """Store ingest progress so it can be polled while the upload runs"""
+        try:
+            await self.cache_service.set(
+                self._progress_key(report.owner_id, report.ingest_id),
+                report.model_dump_json(),
+                settings.ingest_progress_ttl,
+            )
+        except Exception:
+            # Progress is best effort: a cache failure must not fail the ingest
+            logger.exception("Error caching ingest progress")
+
+    def _progress_key(self, owner_id: str, ingest_id: str) -> str:
+        """Cache key for an owner's ingest progress"""
+        return f"ingest:progress:{owner_id}:{ingest_id}"
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from app.domain.entities.user import User
 from app.domain.ports.cache_service import CacheService
 from app.domain.ports.user_repository import UserRepository
@@ -21,9 +23,14 @@ class UserService:
         """Get user by ID"""
         return await self.user_repository.get_by_id(user_id)
 
-    async def get_users_paginated(self, skip: int = 0, limit: int = 10) -> list[User]:
+    async def get_users_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        after: tuple[datetime, str] | None = None
+    ) -> list[User]:
         """Get paginated users"""
-        users = await self.user_repository.get_paginated(skip, limit)
+        users = await self.user_repository.get_paginated(skip, limit, after)
 
         return users
 
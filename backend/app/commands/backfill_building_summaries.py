@@ -0,0 +1,79 @@
+"""Backfill the building_summaries collection from existing efficiency calculations
+
+Usage: python -m app.commands.backfill_building_summaries [--batch-size N] [--restart]
+
+Buildings are processed in ascending building_id order and the last finished
+building is checkpointed after every batch, so an interrupted run resumes where it
+stopped. Summary reads switch from aggregating calculations to the summary
+documents only once a run has completed; --restart switches them back until the
+new run completes.
+
+Each batch replaces its buildings' totals with a snapshot aggregation, so a
+calculation written to a building while its batch runs can be left out of the
+totals (see rebuild_building_summaries). Run it while writes are quiet, or run it
+again with --restart afterwards.
+"""
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_SUMMARIES_BACKFILL,
+    BackfillCheckpoints,
+)
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def backfill(batch_size: int, restart: bool):
+    """Rebuild building summaries batch by batch, resuming from the last checkpoint"""
+    repository = MongodbEfficiencyRepository()
+    checkpoints = BackfillCheckpoints()
+
+    if restart:
+        await checkpoints.reset(BUILDING_SUMMARIES_BACKFILL)
+
+    checkpoint = await checkpoints.load(BUILDING_SUMMARIES_BACKFILL)
+    last_building_id = checkpoint.get("last_building_id")
+    processed = checkpoint.get("processed", 0)
+    if last_building_id is not None:
+        logger.info("Resuming backfill", after=last_building_id, processed=processed)
+
+    while True:
+        building_ids = await repository.get_building_ids_after(
+            last_building_id, batch_size
+        )
+        if not building_ids:
+            break
+
+        await repository.rebuild_building_summaries(building_ids)
+
+        last_building_id = building_ids[-1]
+        processed += len(building_ids)
+        await checkpoints.save(
+            BUILDING_SUMMARIES_BACKFILL,
+            last_building_id=last_building_id,
+            processed=processed,
+        )
+        logger.info(
+            "Backfilled building summaries",
+            processed=processed,
+            last_building_id=last_building_id,
+        )
+
+    await checkpoints.complete(BUILDING_SUMMARIES_BACKFILL)
+    logger.info("Backfill completed", processed=processed)
+
+
+def main():
+    """Command entry point"""
+    parser = command_parser(
+        "Backfill the building_summaries collection", batch_size=500, restartable=True
+    )
+    run_command(lambda args: backfill(args.batch_size, args.restart), parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Backfill the period_metrics time series from existing efficiency calculations
+
+Usage: python -m app.commands.backfill_period_metrics [--batch-size N] [--restart]
+
+Calculations are copied in ascending _id order and the last copied _id is
+checkpointed after every batch, so an interrupted run resumes where it stopped.
+Copying stops at the first calculation whose period metrics were written live,
+so running after deploy does not duplicate them. A batch interrupted mid-write
+may be copied twice on resume; run with --restart on an emptied period_metrics
+collection, with writes stopped, for an exact rebuild of every calculation.
+"""
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.backfill_checkpoints import (
+    PERIOD_METRICS_BACKFILL,
+    PERIOD_METRICS_LIVE,
+    BackfillCheckpoints,
+)
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def backfill(batch_size: int, restart: bool):
+    """Copy period metrics batch by batch, resuming from the last checkpoint"""
+    repository = MongodbEfficiencyRepository()
+    checkpoints = BackfillCheckpoints()
+
+    if restart:
+        await checkpoints.reset(PERIOD_METRICS_BACKFILL)
+
+    checkpoint = await checkpoints.load(PERIOD_METRICS_BACKFILL)
+    last_calculation_id = checkpoint.get("last_calculation_id")
+    processed = checkpoint.get("processed", 0)
+    if last_calculation_id is not None:
+        logger.info(
+            "Resuming backfill", after=str(last_calculation_id), processed=processed
+        )
+
+    while True:
+        # Reloaded every batch: live writes may start while the backfill runs
+        until = None
+        if not restart:
+            live = await checkpoints.load(PERIOD_METRICS_LIVE)
+            until = live.get("first_calculation_id")
+        copied_until, copied = await repository.copy_period_metrics(
+            last_calculation_id, batch_size, until
+        )
+        if copied_until is None:
+            break
+
+        last_calculation_id = copied_until
+        processed += copied
+        await checkpoints.save(
+            PERIOD_METRICS_BACKFILL,
+            last_calculation_id=last_calculation_id,
+            processed=processed,
+        )
+        logger.info(
+            "Backfilled period metrics",
+            processed=processed,
+            last_calculation_id=str(last_calculation_id),
+        )
+
+    await checkpoints.complete(PERIOD_METRICS_BACKFILL)
+    logger.info("Backfill completed", processed=processed)
+
+
+def main():
+    """Command entry point"""
+    parser = command_parser(
+        "Backfill the period_metrics time series",
+        batch_size=500,
+        batch_unit="Calculations",
+        restartable=True,
+    )
+    run_command(lambda args: backfill(args.batch_size, args.restart), parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Rebuild the Redis building autocomplete index from MongoDB
+
+Usage: python -m app.commands.rebuild_building_index [--batch-size N]
+
+The index is written to a staging key and renamed over the live one when complete,
+so autocomplete keeps answering from the old index while the rebuild runs. Searches
+are answered from the index only after the first rebuild has completed.
+"""
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.backfill_checkpoints import BUILDING_INDEX_REBUILD
+from app.infrastructure.building_index import building_index
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def rebuild(batch_size: int):
+    """Stream every building ID from MongoDB into the index"""
+    repository = MongodbEfficiencyRepository()
+
+    async def batches():
+        last_building_id = None
+        while True:
+            building_ids = await repository.get_building_ids_after(
+                last_building_id, batch_size
+            )
+            if not building_ids:
+                return
+            yield building_ids
+            last_building_id = building_ids[-1]
+
+    total = await building_index.rebuild(batches())
+    if total is None:
+        logger.warning("Redis is not configured; building index not rebuilt")
+        return
+    await building_index.checkpoints.complete(BUILDING_INDEX_REBUILD)
+    logger.info("Rebuilt building index", buildings=total)
+
+
+def main():
+    """Command entry point"""
+    parser = command_parser("Rebuild the building autocomplete index", batch_size=1000)
+    run_command(lambda args: rebuild(args.batch_size), parser, uses_redis=True)
+
+
+if __name__ == "__main__":
+    main()
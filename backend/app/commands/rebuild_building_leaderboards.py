@@ -0,0 +1,64 @@
+"""Rebuild the Redis building leaderboards from MongoDB
+
+Usage: python -m app.commands.rebuild_building_leaderboards [--batch-size N]
+
+Scores are read from the building_summaries collection in building_id order and
+written to staging keys, which replace the live leaderboards in one transaction
+when complete, so rank queries keep answering from the old leaderboards meanwhile.
+Run it after backfill_building_summaries: the leaderboards answer queries only
+once a rebuild from backfilled summaries has completed.
+"""
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_LEADERBOARD_REBUILD,
+    BUILDING_SUMMARIES_BACKFILL,
+)
+from app.infrastructure.building_leaderboard import building_leaderboard
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def rebuild(batch_size: int):
+    """Stream every building's scores from MongoDB into the leaderboards"""
+    if not await building_leaderboard.checkpoints.is_completed(
+        BUILDING_SUMMARIES_BACKFILL
+    ):
+        logger.error(
+            "Building summaries are not backfilled; run backfill_building_summaries first"
+        )
+        return
+
+    repository = MongodbEfficiencyRepository()
+
+    async def batches():
+        last_building_id = None
+        while True:
+            scores = await repository.get_building_scores_after(
+                last_building_id, batch_size
+            )
+            if not scores:
+                return
+            yield scores
+            last_building_id = next(reversed(scores))
+
+    total = await building_leaderboard.rebuild(batches())
+    if total is None:
+        logger.warning("Redis is not configured; building leaderboards not rebuilt")
+        return
+    await building_leaderboard.checkpoints.complete(BUILDING_LEADERBOARD_REBUILD)
+    logger.info("Rebuilt building leaderboards", buildings=total)
+
+
+def main():
+    """Command entry point"""
+    parser = command_parser("Rebuild the building leaderboards", batch_size=1000)
+    run_command(lambda args: rebuild(args.batch_size), parser, uses_redis=True)
+
+
+if __name__ == "__main__":
+    main()
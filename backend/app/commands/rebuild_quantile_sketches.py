@@ -0,0 +1,33 @@
+"""Rebuild the quantile_sketches percentile histograms from building summaries
+
+Usage: python -m app.commands.rebuild_quantile_sketches [--batch-size N]
+
+Reassigns every building's sketch bins and replaces the sketches with the counts.
+Run it once to seed the sketches for existing buildings, and again after the
+building summaries are backfilled or the bin layout changes.
+"""
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def rebuild(batch_size: int):
+    """Recompute the sketches from every building summary"""
+    repository = MongodbEfficiencyRepository()
+    total = await repository.rebuild_quantile_sketches(batch_size)
+    logger.info("Rebuilt quantile sketches", buildings=total)
+
+
+def main():
+    """Command entry point"""
+    parser = command_parser("Rebuild the percentile quantile sketches", batch_size=1000)
+    run_command(lambda args: rebuild(args.batch_size), parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Recompute the portfolio_rollups documents from the efficiency calculations
+
+Usage: python -m app.commands.reconcile_portfolio_rollups
+
+The rollups are kept up to date with $inc on every write; this corrects drift from
+failed increments and floating point accumulation. Run it once after deploy: the
+rollups are served only after the first reconcile, and analytics are aggregated
+from the calculations until then. Then schedule it periodically (e.g. nightly from
+cron). Calculations written while it runs may be counted twice or missed until the
+next run.
+"""
+
+from datetime import UTC, datetime
+
+from app.commands.runner import command_parser, run_command
+from app.infrastructure.logging import get_logger
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+
+logger = get_logger(__name__)
+
+
+async def reconcile():
+    """Replace every rollup document with totals recomputed from the calculations"""
+    repository = MongodbEfficiencyRepository()
+    started_at = datetime.now(UTC)
+
+    await repository.reconcile_portfolio_rollups()
+
+    logger.info(
+        "Portfolio rollups reconciled",
+        seconds=(datetime.now(UTC) - started_at).total_seconds(),
+    )
+
+
+def main():
+    """Command entry point"""
+    run_command(
+        lambda args: reconcile(), command_parser("Recompute the portfolio rollups")
+    )
+
+
+if __name__ == "__main__":
+    main()
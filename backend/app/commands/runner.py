@@ -0,0 +1,58 @@
+"""Shared argument parsing and connection handling of the maintenance commands"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from app.infrastructure.cache import cache_service
+from app.infrastructure.database import database
+from app.infrastructure.logging import configure_logging
+
+
+def command_parser(
+    description: str,
+    batch_size: int | None = None,
+    batch_unit: str = "Buildings",
+    restartable: bool = False,
+) -> argparse.ArgumentParser:
+    """Argument parser with the options shared by the commands"""
+    parser = argparse.ArgumentParser(description=description)
+    if batch_size is not None:
+        parser.add_argument(
+            "--batch-size", type=int, default=batch_size, help=f"{batch_unit} per batch"
+        )
+    if restartable:
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and start over",
+        )
+    return parser
+
+
+def run_command(
+    command: Callable[[argparse.Namespace], Awaitable[None]],
+    parser: argparse.ArgumentParser,
+    uses_redis: bool = False,
+) -> None:
+    """Parse arguments and run a command with MongoDB (and Redis) connected"""
+    args = parser.parse_args()
+    asyncio.run(_run(command, args, uses_redis))
+
+
+async def _run(
+    command: Callable[[argparse.Namespace], Awaitable[None]],
+    args: argparse.Namespace,
+    uses_redis: bool,
+) -> None:
+    """Connect, run the command and disconnect"""
+    configure_logging()
+    await database.connect()
+    if uses_redis:
+        await cache_service.connect()
+    try:
+        await command(args)
+    finally:
+        if uses_redis:
+            await cache_service.disconnect()
+        await database.disconnect()
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Per-period metrics that can be charted, and how a time bucket combines them
+CHART_METRICS = {
+    "electric_savings_kwh": "sum",
+    "gas_savings_therms": "sum",
+    "electric_cost_savings": "sum",
+    "gas_cost_savings": "sum",
+    "total_cost_savings": "sum",
+    "electric_efficiency_improvement": "avg",
+    "gas_efficiency_improvement": "avg",
+    "overall_efficiency_improvement": "avg",
+}
+
+CHART_BUCKETS = ("hour", "day", "week", "month")
+
+
+class ChartPoint(BaseModel):
+    """One time bucket of a metric series"""
+
+    timestamp: datetime = Field(..., description="Start of the time bucket")
+    value: float = Field(..., description="Metric value for the bucket")
+    count: int = Field(..., description="Number of period entries in the bucket")
+
+
+class ChartSeries(BaseModel):
+    """Metric series of one period of a building"""
+
+    period: str
+    points: list[ChartPoint]
+
+
+class BuildingChart(BaseModel):
+    """Time-bucketed metric series for a building"""
+
+    building_id: str
+    metric: str
+    bucket: str
+    series: list[ChartSeries]
+
+    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
@@ -78,9 +78,12 @@ class BuildingEfficiencySummary(BaseModel):
     building_id: str
     total_calculations: int
     latest_calculation: Optional[EfficiencyCalculation] = None
+    latest_measure_name: Optional[str] = None
     best_performance_grade: Optional[str] = None
     average_efficiency_improvement: Optional[float] = None
     total_cost_savings: Optional[float] = None
+    efficiency_improvement_percentile: Optional[float] = None
+    cost_savings_percentile: Optional[float] = None
     created_at: Optional[datetime] = None
     
     class Config:
@@ -88,3 +91,40 @@ class BuildingEfficiencySummary(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+
+
+class CalculationRequest(BaseModel):
+    """Input for a single efficiency calculation"""
+    
+    building_id: str = Field(..., description="Building identifier")
+    measure_name: str = Field(..., description="Energy efficiency measure name")
+    periods: List[PeriodData] = Field(..., min_length=1, description="Period data for calculations")
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one calculation in a batch"""
+    
+    index: int = Field(..., description="Position of the calculation in the batch")
+    calculation: Optional[EfficiencyCalculation] = None
+    error: Optional[str] = None
+
+
+class RateRange(BaseModel):
+    """Evenly spaced range of energy rates"""
+    
+    start: float = Field(..., ge=0, description="First rate")
+    stop: float = Field(..., ge=0, description="Last rate (inclusive)")
+    steps: int = Field(..., ge=1, description="Number of rates in the range")
+
+
+class TariffSweep(BaseModel):
+    """Total cost savings of a calculation over a grid of electric and gas rates"""
+    
+    calculation_id: str
+    building_id: str
+    electric_rates: List[float]
+    gas_rates: List[float]
+    total_cost_savings: List[List[float]] = Field(..., description="Rows follow electric_rates, columns gas_rates")
+    min_total_cost_savings: float
+    max_total_cost_savings: float
+    performance_grade: str = Field(..., description="Performance grade, independent of rates")
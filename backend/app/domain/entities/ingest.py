@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class IngestRowError(BaseModel):
+    """Row-level error found while ingesting period data"""
+
+    line: int | None = Field(None, description="Line number in the uploaded file")
+    building_id: str | None = None
+    error: str
+
+
+class IngestReport(BaseModel):
+    """Progress and outcome of a streaming period data ingest"""
+
+    ingest_id: str
+    owner_id: str = Field(..., description="Id of the user who started the ingest")
+    format: str = Field(..., description="Input format (csv or ndjson)")
+    status: str = Field(default="running", description="running, completed or failed")
+    rows_read: int = 0
+    rows_rejected: int = 0
+    calculations_created: int = 0
+    calculations_failed: int = 0
+    error_count: int = 0
+    errors: list[IngestRowError] = Field(
+        default_factory=list, description="First row-level errors"
+    )
+    started_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
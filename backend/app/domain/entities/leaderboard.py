@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+
+# Building summary values buildings can be ranked by
+LEADERBOARD_METRICS = ("total_cost_savings", "average_efficiency_improvement")
+
+LEADERBOARD_ORDERS = ("top", "bottom")
+
+
+class LeaderboardEntry(BaseModel):
+    """A building's position on a leaderboard"""
+
+    building_id: str = Field(..., description="Building identifier")
+    score: float = Field(..., description="Metric value")
+    rank: int = Field(..., description="1-based rank, highest score first")
+
+
+class Leaderboard(BaseModel):
+    """Top or bottom buildings for one metric"""
+
+    metric: str
+    order: str
+    entries: list[LeaderboardEntry]
+    total_buildings: int
+
+
+class BuildingRank(BaseModel):
+    """Rank of one building for one metric"""
+
+    building_id: str
+    metric: str
+    rank: int | None = Field(
+        None, description="1-based rank, highest score first; None when not ranked"
+    )
+    score: float | None = None
+    total_buildings: int
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PortfolioTotals(BaseModel):
+    """Savings totals over a set of calculations or period entries"""
+
+    key: str | None = Field(
+        None, description="Measure or period name; None for the whole portfolio"
+    )
+    count: int = Field(
+        ...,
+        description="Number of calculations (or period entries for period breakdowns)",
+    )
+    total_electric_savings_kwh: float
+    total_gas_savings_therms: float
+    total_electric_cost_savings: float
+    total_gas_cost_savings: float
+    total_cost_savings: float
+    average_efficiency_improvement: float | None = None
+    grade_distribution: dict[str, int] = Field(default_factory=dict)
+
+
+class PortfolioRollup(BaseModel):
+    """Portfolio-wide analytics served from precomputed rollups"""
+
+    total_buildings: int
+    totals: PortfolioTotals
+    by_measure: list[PortfolioTotals]
+    by_period: list[PortfolioTotals]
+    reconciled_at: datetime | None = None
+
+    model_config = ConfigDict(json_encoders={datetime: lambda v: v.isoformat()})
+
+
+class MeasureAnalytics(BaseModel):
+    """Effectiveness of one measure across every building it was applied to"""
+
+    measure_name: str
+    count: int = Field(..., description="Number of calculations for the measure")
+    mean_efficiency_improvement: float | None = None
+    median_efficiency_improvement: float | None = None
+    p90_efficiency_improvement: float | None = None
+    total_electric_savings_kwh: float
+    total_gas_savings_therms: float
+    total_cost_savings: float
+    grade_distribution: dict[str, int] = Field(default_factory=dict)
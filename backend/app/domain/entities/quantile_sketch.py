@@ -0,0 +1,106 @@
+import math
+from typing import NamedTuple
+
+from pydantic import BaseModel, Field
+
+
+class QuantileSketchBins(NamedTuple):
+    """Bin layout of a sketch: bins equal-width bins over [low, high)"""
+
+    low: float
+    high: float
+    bins: int
+    log_scale: bool = False
+
+
+# Bin layout of the sketch for each metric. Efficiency improvements are percentages,
+# binned linearly at 0.25 points; cost savings span several orders of magnitude,
+# binned on a symmetric log10 scale (about 2.3% wide bins up to ±$10M).
+QUANTILE_SKETCH_BINS: dict[str, QuantileSketchBins] = {
+    "average_efficiency_improvement": QuantileSketchBins(
+        low=-100.0, high=100.0, bins=800
+    ),
+    "total_cost_savings": QuantileSketchBins(
+        low=-7.0, high=7.0, bins=1400, log_scale=True
+    ),
+    "overall_efficiency_improvement": QuantileSketchBins(
+        low=-100.0, high=100.0, bins=800
+    ),
+}
+
+# Building summary metrics with a portfolio-wide sketch (one value per building)
+BUILDING_SKETCH_METRICS = ("average_efficiency_improvement", "total_cost_savings")
+
+
+class QuantileSketch(BaseModel):
+    """Fixed-bin histogram of one metric across all buildings
+
+    Values outside [low, high) are clamped into the outer bins. Unlike t-digest or
+    KLL, a value can be removed as well as added, which is what lets a building move
+    bins as its totals change. Sketches with the same layout merge by adding counts.
+    """
+
+    metric: str
+    low: float
+    high: float
+    bins: int
+    log_scale: bool = False
+    counts: dict[int, int] = Field(
+        default_factory=dict, description="Buildings per bin index, empty bins omitted"
+    )
+
+    @classmethod
+    def empty(cls, metric: str) -> "QuantileSketch":
+        """Sketch with the configured layout for a metric and no values"""
+        layout = QUANTILE_SKETCH_BINS[metric]
+        return cls(
+            metric=metric,
+            low=layout.low,
+            high=layout.high,
+            bins=layout.bins,
+            log_scale=layout.log_scale,
+        )
+
+    def bin_index(self, value: float) -> int:
+        """Bin a value falls into"""
+        if self.log_scale:
+            value = math.copysign(math.log10(1 + abs(value)), value)
+        position = (value - self.low) / (self.high - self.low) * self.bins
+        return min(max(math.floor(position), 0), self.bins - 1)
+
+    def percentile(self, value: float) -> float | None:
+        """Percentage of values below value, counting its own bin as half below"""
+        total = sum(self.counts.values())
+        if not total:
+            return None
+
+        index = self.bin_index(value)
+        below = sum(
+            count for bin_index, count in self.counts.items() if bin_index < index
+        )
+        return (below + self.counts.get(index, 0) / 2) / total * 100
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate value below which a fraction q of the values fall
+
+        Interpolates linearly inside the bin that holds the target rank, so the
+        error is at most one bin width.
+        """
+        total = sum(self.counts.values())
+        if not total:
+            return None
+
+        target = q * total
+        seen = 0
+        for bin_index in sorted(self.counts):
+            count = self.counts[bin_index]
+            if count <= 0:
+                continue
+            if seen + count >= target:
+                position = bin_index + (target - seen) / count
+                value = self.low + position / self.bins * (self.high - self.low)
+                if self.log_scale:
+                    value = math.copysign(10 ** abs(value) - 1, value)
+                return value
+            seen += count
+        return None
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class BuildingIndex(ABC):
+    """Port for a lexicographic index of building IDs used for prefix search"""
+
+    @abstractmethod
+    async def add(self, building_ids: list[str]) -> None:
+        """Add building IDs to the index"""
+
+    @abstractmethod
+    async def search(self, prefix: str, limit: int = 10) -> list[str] | None:
+        """Get building IDs starting with prefix (case-insensitive), or None when the index is unavailable"""
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+from app.domain.entities.leaderboard import BuildingRank, Leaderboard
+
+
+class BuildingLeaderboard(ABC):
+    """Port for ranked building leaderboards, one per leaderboard metric"""
+
+    @abstractmethod
+    async def update(self, scores: dict[str, dict[str, float]]) -> None:
+        """Set the scores of buildings, given as building_id -> metric -> score"""
+
+    @abstractmethod
+    async def get_leaderboard(
+        self, metric: str, order: str = "top", limit: int = 10
+    ) -> Leaderboard | None:
+        """Get the highest ("top") or lowest ("bottom") scoring buildings, or None when unavailable"""
+
+    @abstractmethod
+    async def get_rank(self, metric: str, building_id: str) -> BuildingRank | None:
+        """Get the rank of a building, or None when the leaderboard is unavailable or lacks the building"""
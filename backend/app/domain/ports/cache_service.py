@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 class CacheService(ABC):
@@ -11,8 +13,28 @@ class CacheService(ABC):
         pass
     
     @abstractmethod
-    async def set(self, key: str, value: str, ttl: int = 60) -> None:
-        """Set value in cache with TTL"""
+    async def set(self, key: str, value: str, ttl: int = 60, tags: Optional[List[str]] = None) -> None:
+        """Set value in cache with TTL, registering the key under each tag"""
+        pass
+    
+    @abstractmethod
+    async def get_object(self, key: str, decode: Callable[[str], T]) -> Optional[T]:
+        """Get a decoded value; implementations may keep decoded values in process
+        
+        Returned objects may be shared between callers and must not be mutated.
+        """
+        pass
+    
+    @abstractmethod
+    async def set_object(
+        self,
+        key: str,
+        value: T,
+        encode: Callable[[T], str],
+        ttl: int = 60,
+        tags: Optional[List[str]] = None
+    ) -> None:
+        """Set a value stored in its encoded form, with TTL and tags as in set()"""
         pass
     
     @abstractmethod
@@ -24,3 +46,33 @@ class CacheService(ABC):
     async def delete_pattern(self, pattern: str) -> None:
         """Delete all keys matching pattern"""
         pass
+    
+    @abstractmethod
+    async def delete_tags(self, tags: List[str]) -> int:
+        """Delete every key registered under the tags, returning how many tags were tracked"""
+        pass
+    
+    @abstractmethod
+    async def get_generation(self, key: str) -> int:
+        """Get the current value of a generation counter, creating it if missing"""
+        pass
+    
+    @abstractmethod
+    async def bump_generations(self, keys: List[str]) -> None:
+        """Atomically advance generation counters, invalidating entries keyed by them"""
+        pass
+    
+    @abstractmethod
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take a short-lived lock, returning a release token, or None when it is held elsewhere"""
+        pass
+    
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with acquire_lock, if it is still held with token"""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters per cache tier"""
+        pass
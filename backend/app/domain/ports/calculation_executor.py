@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class CalculationExecutor(ABC):
+    """Port for running CPU-bound calculation work"""
+
+    @abstractmethod
+    async def run(self, func: Callable[..., T], *args: Any, size: int = 1) -> T:
+        """Run func(*args), off the event loop when size is above the offload threshold"""
+
+    @abstractmethod
+    def metrics(self) -> dict[str, Any]:
+        """Get executor metrics (queue depth, counters)"""
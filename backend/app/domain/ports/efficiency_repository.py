@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from app.domain.entities.efficiency import EfficiencyCalculation, BuildingEfficiencySummary
+from app.domain.entities.chart import ChartSeries
+from app.domain.entities.leaderboard import BuildingRank, Leaderboard
+from app.domain.entities.portfolio import MeasureAnalytics, PortfolioRollup
+from app.domain.entities.efficiency import (
+    BatchItemResult,
+    BuildingEfficiencySummary,
+    EfficiencyCalculation,
+)
 
 
 class EfficiencyRepository(ABC):
@@ -12,23 +20,56 @@ class EfficiencyRepository(ABC):
         """Create a new efficiency calculation"""
         pass
     
+    @abstractmethod
+    async def create_many(self, calculations: List[EfficiencyCalculation]) -> List[BatchItemResult]:
+        """Create many efficiency calculations, reporting the outcome of each one"""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, calculation_id: str) -> Optional[EfficiencyCalculation]:
         """Get efficiency calculation by ID"""
         pass
     
     @abstractmethod
-    async def get_by_building_id(self, building_id: str) -> List[EfficiencyCalculation]:
-        """Get all efficiency calculations for a building"""
+    async def get_by_building_id(
+        self,
+        building_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[EfficiencyCalculation]:
+        """Get efficiency calculations for a building, newest first
+        
+        after is the (created_at, id) key of the last calculation of the previous
+        page; created_from is inclusive and created_to exclusive.
+        """
         pass
     
     @abstractmethod
     async def get_by_building_and_period(
         self, 
         building_id: str, 
-        period: str
+        period: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
     ) -> List[EfficiencyCalculation]:
-        """Get efficiency calculations for a building and specific period"""
+        """Get efficiency calculations for a building and specific period, newest first"""
+        pass
+    
+    @abstractmethod
+    def iter_by_building_id(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[EfficiencyCalculation]:
+        """Iterate over efficiency calculations for a building as the database yields them"""
         pass
     
     @abstractmethod
@@ -36,16 +77,78 @@ class EfficiencyRepository(ABC):
         """Get building efficiency summary"""
         pass
     
+    @abstractmethod
+    async def get_metric_series(
+        self,
+        building_id: str,
+        metric: str,
+        bucket: str,
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[ChartSeries]:
+        """Get a metric per period of a building, aggregated into time buckets"""
+        pass
+    
+    @abstractmethod
+    async def get_building_scores(self, building_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get leaderboard scores (building_id -> metric -> score) of buildings"""
+        pass
+    
+    @abstractmethod
+    async def get_leaderboard(self, metric: str, order: str = "top", limit: int = 10) -> Leaderboard:
+        """Get the highest ("top") or lowest ("bottom") scoring buildings for a metric"""
+        pass
+    
+    @abstractmethod
+    async def get_building_rank(self, metric: str, building_id: str) -> BuildingRank:
+        """Get the rank of a building for a metric"""
+        pass
+    
+    @abstractmethod
+    async def get_measure_analytics(self, measure_name: Optional[str] = None) -> List[MeasureAnalytics]:
+        """Get effectiveness analytics of one measure, or of every measure when None"""
+        pass
+    
+    @abstractmethod
+    async def get_portfolio_rollup(self) -> Optional[PortfolioRollup]:
+        """Get portfolio-wide totals with breakdowns by measure and period name"""
+        pass
+    
+    @abstractmethod
+    async def search_building_ids(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get building IDs starting with prefix (case-insensitive)"""
+        pass
+    
     @abstractmethod
     async def get_latest_by_building_id(self, building_id: str) -> Optional[EfficiencyCalculation]:
         """Get the latest efficiency calculation for a building"""
         pass
     
     @abstractmethod
-    async def count_by_building_id(self, building_id: str) -> int:
-        """Get count of calculations for a building"""
+    async def count_by_building_id(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> int:
+        """Get count of calculations for a building, optionally for one period and date range"""
         pass
     
-    async def get_all_buildings_summary(self, skip: int = 0, limit: int = 100, search: str = None) -> tuple[List[BuildingEfficiencySummary], int]:
-        """Get summary for all buildings with pagination and search"""
+    async def get_all_buildings_summary(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        include_total: bool = True,
+        view: str = "full"
+    ) -> tuple[List[BuildingEfficiencySummary], Optional[int]]:
+        """Get summary for all buildings with pagination and search
+        
+        after is the (latest_created_at, building_id) key of the last building of the
+        previous page; when given, skip is not used. The total is None when
+        include_total is False. The "compact" view leaves latest_calculation unset.
+        """
         pass
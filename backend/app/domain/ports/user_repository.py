@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from app.domain.entities.user import User
 
@@ -19,8 +20,13 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_paginated(self, skip: int = 0, limit: int = 10) -> List[User]:
-        """Get paginated users"""
+    async def get_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[User]:
+        """Get paginated users, starting after the (created_at, id) key when given"""
         pass
     
     @abstractmethod
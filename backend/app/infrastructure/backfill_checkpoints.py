@@ -0,0 +1,80 @@
+from datetime import UTC, datetime
+from typing import Any
+
+from app.infrastructure.database import database
+from app.infrastructure.memory_cache import TTLCache
+
+# Summaries are served from building_summaries once this backfill has completed
+BUILDING_SUMMARIES_BACKFILL = "building_summaries"
+PERIOD_METRICS_BACKFILL = "period_metrics"
+# First calculation whose period metrics were written live; the backfill stops there
+PERIOD_METRICS_LIVE = "period_metrics_live"
+# The Redis building index answers searches once a rebuild has completed
+BUILDING_INDEX_REBUILD = "building_index"
+# The Redis leaderboards answer queries once rebuilt after the summaries backfill
+BUILDING_LEADERBOARD_REBUILD = "building_leaderboards"
+# Rollups are served once a reconcile has folded in the calculations before them
+PORTFOLIO_ROLLUPS_RECONCILE = "portfolio_rollups"
+
+# Completion checks on the read path, shared by every request in the process
+_completion_cache = TTLCache(maxsize=16, ttl=30.0)
+
+# Marks this process has already recorded
+_recorded_marks: set[str] = set()
+
+
+class BackfillCheckpoints:
+    """Progress of resumable backfill commands, one backfill_checkpoints document each"""
+
+    def __init__(self, collection=None):
+        """Initialize with the checkpoints collection"""
+        self.collection = (
+            collection
+            if collection is not None
+            else database.database.backfill_checkpoints
+        )
+
+    async def load(self, name: str) -> dict[str, Any]:
+        """Get the saved progress of a backfill, empty when it never ran"""
+        return await self.collection.find_one({"_id": name}) or {}
+
+    async def save(self, name: str, **progress: Any) -> None:
+        """Save progress after a finished batch"""
+        await self.collection.update_one(
+            {"_id": name},
+            {"$set": {**progress, "updated_at": datetime.now(UTC)}},
+            upsert=True,
+        )
+
+    async def reset(self, name: str) -> None:
+        """Forget progress, so the next run starts over (and the backfill is no longer completed)"""
+        await self.collection.delete_one({"_id": name})
+        _completion_cache.delete(name)
+
+    async def complete(self, name: str) -> None:
+        """Mark a backfill as completed"""
+        await self.collection.update_one(
+            {"_id": name}, {"$set": {"completed_at": datetime.now(UTC)}}, upsert=True
+        )
+
+    async def record_first(self, name: str, **values: Any) -> None:
+        """Record the lowest values of a mark, once per process
+
+        Every process keeps the minimum, so the mark holds the first values written
+        by any of them.
+        """
+        if name in _recorded_marks:
+            return
+        await self.collection.update_one({"_id": name}, {"$min": values}, upsert=True)
+        _recorded_marks.add(name)
+
+    async def is_completed(self, name: str) -> bool:
+        """Whether a backfill has completed, cached in-process for a few seconds"""
+        completed = _completion_cache.get(name)
+        if completed is None:
+            checkpoint = await self.collection.find_one(
+                {"_id": name}, projection={"completed_at": 1}
+            )
+            completed = bool(checkpoint and checkpoint.get("completed_at"))
+            _completion_cache.set(name, completed)
+        return completed
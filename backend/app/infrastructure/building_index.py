@@ -0,0 +1,123 @@
+from collections.abc import AsyncIterator
+from contextlib import suppress
+
+import redis.asyncio as redis
+
+from app.domain.ports.building_index import BuildingIndex
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_INDEX_REBUILD,
+    BackfillCheckpoints,
+)
+from app.infrastructure.cache import RedisCacheService, cache_service
+
+# Outside the efficiency:* namespace so clearing the efficiency cache keeps the index
+BUILDING_INDEX_KEY = "buildings:autocomplete"
+
+# Members are "<normalized id>\x00<id>": they sort by the normalized id, and the
+# original id is recovered after the separator
+MEMBER_SEPARATOR = b"\x00"
+
+
+class RedisBuildingIndex(BuildingIndex):
+    """Redis sorted set implementation of BuildingIndex
+
+    All members share score 0, so ZRANGEBYLEX walks them in byte order and a prefix
+    lookup is a range query from "[prefix" to "[prefix\\xff". The query bounds are
+    built from bytes, so user input is never interpreted as a pattern.
+
+    Writes add their buildings to the index from the start, but searches are only
+    answered from it once rebuild_building_index has completed, since until then
+    it lacks the buildings written before it was introduced.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCacheService,
+        key: str = BUILDING_INDEX_KEY,
+        checkpoints: BackfillCheckpoints | None = None,
+    ):
+        """Initialize the index on the cache service's Redis connection"""
+        self.cache = cache
+        self.key = key
+        self._checkpoints = checkpoints
+
+    async def add(self, building_ids: list[str]) -> None:
+        """Add building IDs to the index"""
+        if not self.cache.redis_client or not building_ids:
+            return
+
+        with suppress(redis.RedisError):
+            await self.cache.redis_client.zadd(
+                self.key, {self._member(building_id): 0 for building_id in building_ids}
+            )
+
+    async def search(self, prefix: str, limit: int = 10) -> list[str] | None:
+        """Get building IDs starting with prefix (case-insensitive), or None when the index is unavailable"""
+        if not self.cache.redis_client or not await self.is_rebuilt():
+            return None
+
+        start = self._normalize(prefix)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                pipe.exists(self.key)
+                pipe.zrangebylex(
+                    self.key, b"[" + start, b"[" + start + b"\xff", start=0, num=limit
+                )
+                exists, members = await pipe.execute()
+        except redis.RedisError:
+            return None
+
+        # A missing key after a rebuild means Redis was flushed
+        if not exists:
+            return None
+
+        return [member.split(MEMBER_SEPARATOR, 1)[1].decode() for member in members]
+
+    async def rebuild(self, batches: AsyncIterator[list[str]]) -> int | None:
+        """Rebuild the index from batches of building IDs, swapping it in atomically
+
+        Returns the number of indexed buildings, or None when Redis is not configured.
+        """
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            return None
+
+        staging_key = f"{self.key}:rebuild"
+        await redis_client.delete(staging_key)
+
+        total = 0
+        async for building_ids in batches:
+            if building_ids:
+                await redis_client.zadd(
+                    staging_key,
+                    {self._member(building_id): 0 for building_id in building_ids},
+                )
+                total += len(building_ids)
+
+        if total:
+            await redis_client.rename(staging_key, self.key)
+        else:
+            await redis_client.delete(self.key)
+        return total
+
+    async def is_rebuilt(self) -> bool:
+        """Whether a rebuild has completed, so the index holds every building"""
+        return await self.checkpoints.is_completed(BUILDING_INDEX_REBUILD)
+
+    @property
+    def checkpoints(self) -> BackfillCheckpoints:
+        """Checkpoints holding the rebuild marker, created once the database is connected"""
+        if self._checkpoints is None:
+            self._checkpoints = BackfillCheckpoints()
+        return self._checkpoints
+
+    def _normalize(self, value: str) -> bytes:
+        """Normalized sort key of a building ID or search prefix"""
+        return value.strip().lower().encode()
+
+    def _member(self, building_id: str) -> bytes:
+        """Sorted set member for a building ID"""
+        return self._normalize(building_id) + MEMBER_SEPARATOR + building_id.encode()
+
+
+building_index = RedisBuildingIndex(cache_service)
@@ -0,0 +1,187 @@
+from collections.abc import AsyncIterator
+from contextlib import suppress
+
+import redis.asyncio as redis
+
+from app.domain.entities.leaderboard import (
+    LEADERBOARD_METRICS,
+    BuildingRank,
+    Leaderboard,
+    LeaderboardEntry,
+)
+from app.domain.ports.building_leaderboard import BuildingLeaderboard
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_LEADERBOARD_REBUILD,
+    BUILDING_SUMMARIES_BACKFILL,
+    BackfillCheckpoints,
+)
+from app.infrastructure.cache import RedisCacheService, cache_service
+
+# Outside the efficiency:* namespace so clearing the efficiency cache keeps the leaderboards
+LEADERBOARD_KEY_PREFIX = "buildings:leaderboard"
+
+
+class RedisBuildingLeaderboard(BuildingLeaderboard):
+    """Redis sorted set implementation of BuildingLeaderboard
+
+    One sorted set per metric, with building IDs as members and the metric as score.
+    Scores are written as absolute values read back from the building summaries, so
+    a missed or repeated update is corrected by the next write to the building.
+    Ranges and ranks are O(log N) regardless of the number of buildings.
+
+    Queries are only answered from the sorted sets once the building summaries
+    backfill and a rebuild_building_leaderboards run have completed; until then
+    they lack the buildings without writes since the leaderboards were introduced.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCacheService,
+        key_prefix: str = LEADERBOARD_KEY_PREFIX,
+        checkpoints: BackfillCheckpoints | None = None,
+    ):
+        """Initialize the leaderboards on the cache service's Redis connection"""
+        self.cache = cache
+        self.key_prefix = key_prefix
+        self._checkpoints = checkpoints
+
+    async def update(self, scores: dict[str, dict[str, float]]) -> None:
+        """Set the scores of buildings, given as building_id -> metric -> score"""
+        if not self.cache.redis_client or not scores:
+            return
+
+        with suppress(redis.RedisError):
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                for metric in LEADERBOARD_METRICS:
+                    pipe.zadd(
+                        self._key(metric),
+                        {
+                            building_id: building_scores[metric]
+                            for building_id, building_scores in scores.items()
+                        },
+                    )
+                await pipe.execute()
+
+    async def get_leaderboard(
+        self, metric: str, order: str = "top", limit: int = 10
+    ) -> Leaderboard | None:
+        """Get the highest ("top") or lowest ("bottom") scoring buildings, or None when unavailable"""
+        if not self.cache.redis_client or not await self.is_rebuilt():
+            return None
+
+        key = self._key(metric)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zcard(key)
+                if order == "top":
+                    pipe.zrevrange(key, 0, limit - 1, withscores=True)
+                else:
+                    pipe.zrange(key, 0, limit - 1, withscores=True)
+                total, members = await pipe.execute()
+        except redis.RedisError:
+            return None
+
+        # A missing key after a rebuild means Redis was flushed
+        if not total:
+            return None
+
+        entries = [
+            LeaderboardEntry(
+                building_id=member.decode(),
+                score=score,
+                rank=index + 1 if order == "top" else total - index,
+            )
+            for index, (member, score) in enumerate(members)
+        ]
+        return Leaderboard(
+            metric=metric, order=order, entries=entries, total_buildings=total
+        )
+
+    async def get_rank(self, metric: str, building_id: str) -> BuildingRank | None:
+        """Get the rank of a building, or None when the leaderboard is unavailable or lacks the building"""
+        if not self.cache.redis_client or not await self.is_rebuilt():
+            return None
+
+        key = self._key(metric)
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zcard(key)
+                pipe.zrevrank(key, building_id)
+                pipe.zscore(key, building_id)
+                total, rank, score = await pipe.execute()
+        except redis.RedisError:
+            return None
+
+        # Buildings written after the last rebuild or update may be missing from the
+        # sorted set, so a missing member is answered from the database instead
+        if not total or rank is None:
+            return None
+
+        return BuildingRank(
+            building_id=building_id,
+            metric=metric,
+            rank=rank + 1,
+            score=score,
+            total_buildings=total,
+        )
+
+    async def rebuild(
+        self, batches: AsyncIterator[dict[str, dict[str, float]]]
+    ) -> int | None:
+        """Rebuild every leaderboard from batches of building scores, swapping them in atomically
+
+        Returns the number of ranked buildings, or None when Redis is not configured.
+        """
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            return None
+
+        staging_keys = {
+            metric: f"{self._key(metric)}:rebuild" for metric in LEADERBOARD_METRICS
+        }
+        await redis_client.delete(*staging_keys.values())
+
+        total = 0
+        async for scores in batches:
+            if not scores:
+                continue
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for metric, staging_key in staging_keys.items():
+                    pipe.zadd(
+                        staging_key,
+                        {
+                            building_id: building_scores[metric]
+                            for building_id, building_scores in scores.items()
+                        },
+                    )
+                await pipe.execute()
+            total += len(scores)
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for metric, staging_key in staging_keys.items():
+                if total:
+                    pipe.rename(staging_key, self._key(metric))
+                else:
+                    pipe.delete(self._key(metric))
+            await pipe.execute()
+        return total
+
+    async def is_rebuilt(self) -> bool:
+        """Whether the leaderboards were rebuilt from backfilled summaries"""
+        return await self.checkpoints.is_completed(
+            BUILDING_SUMMARIES_BACKFILL
+        ) and await self.checkpoints.is_completed(BUILDING_LEADERBOARD_REBUILD)
+
+    @property
+    def checkpoints(self) -> BackfillCheckpoints:
+        """Checkpoints holding the rebuild marker, created once the database is connected"""
+        if self._checkpoints is None:
+            self._checkpoints = BackfillCheckpoints()
+        return self._checkpoints
+
+    def _key(self, metric: str) -> str:
+        """Sorted set key of a metric's leaderboard"""
+        return f"{self.key_prefix}:{metric}"
+
+
+building_leaderboard = RedisBuildingLeaderboard(cache_service)
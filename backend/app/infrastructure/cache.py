@@ -1,10 +1,39 @@
-from typing import Optional
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar
 
 import redis.asyncio as redis
 
 from app.domain.ports.cache_service import CacheService
 from app.infrastructure.config import settings
 
+# INCR an existing generation counter; seed a missing (never set or evicted) one from
+# the clock, so it can never return to a value that keyed earlier cache entries
+BUMP_GENERATION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCR', KEYS[1])
+end
+redis.call('SET', KEYS[1], ARGV[1])
+return tonumber(ARGV[1])
+"""
+
+# Delete a lock only while it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Locks live outside the cached namespaces, so pattern deletes never drop them
+LOCK_KEY_PREFIX = "locks:"
+
+# Tag sets hold the live keys written with a tag; kept outside the tagged namespaces so
+# pattern deletes never remove the tracking.
+TAG_KEY_PREFIX = "tagsets:"
+
+T = TypeVar("T")
+
 
 class RedisCacheService(CacheService):
     """Redis implementation of CacheService"""
@@ -12,10 +41,16 @@ class RedisCacheService(CacheService):
     def __init__(self):
         """Initialize Redis cache service"""
         self.redis_client: Optional[redis.Redis] = None
+        self._bump_generation = None
+        self._release_lock = None
+        self.hits = 0
+        self.misses = 0
     
     async def connect(self):
         """Connect to Redis"""
         self.redis_client = redis.from_url(settings.redis_url)
+        self._bump_generation = self.redis_client.register_script(BUMP_GENERATION_SCRIPT)
+        self._release_lock = self.redis_client.register_script(RELEASE_LOCK_SCRIPT)
     
     async def disconnect(self):
         """Disconnect from Redis"""
@@ -28,17 +63,58 @@ class RedisCacheService(CacheService):
             return None
         
         try:
-            return await self.redis_client.get(key)
+            value = await self.redis_client.get(key)
         except Exception:
-            return None
+            value = None
+        
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    async def get_object(self, key: str, decode: Callable[[str], T]) -> Optional[T]:
+        """Get a decoded value"""
+        cached_data = await self.get(key)
+        return decode(cached_data) if cached_data else None
+    
+    async def set_object(
+        self,
+        key: str,
+        value: T,
+        encode: Callable[[T], str],
+        ttl: int = 60,
+        tags: Optional[List[str]] = None
+    ) -> None:
+        """Set a value stored in its encoded form"""
+        await self.set(key, encode(value), ttl, tags)
     
-    async def set(self, key: str, value: str, ttl: int = 60) -> None:
-        """Set value in cache with TTL"""
+    async def set(self, key: str, value: str, ttl: int = 60, tags: Optional[List[str]] = None) -> None:
+        """Set value in cache with TTL, registering the key under each tag
+        
+        Tags are sorted sets scored by the expiry time of each key. Every write drops
+        the members that have expired since, so a long-lived tag (one written to more
+        often than its TTL) holds only live keys rather than every key ever written to
+        it. A tag set expires with the last entry written to it; entries in a tag are
+        expected to share a TTL.
+        """
         if not self.redis_client:
             return
         
         try:
-            await self.redis_client.setex(key, ttl, value)
+            if not tags:
+                await self.redis_client.setex(key, ttl, value)
+                return
+            
+            now = time.time()
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, value)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.zremrangebyscore(tag_key, "-inf", now)
+                    pipe.zadd(tag_key, {key: now + ttl})
+                    pipe.expire(tag_key, ttl)
+                await pipe.execute()
         except Exception:
             pass
     
@@ -53,14 +129,139 @@ class RedisCacheService(CacheService):
             pass
     
     async def delete_pattern(self, pattern: str) -> None:
-        """Delete all keys matching pattern"""
+        """Delete all keys matching pattern
+        
+        Walks the keyspace with SCAN and frees keys with UNLINK in batches, so the
+        server keeps serving other clients in between (unlike KEYS + DEL).
+        """
+        redis_client = self.redis_client
+        if not redis_client:
+            return
+        
+        try:
+            await self._unlink_batches(
+                redis_client, redis_client.scan_iter(match=pattern, count=settings.cache_invalidation_batch_size)
+            )
+        except Exception:
+            pass
+    
+    async def delete_tags(self, tags: List[str]) -> int:
+        """Delete every key registered under the tags, returning how many tags were tracked"""
+        redis_client = self.redis_client
+        if not redis_client:
+            return 0
+        
+        tracked = 0
+        try:
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                if not await redis_client.exists(tag_key):
+                    continue
+                
+                tracked += 1
+                await self._unlink_batches(redis_client, self._tag_members(redis_client, tag_key))
+                await redis_client.unlink(tag_key)
+        except Exception:
+            pass
+        return tracked
+    
+    async def get_tagged_keys(self, tags: List[str]) -> Optional[List[str]]:
+        """Get the keys registered under the tags, or None when they cannot be read"""
+        redis_client = self.redis_client
+        if not redis_client:
+            return []
+        
+        try:
+            return [
+                member.decode()
+                for tag in tags
+                async for member in self._tag_members(redis_client, self._tag_key(tag))
+            ]
+        except redis.RedisError:
+            return None
+    
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take a short-lived lock, returning a release token, or None when it is held elsewhere
+        
+        Without Redis there is nobody to coordinate with, so the lock is always granted.
+        """
         if not self.redis_client:
+            return ""
+        
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis_client.set(
+                f"{LOCK_KEY_PREFIX}{key}", token, px=int(ttl * 1000), nx=True
+            )
+        except Exception:
+            return ""
+        return token if acquired else None
+    
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with acquire_lock, if it is still held with token"""
+        if not self.redis_client or not token:
+            return
+        
+        try:
+            await self._release_lock(keys=[f"{LOCK_KEY_PREFIX}{key}"], args=[token])
+        except Exception:
+            pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of reads"""
+        lookups = self.hits + self.misses
+        return {
+            "redis": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+            }
+        }
+    
+    async def _unlink_batches(self, redis_client: redis.Redis, keys: AsyncIterator[bytes]) -> None:
+        """UNLINK keys from an iterator in fixed-size batches"""
+        batch = []
+        async for key in keys:
+            batch.append(key)
+            if len(batch) >= settings.cache_invalidation_batch_size:
+                await redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            await redis_client.unlink(*batch)
+    
+    def _tag_key(self, tag: str) -> str:
+        """Redis sorted set holding the keys written with a tag, scored by expiry"""
+        return f"{TAG_KEY_PREFIX}{tag}"
+    
+    async def _tag_members(self, redis_client: redis.Redis, tag_key: str) -> AsyncIterator[bytes]:
+        """Iterate over the keys of a tag set"""
+        async for member, _ in redis_client.zscan_iter(tag_key, count=settings.cache_invalidation_batch_size):
+            yield member
+    
+    async def get_generation(self, key: str) -> int:
+        """Get the current value of a generation counter, creating it if missing"""
+        if not self.redis_client:
+            return 0
+        
+        try:
+            generation = await self.redis_client.get(key)
+            if generation is None:
+                await self.redis_client.set(key, time.time_ns(), nx=True)
+                generation = await self.redis_client.get(key)
+            return int(generation) if generation is not None else 0
+        except Exception:
+            return 0
+    
+    async def bump_generations(self, keys: List[str]) -> None:
+        """Atomically advance generation counters, invalidating entries keyed by them"""
+        if not self.redis_client or not keys:
             return
         
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                await self.redis_client.delete(*keys)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    await self._bump_generation(keys=[key], args=[time.time_ns()], client=pipe)
+                await pipe.execute()
         except Exception:
             pass
 
@@ -23,6 +23,46 @@ class Settings(BaseSettings):
     
     # Cache
     cache_ttl: int = Field(default=60, env="CACHE_TTL")
+    efficiency_cache_ttl: int = Field(default=3600)
+    # Age after which efficiency entries are served stale and refreshed in the background
+    # (0 disables); efficiency_cache_ttl stays the hard limit
+    efficiency_cache_soft_ttl: int = Field(default=300)
+    cache_invalidation_batch_size: int = Field(default=500)
+    
+    # In-process cache tier in front of Redis (size 0 disables it)
+    local_cache_size: int = Field(default=10000)
+    local_cache_ttl: float = Field(default=30.0)
+    cache_invalidation_channel: str = Field(default="cache:invalidate")
+    
+    # Cross-process lock on cache misses: one node reloads, the others wait for its result
+    cache_lock_enabled: bool = Field(default=False)
+    cache_lock_ttl: float = Field(default=5.0)
+    cache_lock_wait: float = Field(default=1.0)
+    cache_lock_poll_interval: float = Field(default=0.05)
+    
+    # Efficiency calculations
+    efficiency_vectorized_engine: bool = Field(default=True)
+    efficiency_vectorize_min_periods: int = Field(default=64)
+    efficiency_batch_max_size: int = Field(default=10000)
+    calculation_memo_size: int = Field(default=1024)
+    tariff_sweep_max_steps: int = Field(default=500)
+    
+    # Calculation offload (size is measured in periods; pool size 0 runs everything inline)
+    calculation_pool_size: int = Field(default=2)
+    calculation_offload_threshold: int = Field(default=2000)
+    
+    # Calculation history (history_default_limit is the page size of a cursor without a limit)
+    history_default_limit: int = Field(default=100)
+    history_max_limit: int = Field(default=1000)
+    history_stream_batch_size: int = Field(default=200)
+    chart_max_points: int = Field(default=5000)
+    
+    # Ingest
+    ingest_flush_size: int = Field(default=500)
+    ingest_max_periods_per_calculation: int = Field(default=1000)
+    ingest_max_line_bytes: int = Field(default=65536)
+    ingest_max_reported_errors: int = Field(default=100)
+    ingest_progress_ttl: int = Field(default=86400)
     
     # JWT
     jwt_secret_key: str = Field(default="definitely-not-a-secret-key", env="JWT_SECRET_KEY")
@@ -1,5 +1,6 @@
 from pymongo import AsyncMongoClient
 from pymongo.database import Database as PyMongoDatabase
+from pymongo.errors import CollectionInvalid
 
 from app.infrastructure.config import settings
 
@@ -17,7 +18,8 @@ class Database:
         self.client = AsyncMongoClient(settings.mongodb_url)
         self.database = self.client[settings.mongodb_database]
         
-        # Create indexes
+        # Create collections and indexes
+        await self._create_collections()
         await self._create_indexes()
     
     async def disconnect(self):
@@ -25,10 +27,24 @@ class Database:
         if self.client:
             await self.client.close()
     
+    async def _create_collections(self):
+        """Create collections that need options"""
+        # Flattened per-period metrics for charts, stored as compressed time buckets
+        if "period_metrics" not in await self.database.list_collection_names():
+            try:
+                await self.database.create_collection(
+                    "period_metrics",
+                    timeseries={"timeField": "created_at", "metaField": "meta", "granularity": "hours"}
+                )
+            except CollectionInvalid:
+                # Created concurrently by another worker
+                pass
+    
     async def _create_indexes(self):
         """Create database indexes"""
         await self.database.users.create_index("email", unique=True)
         await self.database.users.create_index("created_at")
+        await self.database.users.create_index([("created_at", -1), ("_id", -1)])
         
         # Auth users indexes
         await self.database.auth_users.create_index("email", unique=True)
@@ -47,6 +63,14 @@ class Database:
             ("building_id", 1), ("periods.period", 1), ("created_at", -1)
         ])
         
+        # History pages sort by (created_at, _id) so equal timestamps keep a stable order
+        await self.database.efficiency_calculations.create_index([
+            ("building_id", 1), ("created_at", -1), ("_id", -1)
+        ])
+        await self.database.efficiency_calculations.create_index([
+            ("building_id", 1), ("periods.period", 1), ("created_at", -1), ("_id", -1)
+        ])
+        
         # Partial index for high-performance calculations (A and B grades)
         await self.database.efficiency_calculations.create_index(
             [("building_id", 1), ("summary.performance_grade", 1)],
@@ -58,6 +82,23 @@ class Database:
             [("building_id", 1), ("measure_name", 1)],
             sparse=True
         )
+        
+        # Measure analytics, queried across buildings by measure
+        await self.database.efficiency_calculations.create_index([
+            ("measure_name", 1), ("created_at", -1)
+        ])
+        
+        # Materialized per-building summaries, one document per building
+        await self.database.building_summaries.create_index("building_id", unique=True)
+        await self.database.building_summaries.create_index([
+            ("latest_created_at", -1), ("building_id", 1)
+        ])
+        await self.database.building_summaries.create_index("building_key")
+        
+        # Period metrics time series, queried per building and period over a time range
+        await self.database.period_metrics.create_index([
+            ("meta.building_id", 1), ("meta.period", 1), ("created_at", 1)
+        ])
 
 
 database = Database()
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from app.infrastructure.config import settings
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with hit/miss counters"""
+
+    def __init__(self, maxsize: int):
+        """Initialize LRU cache"""
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get value, marking it as most recently used"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set value, evicting the least recently used entries beyond maxsize"""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Delete value"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Delete all values"""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+
+class TTLCache(LRUCache):
+    """Bounded in-process LRU cache whose entries also expire ttl seconds after being set"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize TTL cache"""
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get an unexpired value, marking it as most recently used"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set value, expiring after ttl seconds"""
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Delete every value whose key matches predicate"""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Get size, hit/miss counters and expirations"""
+        return {**super().stats(), "ttl": self.ttl, "expirations": self.expirations}
+
+
+# Preview calculation results keyed by a hash of their period inputs
+calculation_memo = LRUCache(maxsize=settings.calculation_memo_size)
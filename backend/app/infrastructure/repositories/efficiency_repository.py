@@ -1,19 +1,125 @@
+import re
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 
 from app.domain.ports.efficiency_repository import EfficiencyRepository
-from app.domain.entities.efficiency import EfficiencyCalculation, BuildingEfficiencySummary
+from app.domain.entities.chart import CHART_METRICS, ChartPoint, ChartSeries
+from app.domain.entities.leaderboard import BuildingRank, Leaderboard, LeaderboardEntry
+from app.domain.entities.portfolio import MeasureAnalytics, PortfolioRollup, PortfolioTotals
+from app.domain.entities.quantile_sketch import BUILDING_SKETCH_METRICS, QuantileSketch
+from app.domain.entities.efficiency import (
+    BatchItemResult,
+    BuildingEfficiencySummary,
+    EfficiencyCalculation,
+)
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_SUMMARIES_BACKFILL,
+    PERIOD_METRICS_LIVE,
+    PORTFOLIO_ROLLUPS_RECONCILE,
+    BackfillCheckpoints,
+)
+from app.infrastructure.config import settings
 from app.infrastructure.database import database
+from app.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Performance grades, best first
+GRADE_ORDER = {"A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
+RANK_GRADE = {rank: grade for grade, rank in GRADE_ORDER.items()}
+
+# Numeric rank of a calculation's grade, so the best grade is a server-side $max
+GRADE_RANK_EXPRESSION = {
+    "$switch": {
+        "branches": [
+            {"case": {"$eq": ["$summary.performance_grade", grade]}, "then": rank}
+            for grade, rank in GRADE_ORDER.items()
+        ],
+        "default": 0
+    }
+}
+
+# Leaderboard metric -> score expression over a building_summaries document
+LEADERBOARD_SCORE_EXPRESSIONS = {
+    "total_cost_savings": "$total_cost_savings",
+    "average_efficiency_improvement": {
+        "$cond": [
+            {"$gt": ["$total_calculations", 0]},
+            {"$divide": ["$sum_efficiency_improvement", "$total_calculations"]},
+            0.0
+        ]
+    },
+}
+
+# Compare-and-set rounds when moving buildings between sketch bins
+SKETCH_UPDATE_ATTEMPTS = 3
+
+# Rollup total -> source field, for calculation-level (summary) and period-level rollups
+ROLLUP_SUMMARY_FIELDS = {
+    "electric_savings_kwh": "total_electric_savings_kwh",
+    "gas_savings_therms": "total_gas_savings_therms",
+    "electric_cost_savings": "total_electric_cost_savings",
+    "gas_cost_savings": "total_gas_cost_savings",
+    "total_cost_savings": "total_cost_savings",
+    "sum_efficiency_improvement": "overall_efficiency_improvement",
+}
+ROLLUP_PERIOD_FIELDS = {
+    "electric_savings_kwh": "electric_savings_kwh",
+    "gas_savings_therms": "gas_savings_therms",
+    "electric_cost_savings": "electric_cost_savings",
+    "gas_cost_savings": "gas_cost_savings",
+    "total_cost_savings": "total_cost_savings",
+    "sum_efficiency_improvement": "overall_efficiency_improvement",
+}
+
+# Summary document fields rendered by list pages
+SUMMARY_LIST_PROJECTION = {
+    "_id": 0,
+    "building_id": 1,
+    "total_calculations": 1,
+    "sum_efficiency_improvement": 1,
+    "total_cost_savings": 1,
+    "grade_counts": 1,
+    "latest": 1,
+    "latest_created_at": 1
+}
 
 
 class MongodbEfficiencyRepository(EfficiencyRepository):
-    """MongoDB implementation of EfficiencyRepository"""
+    """MongoDB implementation of EfficiencyRepository
     
-    def __init__(self, collection=None):
+    Every write also updates the building_summaries collection, which holds one
+    running-totals document per building so summary reads do not scan history,
+    appends the flattened period metrics to the period_metrics time series, and
+    increments the portfolio_rollups documents (whole portfolio, per measure, per
+    period name) and moves the building between quantile_sketches bins.
+    
+    Summary documents only cover calculations written since they were introduced,
+    so summary reads aggregate the calculations instead until the building
+    summaries backfill has completed. Likewise, rollup reads aggregate the
+    calculations until the rollups have been reconciled once.
+    """
+    
+    def __init__(
+        self,
+        collection=None,
+        summaries_collection=None,
+        period_metrics_collection=None,
+        rollups_collection=None,
+        sketches_collection=None,
+        checkpoints=None
+    ):
         """Initialize MongoDB efficiency repository"""
         self.collection = collection or database.database.efficiency_calculations
+        self.summaries = summaries_collection or database.database.building_summaries
+        self.period_metrics = period_metrics_collection or database.database.period_metrics
+        self.rollups = rollups_collection or database.database.portfolio_rollups
+        self.sketches = sketches_collection or database.database.quantile_sketches
+        self.checkpoints = checkpoints or BackfillCheckpoints()
     
     async def create(self, calculation: EfficiencyCalculation) -> EfficiencyCalculation:
         """Create a new efficiency calculation"""
@@ -25,8 +131,53 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
         calculation.id = str(result.inserted_id)
         calculation.created_at = calculation_dict["created_at"]
         
+        await self._update_building_summaries([calculation_dict])
+        await self._update_quantile_sketches([calculation_dict["building_id"]])
+        await self._record_period_metrics([calculation_dict])
+        await self._update_portfolio_rollups([calculation_dict])
+        
         return calculation
     
+    async def create_many(self, calculations: List[EfficiencyCalculation]) -> List[BatchItemResult]:
+        """Create many efficiency calculations with one unordered bulk insert"""
+        if not calculations:
+            return []
+        
+        created_at = datetime.now(timezone.utc)
+        calculation_dicts = []
+        for calculation in calculations:
+            calculation_dict = calculation.model_dump(exclude={"id"})
+            calculation_dict["created_at"] = created_at
+            calculation_dicts.append(calculation_dict)
+        
+        # Unordered: one failing document does not stop the rest of the batch
+        errors = {}
+        try:
+            await self.collection.insert_many(calculation_dicts, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                errors[write_error["index"]] = write_error.get("errmsg", "Write failed")
+        
+        results = []
+        inserted = []
+        for index, (calculation, calculation_dict) in enumerate(zip(calculations, calculation_dicts)):
+            if index in errors:
+                results.append(BatchItemResult(index=index, error=errors[index]))
+                continue
+            
+            # insert_many assigns _id client-side
+            calculation.id = str(calculation_dict["_id"])
+            calculation.created_at = created_at
+            results.append(BatchItemResult(index=index, calculation=calculation))
+            inserted.append(calculation_dict)
+        
+        await self._update_building_summaries(inserted)
+        await self._update_quantile_sketches([calculation_dict["building_id"] for calculation_dict in inserted])
+        await self._record_period_metrics(inserted)
+        await self._update_portfolio_rollups(inserted)
+        
+        return results
+    
     async def get_by_id(self, calculation_id: str) -> Optional[EfficiencyCalculation]:
         """Get efficiency calculation by ID"""
         try:
@@ -37,34 +188,135 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
         except Exception:
             return None
     
-    async def get_by_building_id(self, building_id: str) -> List[EfficiencyCalculation]:
-        """Get all efficiency calculations for a building"""
-        cursor = self.collection.find({"building_id": building_id}).sort("created_at", -1)
-        calculations = []
-        
-        async for calculation_doc in cursor:
-            calculations.append(self._document_to_calculation(calculation_doc))
-        
-        return calculations
+    async def get_by_building_id(
+        self,
+        building_id: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[EfficiencyCalculation]:
+        """Get efficiency calculations for a building, newest first"""
+        return [
+            calculation
+            async for calculation in self.iter_by_building_id(
+                building_id, None, limit, after, created_from, created_to
+            )
+        ]
     
     async def get_by_building_and_period(
         self, 
         building_id: str, 
-        period: str
+        period: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
     ) -> List[EfficiencyCalculation]:
         """Get efficiency calculations for a building and specific period"""
-        cursor = self.collection.find({
-            "building_id": building_id,
-            "periods.period": period
-        }).sort("created_at", -1)
+        return [
+            calculation
+            async for calculation in self.iter_by_building_id(
+                building_id, period, limit, after, created_from, created_to
+            )
+        ]
+    
+    async def iter_by_building_id(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[EfficiencyCalculation]:
+        """Iterate over efficiency calculations for a building as the cursor yields them
+        
+        Sorted by (created_at, _id) descending to match the history indexes, so pages
+        and date ranges are index range scans. With a period, the server trims each
+        document's periods to the matching ones; the stored summary is kept as is.
+        """
+        query = self._history_query(building_id, period, created_from, created_to)
+        projection = None
+        if period is not None:
+            projection = {
+                "building_id": 1,
+                "measure_name": 1,
+                "calculation_timestamp": 1,
+                "summary": 1,
+                "created_at": 1,
+                "periods": {
+                    "$filter": {
+                        "input": "$periods",
+                        "as": "period",
+                        "cond": {"$eq": ["$$period.period", period]}
+                    }
+                }
+            }
+        
+        if after:
+            created_at, calculation_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": ObjectId(calculation_id)}}
+            ]
+        
+        cursor = self.collection.find(query, projection).sort([("created_at", -1), ("_id", -1)])
+        if limit:
+            cursor = cursor.limit(limit)
+        cursor = cursor.batch_size(settings.history_stream_batch_size)
         
-        calculations = []
         async for calculation_doc in cursor:
-            calculations.append(self._document_to_calculation(calculation_doc))
+            yield self._document_to_calculation(calculation_doc)
+    
+    def _history_query(
+        self,
+        building_id: str,
+        period: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """Filter of a building's calculation history, shared by pages and counts"""
+        query: Dict[str, Any] = {"building_id": building_id}
+        if period is not None:
+            query["periods.period"] = period
         
-        return calculations
+        created_range = {}
+        if created_from:
+            created_range["$gte"] = created_from
+        if created_to:
+            created_range["$lt"] = created_to
+        if created_range:
+            query["created_at"] = created_range
+        return query
     
     async def get_building_summary(self, building_id: str) -> Optional[BuildingEfficiencySummary]:
+        """Get building efficiency summary from its materialized summary document"""
+        if not await self._summaries_backfilled():
+            return await self._aggregate_building_summary(building_id)
+        
+        summary_doc = await self.summaries.find_one({"building_id": building_id})
+        if not summary_doc:
+            return None
+        
+        latest_calculation = None
+        latest = summary_doc.get("latest")
+        if latest:
+            calculation_doc = await self.collection.find_one({"_id": latest["calculation_id"]})
+            if calculation_doc:
+                latest_calculation = self._document_to_calculation(calculation_doc)
+        
+        summary = self._summary_document_to_entity(
+            summary_doc,
+            latest_calculation=latest_calculation,
+            created_at=datetime.now(timezone.utc)
+        )
+        
+        self._set_percentiles(summary, summary_doc, await self._get_quantile_sketches())
+        
+        return summary
+    
+    async def _aggregate_building_summary(self, building_id: str) -> Optional[BuildingEfficiencySummary]:
         """Get building efficiency summary using optimized aggregation pipeline"""
         
         # First, get the count separately to debug
@@ -84,7 +336,7 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
                     "latest_calculation": {"$first": "$$ROOT"},
                     "avg_efficiency_improvement": {"$avg": "$summary.overall_efficiency_improvement"},
                     "total_cost_savings": {"$sum": "$summary.total_cost_savings"},
-                    "performance_grades": {"$push": "$summary.performance_grade"}
+                    "best_grade_rank": {"$max": GRADE_RANK_EXPRESSION}
                 }
             }
         ]
@@ -99,9 +351,7 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
         # Use the count from count_documents instead of aggregation
         data["total_calculations"] = total_count
         
-        # Find best performance grade efficiently
-        grade_order = {"A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
-        best_grade = max(data["performance_grades"], key=lambda g: grade_order.get(g, 0)) if data["performance_grades"] else None
+        best_grade = RANK_GRADE.get(data["best_grade_rank"])
         
         # Convert latest calculation document to entity
         latest_calculation = None
@@ -112,6 +362,7 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
             building_id=building_id,
             total_calculations=data["total_calculations"],
             latest_calculation=latest_calculation,
+            latest_measure_name=latest_calculation.measure_name if latest_calculation else None,
             best_performance_grade=best_grade,
             average_efficiency_improvement=data["avg_efficiency_improvement"],
             total_cost_savings=data["total_cost_savings"],
@@ -129,71 +380,158 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
             return self._document_to_calculation(calculation_doc)
         return None
     
-    async def count_by_building_id(self, building_id: str) -> int:
-        """Get count of calculations for a building"""
-        return await self.collection.count_documents({"building_id": building_id})
+    async def count_by_building_id(
+        self,
+        building_id: str,
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> int:
+        """Get count of calculations for a building, optionally for one period and date range"""
+        return await self.collection.count_documents(
+            self._history_query(building_id, period, created_from, created_to)
+        )
+    
+    async def get_all_buildings_summary(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        include_total: bool = True,
+        view: str = "full"
+    ) -> tuple[List[BuildingEfficiencySummary], Optional[int]]:
+        """Get summary for all buildings from the building_summaries view with pagination and search
+        
+        Pages walk the (latest_created_at, building_id) index, and the latest calculations
+        of a page are fetched with one $in lookup, so a page costs O(limit). With an
+        after key the page starts right after that building (keyset pagination). The
+        compact view reads only summary documents and skips the latest calculations.
+        """
+        if not await self._summaries_backfilled():
+            return await self._aggregate_all_buildings_summary(skip, limit, search, after, include_total, view)
+        
+        # Build match filter for search: a case-insensitive substring of the
+        # lowercase building_key, matched literally
+        match_filter: Dict[str, Any] = {}
+        if search:
+            match_filter["building_key"] = {"$regex": re.escape(search.strip().lower())}
+        
+        # building_summaries holds one document per building, so it doubles as the
+        # building registry: the unfiltered total is read from collection metadata
+        total_count = None
+        if include_total:
+            if match_filter:
+                total_count = await self.summaries.count_documents(match_filter)
+            else:
+                total_count = await self.summaries.estimated_document_count()
+        
+        page_filter = match_filter
+        if after:
+            page_filter = {"$and": [match_filter, self._after_filter("latest_created_at", "building_id", after)]}
+            skip = 0
+        
+        cursor = self.summaries.find(page_filter, projection=SUMMARY_LIST_PROJECTION).sort(
+            [("latest_created_at", -1), ("building_id", 1)]
+        ).skip(skip).limit(limit)
+        summary_docs = await cursor.to_list(limit)
+        
+        latest_calculations = {}
+        if view == "full":
+            latest_calculations = await self._get_calculations_by_ids(
+                [doc["latest"]["calculation_id"] for doc in summary_docs if doc.get("latest")]
+            )
+        
+        # One read of the sketches serves the percentiles of the whole page
+        sketches = await self._get_quantile_sketches() if summary_docs else {}
+        
+        building_summaries = []
+        for summary_doc in summary_docs:
+            latest = summary_doc.get("latest")
+            latest_calculation = latest_calculations.get(str(latest["calculation_id"])) if latest else None
+            summary = self._summary_document_to_entity(
+                summary_doc,
+                latest_calculation=latest_calculation,
+                created_at=summary_doc.get("latest_created_at")
+            )
+            self._set_percentiles(summary, summary_doc, sketches)
+            building_summaries.append(summary)
+        
+        return building_summaries, total_count
     
-    async def get_all_buildings_summary(self, skip: int = 0, limit: int = 100, search: str = None) -> tuple[List[BuildingEfficiencySummary], int]:
+    async def _aggregate_all_buildings_summary(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        include_total: bool = True,
+        view: str = "full"
+    ) -> tuple[List[BuildingEfficiencySummary], Optional[int]]:
         """Get summary for all buildings using optimized aggregation pipeline with pagination and search"""
         
         # Build match filter for search
         match_filter = {}
         if search:
-            match_filter["building_id"] = {"$regex": search, "$options": "i"}  # Case-insensitive search
+            match_filter["building_id"] = {"$regex": re.escape(search.strip()), "$options": "i"}  # Case-insensitive substring
         
-        # Counts
-        if search:
-            total_buildings = await self.collection.distinct("building_id", match_filter)
-        else:
-            total_buildings = await self.collection.distinct("building_id")
-        total_count = len(total_buildings)
+        # Counts, grouped server-side so no list of ids comes back
+        total_count = None
+        if include_total:
+            count_cursor = await self.collection.aggregate([
+                {"$match": match_filter},
+                {"$group": {"_id": "$building_id"}},
+                {"$count": "total"}
+            ])
+            count_result = await count_cursor.to_list(1)
+            total_count = count_result[0]["total"] if count_result else 0
         
         # Pipeline to get buildings with their summaries
-        pipeline = [
-            {"$sort": {"created_at": -1}},  # Sort by created_at descending first
-        ]
+        pipeline: List[dict] = []
         
-        # Add match filter if search is provided
+        # Add match filter if search is provided, before sorting so fewer documents are sorted
         if search:
             pipeline.append({"$match": match_filter})
         
         pipeline.extend([
+            {"$sort": {"created_at": -1}},  # Sort by created_at descending first
             {
                 "$group": {
                     "_id": "$building_id",
                     "total_calculations": {"$sum": 1},
-                    "latest_calculation": {"$first": "$$ROOT"},  # Get the first (most recent) document
+                    "latest_calculation_id": {"$first": "$_id"},  # Only the id; full documents are fetched per page
                     "avg_efficiency_improvement": {"$avg": "$summary.overall_efficiency_improvement"},
                     "total_cost_savings": {"$sum": "$summary.total_cost_savings"},
-                    "performance_grades": {"$push": "$summary.performance_grade"},
+                    "best_grade_rank": {"$max": GRADE_RANK_EXPRESSION},
                     "latest_measure_name": {"$first": "$measure_name"},
                     "latest_created_at": {"$first": "$created_at"}
                 }
             },
-            {"$sort": {"latest_created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit}
+            {"$sort": {"latest_created_at": -1, "_id": 1}}
         ])
+        if after:
+            pipeline.append({"$match": self._after_filter("latest_created_at", "_id", after)})
+        else:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit})
         
         cursor = await self.collection.aggregate(pipeline)
         results = await cursor.to_list(None)
         
+        latest_calculations = {}
+        if view == "full":
+            latest_calculations = await self._get_calculations_by_ids(
+                [data["latest_calculation_id"] for data in results]
+            )
+        
         building_summaries = []
         for data in results:
-            # Find best performance grade efficiently
-            grade_order = {"A": 5, "B": 4, "C": 3, "D": 2, "F": 1}
-            best_grade = max(data["performance_grades"], key=lambda g: grade_order.get(g, 0)) if data["performance_grades"] else None
-            
-            # Convert latest calculation document to entity
-            latest_calculation = None
-            if data["latest_calculation"]:
-                latest_calculation = self._document_to_calculation(data["latest_calculation"])
-            
             building_summaries.append(BuildingEfficiencySummary(
                 building_id=data["_id"],
                 total_calculations=data["total_calculations"],
-                latest_calculation=latest_calculation,
-                best_performance_grade=best_grade,
+                latest_calculation=latest_calculations.get(str(data["latest_calculation_id"])),
+                latest_measure_name=data["latest_measure_name"],
+                best_performance_grade=RANK_GRADE.get(data["best_grade_rank"]),
                 average_efficiency_improvement=data["avg_efficiency_improvement"],
                 total_cost_savings=data["total_cost_savings"],
                 created_at=data["latest_created_at"]
@@ -201,6 +539,847 @@ class MongodbEfficiencyRepository(EfficiencyRepository):
         
         return building_summaries, total_count
     
+    async def get_metric_series(
+        self,
+        building_id: str,
+        metric: str,
+        bucket: str,
+        period: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[ChartSeries]:
+        """Get a metric per period of a building, aggregated into time buckets
+        
+        Reads the period_metrics time series, so MongoDB only unpacks the buckets of
+        this building's series in the requested range.
+        """
+        query: Dict[str, Any] = {"meta.building_id": building_id}
+        if period is not None:
+            query["meta.period"] = period
+        
+        created_range = {}
+        if created_from:
+            created_range["$gte"] = created_from
+        if created_to:
+            created_range["$lt"] = created_to
+        if created_range:
+            query["created_at"] = created_range
+        
+        pipeline = [
+            {"$match": query},
+            {
+                "$group": {
+                    "_id": {
+                        "period": "$meta.period",
+                        "timestamp": {"$dateTrunc": {"date": "$created_at", "unit": bucket}}
+                    },
+                    "value": {f"${CHART_METRICS[metric]}": f"${metric}"},
+                    "count": {"$sum": 1}
+                }
+            },
+            {"$sort": {"_id.period": 1, "_id.timestamp": 1}}
+        ]
+        
+        cursor = await self.period_metrics.aggregate(pipeline)
+        
+        series: Dict[str, ChartSeries] = {}
+        async for data in cursor:
+            period_name = data["_id"]["period"]
+            if period_name not in series:
+                series[period_name] = ChartSeries(period=period_name, points=[])
+            series[period_name].points.append(ChartPoint(
+                timestamp=data["_id"]["timestamp"],
+                value=data["value"],
+                count=data["count"]
+            ))
+        
+        return list(series.values())
+    
+    async def copy_period_metrics(
+        self,
+        after: Optional[ObjectId],
+        limit: int,
+        until: Optional[ObjectId] = None
+    ) -> Tuple[Optional[ObjectId], int]:
+        """Copy the period metrics of the next calculations by _id into the time series
+        
+        Calculations from until onwards already had their period metrics written
+        live and are not copied. Returns the last copied calculation _id (None when
+        there is nothing left) and the number of calculations copied.
+        """
+        id_range: Dict[str, ObjectId] = {}
+        if after is not None:
+            id_range["$gt"] = after
+        if until is not None:
+            id_range["$lt"] = until
+        query = {"_id": id_range} if id_range else {}
+        calculation_dicts = await self.collection.find(query).sort("_id", 1).limit(limit).to_list(limit)
+        if not calculation_dicts:
+            return None, 0
+        
+        metric_docs = self._period_metric_documents(calculation_dicts)
+        if metric_docs:
+            await self.period_metrics.insert_many(metric_docs, ordered=False)
+        
+        return calculation_dicts[-1]["_id"], len(calculation_dicts)
+    
+    async def rebuild_quantile_sketches(self, batch_size: int = 1000) -> int:
+        """Recompute the sketches and every summary's sketch bins from the summary documents
+        
+        Writes that land while this runs can leave a building counted in a stale bin;
+        run it when writes are quiet, and after rebuilding building summaries.
+        """
+        sketches = {metric: QuantileSketch.empty(metric) for metric in BUILDING_SKETCH_METRICS}
+        total = 0
+        last_building_id = None
+        
+        while True:
+            match_filter: Dict[str, Any] = {}
+            if last_building_id is not None:
+                match_filter["building_id"] = {"$gt": last_building_id}
+            cursor = self.summaries.find(match_filter, self._score_projection()).sort("building_id", 1).limit(batch_size)
+            summary_docs = await cursor.to_list(None)
+            if not summary_docs:
+                break
+            
+            operations = []
+            for summary_doc in summary_docs:
+                bins = self._sketch_bins(sketches, self._summary_scores(summary_doc))
+                for metric, bin_index in bins.items():
+                    sketches[metric].counts[bin_index] = sketches[metric].counts.get(bin_index, 0) + 1
+                operations.append(UpdateOne(
+                    {"building_id": summary_doc["building_id"]},
+                    {"$set": {f"sketch_bins.{metric}": bin_index for metric, bin_index in bins.items()}}
+                ))
+            
+            await self.summaries.bulk_write(operations, ordered=False)
+            total += len(summary_docs)
+            last_building_id = summary_docs[-1]["building_id"]
+        
+        for metric, sketch in sketches.items():
+            await self.sketches.replace_one(
+                {"_id": metric},
+                {"counts": {str(bin_index): count for bin_index, count in sketch.counts.items()}},
+                upsert=True
+            )
+        return total
+    
+    async def get_building_scores(self, building_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get the leaderboard scores of buildings from their summary documents"""
+        if not building_ids:
+            return {}
+        
+        cursor = self.summaries.find({"building_id": {"$in": building_ids}}, self._score_projection())
+        return {summary_doc["building_id"]: self._summary_scores(summary_doc) async for summary_doc in cursor}
+    
+    async def get_building_scores_after(self, after: Optional[str], limit: int) -> Dict[str, Dict[str, float]]:
+        """Get leaderboard scores of the next buildings in building_id order, for resumable scans"""
+        match_filter = {"building_id": {"$gt": after}} if after is not None else {}
+        cursor = self.summaries.find(match_filter, self._score_projection()).sort("building_id", 1).limit(limit)
+        return {summary_doc["building_id"]: self._summary_scores(summary_doc) async for summary_doc in cursor}
+    
+    async def get_leaderboard(self, metric: str, order: str = "top", limit: int = 10) -> Leaderboard:
+        """Get the highest or lowest scoring buildings by sorting every summary document"""
+        direction = -1 if order == "top" else 1
+        pipeline = [
+            {"$project": {"_id": 0, "building_id": 1, "score": LEADERBOARD_SCORE_EXPRESSIONS[metric]}},
+            {"$sort": {"score": direction, "building_id": direction}},
+            {"$limit": limit}
+        ]
+        
+        total = await self.summaries.estimated_document_count()
+        cursor = await self.summaries.aggregate(pipeline)
+        results = await cursor.to_list(None)
+        entries = [
+            LeaderboardEntry(
+                building_id=data["building_id"],
+                score=data["score"],
+                rank=index + 1 if order == "top" else total - index
+            )
+            for index, data in enumerate(results)
+        ]
+        return Leaderboard(metric=metric, order=order, entries=entries, total_buildings=total)
+    
+    async def get_building_rank(self, metric: str, building_id: str) -> BuildingRank:
+        """Get the rank of a building by counting the summaries that score higher"""
+        total = await self.summaries.estimated_document_count()
+        summary_doc = await self.summaries.find_one({"building_id": building_id}, self._score_projection())
+        if not summary_doc:
+            return BuildingRank(building_id=building_id, metric=metric, rank=None, total_buildings=total)
+        
+        score = self._summary_scores(summary_doc)[metric]
+        higher = await self.summaries.count_documents(
+            {"$expr": {"$gt": [LEADERBOARD_SCORE_EXPRESSIONS[metric], score]}}
+        )
+        return BuildingRank(building_id=building_id, metric=metric, rank=higher + 1, score=score, total_buildings=total)
+    
+    async def get_portfolio_rollup(self) -> Optional[PortfolioRollup]:
+        """Get portfolio analytics from the rollup documents
+        
+        Reads one document for the portfolio plus one per measure and period name,
+        independent of the number of calculations. Until the first reconcile the
+        rollups miss older calculations, so the calculations are aggregated instead.
+        """
+        if not await self._rollups_reconciled():
+            return await self._aggregate_portfolio_rollup()
+        
+        totals = None
+        reconciled_at = None
+        by_measure = []
+        by_period = []
+        async for rollup_doc in self.rollups.find({}):
+            rollup = self._rollup_document_to_totals(rollup_doc)
+            if rollup_doc["kind"] == "portfolio":
+                totals = rollup
+                reconciled_at = rollup_doc.get("reconciled_at")
+            elif rollup_doc["kind"] == "measure":
+                by_measure.append(rollup)
+            elif rollup_doc["kind"] == "period":
+                by_period.append(rollup)
+        
+        if totals is None:
+            return None
+        
+        return PortfolioRollup(
+            total_buildings=await self.summaries.estimated_document_count(),
+            totals=totals,
+            by_measure=sorted(by_measure, key=lambda rollup: rollup.key or ""),
+            by_period=sorted(by_period, key=lambda rollup: rollup.key or ""),
+            reconciled_at=reconciled_at
+        )
+    
+    async def _aggregate_portfolio_rollup(self) -> Optional[PortfolioRollup]:
+        """Get portfolio analytics by aggregating the calculations, grouped as the rollups are"""
+        pipeline = [
+            {
+                "$facet": {
+                    "portfolio": [{"$group": self._rollup_calculation_group(None)}],
+                    "measure": [{"$group": self._rollup_calculation_group("$measure_name")}],
+                    "period": [{"$unwind": "$periods"}, {"$group": self._rollup_period_group()}],
+                    "buildings": [{"$group": {"_id": "$building_id"}}, {"$count": "total"}]
+                }
+            }
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        facets = (await cursor.to_list(1))[0]
+        if not facets["portfolio"]:
+            return None
+        
+        def totals(data: dict) -> PortfolioTotals:
+            return self._rollup_document_to_totals({
+                **data,
+                "key": data["_id"],
+                "grade_counts": {grade: data.get(f"grade_{grade}", 0) for grade in GRADE_ORDER}
+            })
+        
+        return PortfolioRollup(
+            total_buildings=facets["buildings"][0]["total"],
+            totals=totals(facets["portfolio"][0]),
+            by_measure=sorted(map(totals, facets["measure"]), key=lambda rollup: rollup.key or ""),
+            by_period=sorted(map(totals, facets["period"]), key=lambda rollup: rollup.key or "")
+        )
+    
+    async def get_measure_analytics(self, measure_name: Optional[str] = None) -> List[MeasureAnalytics]:
+        """Get effectiveness analytics of one or every measure from the measure rollups
+        
+        Median and p90 come from each rollup's improvement histogram, so the cost is
+        one document per measure however many calculations it has. Until the first
+        reconcile the rollups miss older calculations, so every measure is aggregated
+        from the calculations instead.
+        """
+        if not await self._rollups_reconciled():
+            analytics = await self._aggregate_measure_analytics(measure_name)
+        else:
+            rollup_filter = {"_id": f"measure:{measure_name}"} if measure_name is not None else {"kind": "measure"}
+            analytics = [
+                self._rollup_document_to_measure_analytics(rollup_doc)
+                async for rollup_doc in self.rollups.find(rollup_filter)
+            ]
+        
+        return sorted(analytics, key=lambda measure: measure.measure_name)
+    
+    async def _aggregate_measure_analytics(self, measure_name: Optional[str]) -> List[MeasureAnalytics]:
+        """Get measure analytics by aggregating calculations, via the measure_name index"""
+        pipeline = [
+            {"$match": {"measure_name": measure_name} if measure_name is not None else {}},
+            {
+                "$group": {
+                    "_id": "$measure_name",
+                    "count": {"$sum": 1},
+                    "mean": {"$avg": "$summary.overall_efficiency_improvement"},
+                    "median": {"$median": {"input": "$summary.overall_efficiency_improvement", "method": "approximate"}},
+                    "p90": {
+                        "$percentile": {
+                            "input": "$summary.overall_efficiency_improvement",
+                            "p": [0.9],
+                            "method": "approximate"
+                        }
+                    },
+                    **{
+                        field: {"$sum": f"$summary.{ROLLUP_SUMMARY_FIELDS[field]}"}
+                        for field in ("electric_savings_kwh", "gas_savings_therms", "total_cost_savings")
+                    },
+                    **{
+                        f"grade_{grade}": {"$sum": {"$cond": [{"$eq": ["$summary.performance_grade", grade]}, 1, 0]}}
+                        for grade in GRADE_ORDER
+                    }
+                }
+            }
+        ]
+        
+        cursor = await self.collection.aggregate(pipeline)
+        return [
+            MeasureAnalytics(
+                measure_name=data["_id"],
+                count=data["count"],
+                mean_efficiency_improvement=data["mean"],
+                median_efficiency_improvement=data["median"],
+                p90_efficiency_improvement=data["p90"][0],
+                total_electric_savings_kwh=data["electric_savings_kwh"],
+                total_gas_savings_therms=data["gas_savings_therms"],
+                total_cost_savings=data["total_cost_savings"],
+                grade_distribution={grade: data[f"grade_{grade}"] for grade in GRADE_ORDER if data[f"grade_{grade}"]}
+            )
+            async for data in cursor
+        ]
+    
+    async def reconcile_portfolio_rollups(self):
+        """Recompute every rollup document from the calculations
+        
+        Corrects drift from failed increments and float accumulation. Each rollup is
+        replaced as a whole, so running it repeatedly is safe.
+        """
+        improvement_sketch = QuantileSketch.empty("overall_efficiency_improvement")
+        
+        def rollup_projection(rollup_id, kind: str, key, graded: bool) -> dict:
+            projection = {
+                "_id": rollup_id,
+                "kind": {"$literal": kind},
+                "key": key,
+                "count": 1,
+                **{field: 1 for field in ROLLUP_SUMMARY_FIELDS},
+                "reconciled_at": "$$NOW"
+            }
+            if graded:
+                projection["grade_counts"] = {grade: f"$grade_{grade}" for grade in GRADE_ORDER}
+            return projection
+        
+        merge = {"$merge": {"into": self.rollups.name, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        
+        pipelines = [
+            [
+                {"$group": self._rollup_calculation_group(None)},
+                {"$project": rollup_projection({"$literal": "portfolio"}, "portfolio", {"$literal": None}, True)},
+                merge
+            ],
+            [
+                # Group by measure and improvement bin, then fold the bins into a histogram
+                {
+                    "$group": self._rollup_calculation_group({
+                        "measure_name": "$measure_name",
+                        "bin": self._bin_expression("$summary.overall_efficiency_improvement", improvement_sketch)
+                    })
+                },
+                {
+                    "$group": {
+                        "_id": "$_id.measure_name",
+                        **{
+                            field: {"$sum": f"${field}"}
+                            for field in ["count", *ROLLUP_SUMMARY_FIELDS, *(f"grade_{grade}" for grade in GRADE_ORDER)]
+                        },
+                        "improvement_bins": {"$push": {"k": {"$toString": "$_id.bin"}, "v": "$count"}}
+                    }
+                },
+                {
+                    "$project": {
+                        **rollup_projection({"$concat": ["measure:", "$_id"]}, "measure", "$_id", True),
+                        "improvement_counts": {"$arrayToObject": "$improvement_bins"}
+                    }
+                },
+                merge
+            ],
+            [
+                {"$unwind": "$periods"},
+                {"$group": self._rollup_period_group()},
+                {"$project": rollup_projection({"$concat": ["period:", "$_id"]}, "period", "$_id", False)},
+                merge
+            ]
+        ]
+        
+        for pipeline in pipelines:
+            cursor = await self.collection.aggregate(pipeline)
+            await cursor.to_list(None)
+        
+        await self.checkpoints.complete(PORTFOLIO_ROLLUPS_RECONCILE)
+    
+    def _rollup_calculation_group(self, group_id) -> dict:
+        """$group stage summing calculation summaries into rollup totals and grade counts"""
+        return {
+            "_id": group_id,
+            "count": {"$sum": 1},
+            **{
+                field: {"$sum": f"$summary.{source}"}
+                for field, source in ROLLUP_SUMMARY_FIELDS.items()
+            },
+            **{
+                f"grade_{grade}": {"$sum": {"$cond": [{"$eq": ["$summary.performance_grade", grade]}, 1, 0]}}
+                for grade in GRADE_ORDER
+            }
+        }
+    
+    def _rollup_period_group(self) -> dict:
+        """$group stage summing unwound periods into per-period-name rollup totals"""
+        return {
+            "_id": "$periods.period",
+            "count": {"$sum": 1},
+            **{
+                field: {"$sum": f"$periods.{source}"}
+                for field, source in ROLLUP_PERIOD_FIELDS.items()
+            }
+        }
+    
+    async def search_building_ids(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get building IDs starting with prefix (case-insensitive) from the building_key index"""
+        if not await self._summaries_backfilled():
+            pipeline = [
+                {"$match": {"building_id": {"$regex": f"^{re.escape(prefix.strip())}", "$options": "i"}}},
+                {"$group": {"_id": "$building_id"}},
+                {"$sort": {"_id": 1}},
+                {"$limit": limit}
+            ]
+            aggregate_cursor = await self.collection.aggregate(pipeline)
+            return [data["_id"] async for data in aggregate_cursor]
+        
+        cursor = self.summaries.find(
+            {"building_key": {"$regex": f"^{re.escape(prefix.strip().lower())}"}},
+            projection={"_id": 0, "building_id": 1}
+        ).sort("building_key", 1).limit(limit)
+        
+        return [summary_doc["building_id"] async for summary_doc in cursor]
+    
+    async def _summaries_backfilled(self) -> bool:
+        """Whether summary documents cover every building's full history"""
+        return await self.checkpoints.is_completed(BUILDING_SUMMARIES_BACKFILL)
+    
+    async def _rollups_reconciled(self) -> bool:
+        """Whether the rollup documents cover every calculation"""
+        return await self.checkpoints.is_completed(PORTFOLIO_ROLLUPS_RECONCILE)
+    
+    async def get_building_ids_after(self, after: Optional[str], limit: int) -> List[str]:
+        """Get the next distinct building IDs in ascending order, for resumable scans"""
+        match_filter = {"building_id": {"$gt": after}} if after is not None else {}
+        pipeline = [
+            {"$match": match_filter},
+            {"$group": {"_id": "$building_id"}},
+            {"$sort": {"_id": 1}},
+            {"$limit": limit}
+        ]
+        
+        cursor = await self.collection.aggregate(pipeline)
+        return [data["_id"] async for data in cursor]
+    
+    async def rebuild_building_summaries(self, building_ids: List[str]):
+        """Recompute the summary documents of the given buildings from their calculations
+        
+        Overwrites every recomputed field; other fields (the sketch bins a building is
+        counted in) are kept. The totals are a snapshot: a calculation of one of these
+        buildings written after the aggregation reads it but before $merge writes the
+        summary has its $inc overwritten and is missing from the totals. Rebuild while
+        those buildings are not being written, or rebuild them again afterwards.
+        """
+        if not building_ids:
+            return
+        
+        pipeline = [
+            {"$match": {"building_id": {"$in": building_ids}}},
+            {
+                "$group": {
+                    "_id": "$building_id",
+                    "total_calculations": {"$sum": 1},
+                    "sum_efficiency_improvement": {"$sum": "$summary.overall_efficiency_improvement"},
+                    "total_cost_savings": {"$sum": "$summary.total_cost_savings"},
+                    **{
+                        f"grade_{grade}": {
+                            "$sum": {"$cond": [{"$eq": ["$summary.performance_grade", grade]}, 1, 0]}
+                        }
+                        for grade in GRADE_ORDER
+                    },
+                    "latest": {
+                        "$max": {"created_at": "$created_at", "calculation_id": "$_id", "measure_name": "$measure_name"}
+                    },
+                    "latest_created_at": {"$max": "$created_at"}
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "building_id": "$_id",
+                    "building_key": {"$toLower": "$_id"},
+                    "total_calculations": 1,
+                    "sum_efficiency_improvement": 1,
+                    "total_cost_savings": 1,
+                    "grade_counts": {grade: f"$grade_{grade}" for grade in GRADE_ORDER},
+                    "latest": 1,
+                    "latest_created_at": 1,
+                    "updated_at": "$$NOW"
+                }
+            },
+            {
+                "$merge": {
+                    "into": self.summaries.name,
+                    "on": "building_id",
+                    "whenMatched": "merge",
+                    "whenNotMatched": "insert"
+                }
+            }
+        ]
+        
+        cursor = await self.collection.aggregate(pipeline)
+        await cursor.to_list(None)
+    
+    async def _update_building_summaries(self, calculation_dicts: List[dict]):
+        """Fold newly inserted calculations into their buildings' summary documents
+        
+        Each building gets a single $inc/$max update, so concurrent writers never
+        lose counts. The latest pointer is an embedded {created_at, calculation_id,
+        measure_name} document; $max compares it field by field, keeping the newest
+        calculation.
+        """
+        updates: Dict[str, dict] = {}
+        for calculation_dict in calculation_dicts:
+            building_id = calculation_dict["building_id"]
+            summary = calculation_dict["summary"]
+            update = updates.setdefault(building_id, {
+                "$inc": {"total_calculations": 0, "sum_efficiency_improvement": 0.0, "total_cost_savings": 0.0},
+                "$max": {},
+                "$set": {"building_key": building_id.lower()}
+            })
+            
+            update["$inc"]["total_calculations"] += 1
+            update["$inc"]["sum_efficiency_improvement"] += summary["overall_efficiency_improvement"]
+            update["$inc"]["total_cost_savings"] += summary["total_cost_savings"]
+            grade_field = f"grade_counts.{summary['performance_grade']}"
+            update["$inc"][grade_field] = update["$inc"].get(grade_field, 0) + 1
+            
+            latest = {
+                "created_at": calculation_dict["created_at"],
+                "calculation_id": calculation_dict["_id"],
+                "measure_name": calculation_dict["measure_name"]
+            }
+            if not update["$max"] or (latest["created_at"], latest["calculation_id"]) > (
+                update["$max"]["latest"]["created_at"], update["$max"]["latest"]["calculation_id"]
+            ):
+                update["$max"] = {"latest": latest, "latest_created_at": latest["created_at"]}
+            update["$set"]["updated_at"] = calculation_dict["created_at"]
+        
+        if not updates:
+            return
+        
+        try:
+            await self.summaries.bulk_write(
+                [UpdateOne({"building_id": building_id}, update, upsert=True) for building_id, update in updates.items()],
+                ordered=False
+            )
+        except PyMongoError as e:
+            # The calculations are stored; the backfill command repairs the summaries
+            logger.error("Error updating building summaries", building_ids=list(updates), error=str(e))
+    
+    async def _update_quantile_sketches(self, building_ids: List[str]):
+        """Move updated buildings to the sketch bins of their new totals
+        
+        Each summary document records the bin it is counted in per metric, and a move
+        is a compare-and-set on those fields followed by a -1/+1 on the sketch. Two
+        writers racing on one building can never both apply the same move; the one
+        that loses re-reads the summary and tries again.
+        """
+        pending = sorted(set(building_ids))
+        sketches = {metric: QuantileSketch.empty(metric) for metric in BUILDING_SKETCH_METRICS}
+        
+        try:
+            for _ in range(SKETCH_UPDATE_ATTEMPTS):
+                if not pending:
+                    return
+                
+                increments: Dict[str, Dict[str, int]] = {metric: {} for metric in BUILDING_SKETCH_METRICS}
+                retry = []
+                cursor = self.summaries.find(
+                    {"building_id": {"$in": pending}},
+                    {**self._score_projection(), "sketch_bins": 1}
+                )
+                async for summary_doc in cursor:
+                    current_bins = summary_doc.get("sketch_bins") or {}
+                    moves = {
+                        metric: (current_bins.get(metric), bin_index)
+                        for metric, bin_index in self._sketch_bins(sketches, self._summary_scores(summary_doc)).items()
+                        if current_bins.get(metric) != bin_index
+                    }
+                    if not moves:
+                        continue
+                    
+                    # A missing field matches None, so a new building is claimed only once
+                    result = await self.summaries.update_one(
+                        {
+                            "building_id": summary_doc["building_id"],
+                            **{f"sketch_bins.{metric}": old_bin for metric, (old_bin, _) in moves.items()}
+                        },
+                        {"$set": {f"sketch_bins.{metric}": new_bin for metric, (_, new_bin) in moves.items()}}
+                    )
+                    if not result.modified_count:
+                        retry.append(summary_doc["building_id"])
+                        continue
+                    
+                    for metric, (old_bin, new_bin) in moves.items():
+                        metric_increments = increments[metric]
+                        metric_increments[f"counts.{new_bin}"] = metric_increments.get(f"counts.{new_bin}", 0) + 1
+                        if old_bin is not None:
+                            metric_increments[f"counts.{old_bin}"] = metric_increments.get(f"counts.{old_bin}", 0) - 1
+                
+                operations = [
+                    UpdateOne({"_id": metric}, {"$inc": metric_increments}, upsert=True)
+                    for metric, metric_increments in increments.items()
+                    if metric_increments
+                ]
+                if operations:
+                    await self.sketches.bulk_write(operations, ordered=False)
+                pending = retry
+            
+            if pending:
+                logger.warning("Gave up moving buildings between sketch bins", building_ids=pending)
+        except PyMongoError as e:
+            # The summaries are stored; the rebuild command repairs the sketches
+            logger.error("Error updating quantile sketches", building_ids=building_ids, error=str(e))
+    
+    async def _get_quantile_sketches(self) -> Dict[str, QuantileSketch]:
+        """Get the portfolio sketch of every metric, empty for metrics never written"""
+        sketches = {metric: QuantileSketch.empty(metric) for metric in BUILDING_SKETCH_METRICS}
+        async for sketch_doc in self.sketches.find({"_id": {"$in": list(BUILDING_SKETCH_METRICS)}}):
+            sketches[sketch_doc["_id"]].counts = {
+                int(bin_index): count
+                for bin_index, count in sketch_doc.get("counts", {}).items()
+                if count > 0
+            }
+        return sketches
+    
+    def _bin_expression(self, field: str, sketch: QuantileSketch) -> dict:
+        """Aggregation expression for QuantileSketch.bin_index of a linear-scale sketch"""
+        position = {
+            "$multiply": [
+                {"$divide": [{"$subtract": [field, sketch.low]}, sketch.high - sketch.low]},
+                sketch.bins
+            ]
+        }
+        return {"$toInt": {"$min": [{"$max": [{"$floor": position}, 0]}, sketch.bins - 1]}}
+    
+    def _sketch_bins(self, sketches: Dict[str, QuantileSketch], scores: Dict[str, float]) -> Dict[str, int]:
+        """Sketch bin of each metric for a building's scores"""
+        return {metric: sketch.bin_index(scores[metric]) for metric, sketch in sketches.items()}
+    
+    async def _get_calculations_by_ids(self, calculation_ids: List[ObjectId]) -> Dict[str, EfficiencyCalculation]:
+        """Get calculations by ID with a single $in query, keyed by string ID"""
+        calculations = {}
+        if calculation_ids:
+            async for calculation_doc in self.collection.find({"_id": {"$in": calculation_ids}}):
+                calculations[str(calculation_doc["_id"])] = self._document_to_calculation(calculation_doc)
+        return calculations
+    
+    async def _update_portfolio_rollups(self, calculation_dicts: List[dict]):
+        """Fold newly inserted calculations into the portfolio, measure and period rollups
+        
+        Increments are summed per rollup document in memory first, so a batch costs one
+        upsert per distinct rollup. Measure rollups also count each calculation's
+        improvement into a histogram for the measure's median and p90.
+        """
+        updates: Dict[str, dict] = {}
+        improvement_sketch = QuantileSketch.empty("overall_efficiency_improvement")
+        
+        def increment(rollup_id: str, kind: str, key: Optional[str], values: dict, counters: Tuple[str, ...] = ()):
+            update = updates.setdefault(rollup_id, {
+                "$inc": {"count": 0},
+                "$setOnInsert": {"kind": kind, "key": key}
+            })
+            update["$inc"]["count"] += 1
+            for field, value in values.items():
+                update["$inc"][field] = update["$inc"].get(field, 0.0) + value
+            for counter in counters:
+                update["$inc"][counter] = update["$inc"].get(counter, 0) + 1
+        
+        for calculation_dict in calculation_dicts:
+            summary = calculation_dict["summary"]
+            values = {field: summary[source] for field, source in ROLLUP_SUMMARY_FIELDS.items()}
+            grade_counter = f"grade_counts.{summary['performance_grade']}"
+            bin_counter = f"improvement_counts.{improvement_sketch.bin_index(summary['overall_efficiency_improvement'])}"
+            increment("portfolio", "portfolio", None, values, (grade_counter,))
+            increment(
+                f"measure:{calculation_dict['measure_name']}",
+                "measure",
+                calculation_dict["measure_name"],
+                values,
+                (grade_counter, bin_counter)
+            )
+            
+            for period in calculation_dict["periods"]:
+                period_values = {field: period[source] for field, source in ROLLUP_PERIOD_FIELDS.items()}
+                increment(f"period:{period['period']}", "period", period["period"], period_values)
+        
+        if not updates:
+            return
+        
+        try:
+            await self.rollups.bulk_write(
+                [UpdateOne({"_id": rollup_id}, update, upsert=True) for rollup_id, update in updates.items()],
+                ordered=False
+            )
+        except PyMongoError as e:
+            # The calculations are stored; the next reconcile repairs the rollups
+            logger.error("Error updating portfolio rollups", error=str(e))
+    
+    def _score_projection(self) -> dict:
+        """Summary document fields needed for leaderboard scores"""
+        return {
+            "_id": 0,
+            "building_id": 1,
+            "total_calculations": 1,
+            "sum_efficiency_improvement": 1,
+            "total_cost_savings": 1
+        }
+    
+    def _summary_scores(self, summary_doc: dict) -> Dict[str, float]:
+        """Leaderboard scores of a building_summaries document, matching LEADERBOARD_SCORE_EXPRESSIONS"""
+        total_calculations = summary_doc["total_calculations"]
+        return {
+            "total_cost_savings": summary_doc["total_cost_savings"],
+            "average_efficiency_improvement": (
+                summary_doc["sum_efficiency_improvement"] / total_calculations if total_calculations else 0.0
+            )
+        }
+    
+    def _set_percentiles(
+        self,
+        summary: BuildingEfficiencySummary,
+        summary_doc: dict,
+        sketches: Dict[str, QuantileSketch]
+    ):
+        """Fill the portfolio percentiles of a summary from the quantile sketches"""
+        scores = self._summary_scores(summary_doc)
+        summary.efficiency_improvement_percentile = sketches["average_efficiency_improvement"].percentile(
+            scores["average_efficiency_improvement"]
+        )
+        summary.cost_savings_percentile = sketches["total_cost_savings"].percentile(scores["total_cost_savings"])
+    
+    def _rollup_document_to_measure_analytics(self, rollup_doc: dict) -> MeasureAnalytics:
+        """Convert a measure rollup document to MeasureAnalytics"""
+        totals = self._rollup_document_to_totals(rollup_doc)
+        improvement_sketch = QuantileSketch.empty("overall_efficiency_improvement")
+        improvement_sketch.counts = {
+            int(bin_index): count
+            for bin_index, count in rollup_doc.get("improvement_counts", {}).items()
+            if count > 0
+        }
+        
+        return MeasureAnalytics(
+            measure_name=rollup_doc["key"],
+            count=totals.count,
+            mean_efficiency_improvement=totals.average_efficiency_improvement,
+            median_efficiency_improvement=improvement_sketch.quantile(0.5),
+            p90_efficiency_improvement=improvement_sketch.quantile(0.9),
+            total_electric_savings_kwh=totals.total_electric_savings_kwh,
+            total_gas_savings_therms=totals.total_gas_savings_therms,
+            total_cost_savings=totals.total_cost_savings,
+            grade_distribution=totals.grade_distribution
+        )
+    
+    def _rollup_document_to_totals(self, rollup_doc: dict) -> PortfolioTotals:
+        """Convert a portfolio_rollups document to PortfolioTotals"""
+        count = rollup_doc.get("count", 0)
+        return PortfolioTotals(
+            key=rollup_doc.get("key"),
+            count=count,
+            total_electric_savings_kwh=rollup_doc.get("electric_savings_kwh", 0.0),
+            total_gas_savings_therms=rollup_doc.get("gas_savings_therms", 0.0),
+            total_electric_cost_savings=rollup_doc.get("electric_cost_savings", 0.0),
+            total_gas_cost_savings=rollup_doc.get("gas_cost_savings", 0.0),
+            total_cost_savings=rollup_doc.get("total_cost_savings", 0.0),
+            average_efficiency_improvement=(
+                rollup_doc.get("sum_efficiency_improvement", 0.0) / count if count else None
+            ),
+            grade_distribution={
+                grade: grade_count
+                for grade, grade_count in rollup_doc.get("grade_counts", {}).items()
+                if grade_count
+            }
+        )
+    
+    async def _record_period_metrics(self, calculation_dicts: List[dict]):
+        """Append the periods of newly inserted calculations to the period_metrics time series"""
+        metric_docs = self._period_metric_documents(calculation_dicts)
+        if not metric_docs:
+            return
+        
+        try:
+            # Bound the backfill before the first live points land, so none are copied twice
+            await self.checkpoints.record_first(
+                PERIOD_METRICS_LIVE,
+                first_calculation_id=min(calculation_dict["_id"] for calculation_dict in calculation_dicts)
+            )
+            await self.period_metrics.insert_many(metric_docs, ordered=False)
+        except PyMongoError as e:
+            # The calculations are stored; charts miss these points until a full rebuild
+            logger.error("Error recording period metrics", error=str(e))
+    
+    def _period_metric_documents(self, calculation_dicts: List[dict]) -> List[dict]:
+        """Flatten calculations into one time series document per period"""
+        metric_docs = []
+        for calculation_dict in calculation_dicts:
+            created_at = calculation_dict.get("created_at")
+            if not created_at:
+                continue
+            
+            for period in calculation_dict["periods"]:
+                metric_doc = {
+                    "created_at": created_at,
+                    "meta": {"building_id": calculation_dict["building_id"], "period": period["period"]},
+                    "calculation_id": calculation_dict["_id"],
+                    "measure_name": calculation_dict["measure_name"]
+                }
+                for metric in CHART_METRICS:
+                    metric_doc[metric] = period[metric]
+                metric_docs.append(metric_doc)
+        
+        return metric_docs
+    
+    def _after_filter(self, sort_field: str, tie_field: str, after: Tuple[datetime, str]) -> dict:
+        """Keyset filter for items after (sort value, tie breaker), sorted descending then ascending"""
+        sort_value, tie_breaker = after
+        return {"$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, tie_field: {"$gt": tie_breaker}}
+        ]}
+    
+    def _summary_document_to_entity(
+        self,
+        summary_doc: dict,
+        latest_calculation: Optional[EfficiencyCalculation] = None,
+        created_at: Optional[datetime] = None
+    ) -> BuildingEfficiencySummary:
+        """Convert a building_summaries document to a BuildingEfficiencySummary entity"""
+        total_calculations = summary_doc["total_calculations"]
+        grade_counts = summary_doc.get("grade_counts", {})
+        graded = [grade for grade, count in grade_counts.items() if count > 0]
+        best_grade = max(graded, key=lambda g: GRADE_ORDER.get(g, 0)) if graded else None
+        
+        return BuildingEfficiencySummary(
+            building_id=summary_doc["building_id"],
+            total_calculations=total_calculations,
+            latest_calculation=latest_calculation,
+            latest_measure_name=(summary_doc.get("latest") or {}).get("measure_name"),
+            best_performance_grade=best_grade,
+            average_efficiency_improvement=(
+                summary_doc["sum_efficiency_improvement"] / total_calculations if total_calculations else None
+            ),
+            total_cost_savings=summary_doc["total_cost_savings"],
+            created_at=created_at
+        )
+    
     def _document_to_calculation(self, calculation_doc: dict) -> EfficiencyCalculation:
         """Convert MongoDB document to EfficiencyCalculation entity"""
         calculation_doc["id"] = str(calculation_doc["_id"])
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from bson import ObjectId
 
@@ -37,9 +37,24 @@ class MongoDBUserRepository(UserRepository):
         except Exception:
             return None
     
-    async def get_paginated(self, skip: int = 0, limit: int = 10) -> List[User]:
-        """Get paginated users"""
-        cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(limit)
+    async def get_paginated(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[User]:
+        """Get paginated users, starting after the (created_at, id) key when given"""
+        query = {}
+        if after:
+            # Keyset pagination: an index range scan instead of skipping documents
+            created_at, user_id = after
+            query = {"$or": [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": ObjectId(user_id)}}
+            ]}
+            skip = 0
+        
+        cursor = self.collection.find(query).sort([("created_at", -1), ("_id", -1)]).skip(skip).limit(limit)
         users = []
         
         async for user_doc in cursor:
@@ -0,0 +1,56 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call
+
+    The first caller starts the call as a task; callers arriving while it runs await
+    the same task. The task is shielded, so a cancelled caller does not cancel it
+    for the others, and it is forgotten as soon as it finishes.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func, or join the call already running for key"""
+        return await asyncio.shield(self.start(key, func))
+
+    def start(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        """Start func in the background unless a call for key is already running
+
+        The running task is referenced until it finishes, so callers may drop it.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call, unless a newer one already replaced it"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Get in-flight and coalesced call counters"""
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+
+# Cache-miss loads of the efficiency service, shared by every request in the process
+cache_single_flight = SingleFlight()
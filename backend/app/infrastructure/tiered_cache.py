@@ -0,0 +1,191 @@
+import asyncio
+import json
+from collections.abc import Callable
+from fnmatch import fnmatchcase
+from typing import Any, TypeVar
+
+import redis.asyncio as redis
+
+from app.domain.ports.cache_service import CacheService
+from app.infrastructure.cache import RedisCacheService, cache_service
+from app.infrastructure.config import settings
+from app.infrastructure.logging import get_logger
+from app.infrastructure.memory_cache import TTLCache
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class TieredCacheService(CacheService):
+    """Two-tier CacheService: an in-process TTL/LRU tier in front of Redis
+
+    The local tier holds decoded objects from get_object/set_object and generation
+    counters, so a hot read costs neither a round trip nor decoding. Plain get/set
+    always go to Redis, since their values (e.g. ingest progress) are shared state.
+
+    Every invalidation is applied locally and published on a Redis channel, which
+    each replica subscribes to. Messages name the keys to drop (or a pattern), so a
+    write only evicts its own entries. A replica that misses messages (while
+    reconnecting) clears its local tier; beyond that, local entries live at most
+    local_cache_ttl.
+    """
+
+    def __init__(self, remote: RedisCacheService, local: TTLCache, channel: str):
+        """Initialize the tiers"""
+        self.remote = remote
+        self.local = local
+        self.channel = channel
+        self._listener: asyncio.Task | None = None
+        # Bumped by every local invalidation, so a read racing one is not stored
+        self._invalidations = 0
+
+    async def connect(self):
+        """Connect to Redis and start listening for invalidations"""
+        await self.remote.connect()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def disconnect(self):
+        """Stop listening and disconnect from Redis"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        await self.remote.disconnect()
+
+    async def get(self, key: str) -> str | None:
+        """Get value from Redis"""
+        return await self.remote.get(key)
+
+    async def set(
+        self, key: str, value: str, ttl: int = 60, tags: list[str] | None = None
+    ) -> None:
+        """Set value in Redis"""
+        await self.remote.set(key, value, ttl, tags)
+
+    async def get_object(self, key: str, decode: Callable[[str], T]) -> T | None:
+        """Get a decoded value from the local tier, or from Redis into the local tier"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        invalidations = self._invalidations
+        value = await self.remote.get_object(key, decode)
+        if value is not None and invalidations == self._invalidations:
+            self.local.set(key, value)
+        return value
+
+    async def set_object(
+        self,
+        key: str,
+        value: T,
+        encode: Callable[[T], str],
+        ttl: int = 60,
+        tags: list[str] | None = None,
+    ) -> None:
+        """Set a value in Redis and the local tier"""
+        await self.remote.set_object(key, value, encode, ttl, tags)
+        self.local.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        """Delete value from both tiers on every replica"""
+        await self.remote.delete(key)
+        await self._invalidate({"keys": [key]})
+
+    async def delete_pattern(self, pattern: str) -> None:
+        """Delete all keys matching pattern from both tiers on every replica"""
+        await self.remote.delete_pattern(pattern)
+        await self._invalidate({"pattern": pattern})
+
+    async def delete_tags(self, tags: list[str]) -> int:
+        """Delete tagged keys from both tiers on every replica
+
+        Tags are only tracked in Redis, so the tagged keys are read before deleting
+        them and published as the keys to drop. When there are more of them than fit
+        one message (or they cannot be read), the local tiers are cleared instead.
+        """
+        keys = await self.remote.get_tagged_keys(tags)
+        tracked = await self.remote.delete_tags(tags)
+        if keys is None or len(keys) > settings.cache_invalidation_batch_size:
+            await self._invalidate({"clear": True})
+        elif keys:
+            await self._invalidate({"keys": keys})
+        return tracked
+
+    async def get_generation(self, key: str) -> int:
+        """Get a generation counter from the local tier, or from Redis into the local tier"""
+        generation = self.local.get(key)
+        if generation is not None:
+            return generation
+
+        invalidations = self._invalidations
+        generation = await self.remote.get_generation(key)
+        if invalidations == self._invalidations:
+            self.local.set(key, generation)
+        return generation
+
+    async def bump_generations(self, keys: list[str]) -> None:
+        """Advance generation counters in Redis and drop them from every replica's local tier"""
+        await self.remote.bump_generations(keys)
+        await self._invalidate({"keys": keys})
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        """Take a short-lived lock in Redis"""
+        return await self.remote.acquire_lock(key, ttl)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock taken with acquire_lock"""
+        await self.remote.release_lock(key, token)
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters of the local tier and Redis"""
+        return {"local": self.local.stats(), **self.remote.stats()}
+
+    async def _invalidate(self, message: dict):
+        """Apply an invalidation locally and publish it to the other replicas"""
+        self._apply(message)
+        if not self.remote.redis_client:
+            return
+
+        try:
+            await self.remote.redis_client.publish(self.channel, json.dumps(message))
+        except redis.RedisError as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
+
+    def _apply(self, message: dict):
+        """Drop the local entries an invalidation message covers"""
+        self._invalidations += 1
+        if message.get("clear"):
+            self.local.clear()
+        for key in message.get("keys", []):
+            self.local.delete(key)
+        if message.get("pattern"):
+            self.local.delete_matching(lambda key: fnmatchcase(key, message["pattern"]))
+
+    async def _listen(self):
+        """Apply invalidations published by any replica, resubscribing after errors"""
+        while True:
+            pubsub = self.remote.redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Invalidations published while not subscribed are lost
+                self._apply({"clear": True})
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._apply(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except (redis.RedisError, ValueError) as e:
+                logger.error(f"Error listening for cache invalidations: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+tiered_cache_service = TieredCacheService(
+    cache_service,
+    TTLCache(maxsize=settings.local_cache_size, ttl=settings.local_cache_ttl),
+    settings.cache_invalidation_channel,
+)
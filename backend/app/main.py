@@ -2,12 +2,13 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from app.api.routes import health_router, user_router, auth_router
+from app.api.routes import health_router, user_router, auth_router, metrics_router
 from app.api.routes.efficiency.efficiency import router as efficiency_router
 
 from app.infrastructure.logging import configure_logging, get_logger
 from app.infrastructure.database import database
-from app.infrastructure.cache import cache_service
+from app.infrastructure.tiered_cache import tiered_cache_service
+from app.infrastructure.executor import calculation_executor
 
 
 logger = get_logger(__name__)
@@ -25,14 +26,20 @@ async def lifespan(app: FastAPI):
     await database.connect()
     logger.info("Connected to database")
     
-    await cache_service.connect()
+    await tiered_cache_service.connect()
     logger.info("Connected to cache")
     
+    calculation_executor.start()
+    logger.info("Started calculation executor")
+    
     yield
     
     logger.info("Shutting down application")
     
-    await cache_service.disconnect()
+    calculation_executor.shutdown()
+    logger.info("Stopped calculation executor")
+    
+    await tiered_cache_service.disconnect()
     logger.info("Disconnected from cache")
     
     await database.disconnect()
@@ -54,6 +61,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.include_router(health_router, prefix=API_PREFIX)
+app.include_router(metrics_router, prefix=API_PREFIX)
 app.include_router(user_router, prefix=API_PREFIX)
 app.include_router(auth_router, prefix=API_PREFIX)
 app.include_router(efficiency_router, prefix=API_PREFIX)
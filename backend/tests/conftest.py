@@ -0,0 +1,119 @@
+"""Fixtures wiring the repository and service to the in-memory fakes"""
+
+import pytest
+
+from app.application.services.efficiency_service import EfficiencyService
+from app.domain.entities.efficiency import (
+    EfficiencyCalculation,
+    EfficiencySummary,
+    PeriodEfficiencyMetrics,
+)
+from app.infrastructure import backfill_checkpoints
+from app.infrastructure.backfill_checkpoints import BackfillCheckpoints
+from app.infrastructure.repositories.efficiency_repository import (
+    MongodbEfficiencyRepository,
+)
+from tests.fakes import FakeCollection
+
+
+@pytest.fixture(autouse=True)
+def clear_checkpoint_caches():
+    """Forget the completion checks and marks cached in-process by other tests"""
+    backfill_checkpoints._completion_cache.clear()
+    backfill_checkpoints._recorded_marks.clear()
+    yield
+    backfill_checkpoints._completion_cache.clear()
+    backfill_checkpoints._recorded_marks.clear()
+
+
+@pytest.fixture
+def make_checkpoints():
+    """Checkpoints over the given documents, plus completed ones for the given names"""
+
+    def make(completed=(), documents=()):
+        return BackfillCheckpoints(
+            FakeCollection(
+                [
+                    *documents,
+                    *(
+                        {"_id": name, "completed_at": "2025-01-01"}
+                        for name in completed
+                    ),
+                ]
+            )
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_repository(make_checkpoints):
+    """Repository over fake collections; pass any collection to inspect it afterwards"""
+
+    def make(completed=(), checkpoint_documents=(), **collections):
+        return MongodbEfficiencyRepository(
+            collection=collections.get("collection", FakeCollection()),
+            summaries_collection=collections.get("summaries", FakeCollection()),
+            period_metrics_collection=collections.get(
+                "period_metrics", FakeCollection()
+            ),
+            rollups_collection=collections.get("rollups", FakeCollection()),
+            sketches_collection=collections.get("sketches", FakeCollection()),
+            checkpoints=make_checkpoints(completed, checkpoint_documents),
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_service():
+    """Efficiency service over a cache fake, with the given soft expiry"""
+
+    def make(cache, efficiency_repository=None, single_flight=None, soft_ttl=60):
+        service = EfficiencyService(
+            efficiency_repository=efficiency_repository,
+            cache_service=cache,
+            single_flight=single_flight,
+        )
+        service._cache_soft_ttl = soft_ttl
+        return service
+
+    return make
+
+
+@pytest.fixture
+def make_calculation():
+    """Unsaved calculation of a building with one period"""
+
+    def make(building_id):
+        period = PeriodEfficiencyMetrics(
+            period="summer",
+            time_range="2024-06-01/2024-08-31",
+            days=["mon"],
+            electric_savings_kwh=10,
+            gas_savings_therms=1,
+            electric_cost_savings=2,
+            gas_cost_savings=1,
+            total_cost_savings=3,
+            electric_efficiency_improvement=10,
+            gas_efficiency_improvement=5,
+            overall_efficiency_improvement=8,
+        )
+        return EfficiencyCalculation(
+            building_id=building_id,
+            measure_name="LED",
+            periods=[period],
+            summary=EfficiencySummary(
+                total_electric_savings_kwh=10,
+                total_gas_savings_therms=1,
+                total_electric_cost_savings=2,
+                total_gas_cost_savings=1,
+                total_cost_savings=3,
+                average_electric_efficiency_improvement=10,
+                average_gas_efficiency_improvement=5,
+                overall_efficiency_improvement=8,
+                performance_grade="C",
+            ),
+        )
+
+    return make
@@ -0,0 +1,208 @@
+"""Minimal in-memory stand-ins for the Mongo collections and cache used in tests"""
+
+import copy
+import operator
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+COMPARISONS = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+
+class FakeCollection:
+    """Exact-match, $in and range queries, inserts, $set/$inc/$min upserts and deletes
+
+    Dotted field paths address nested documents, and a missing field matches None,
+    as in MongoDB.
+    """
+
+    def __init__(self, documents=None, name="fake"):
+        self.documents = list(documents or [])
+        self.name = name
+
+    @staticmethod
+    def _get(document, path):
+        for field in path.split("."):
+            if not isinstance(document, dict):
+                return None
+            document = document.get(field)
+        return document
+
+    @staticmethod
+    def _set(document, path, value):
+        *parents, field = path.split(".")
+        for parent in parents:
+            document = document.setdefault(parent, {})
+        document[field] = value
+
+    def _matches(self, document, query):
+        for path, condition in query.items():
+            value = self._get(document, path)
+            if isinstance(condition, dict) and "$in" in condition:
+                if value not in condition["$in"]:
+                    return False
+            elif isinstance(condition, dict) and set(condition) <= set(COMPARISONS):
+                if value is None or not all(
+                    COMPARISONS[name](value, bound) for name, bound in condition.items()
+                ):
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    async def find_one(self, query=None, projection=None, **kwargs):
+        for document in self.documents:
+            if self._matches(document, query or {}):
+                return copy.deepcopy(document)
+        return None
+
+    def find(self, query=None, projection=None, **kwargs):
+        return FakeCursor(
+            [copy.deepcopy(d) for d in self.documents if self._matches(d, query or {})]
+        )
+
+    async def insert_one(self, document):
+        document.setdefault("_id", ObjectId())
+        self.documents.append(copy.deepcopy(document))
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def insert_many(self, documents, ordered=True):
+        for document in documents:
+            await self.insert_one(document)
+
+    async def estimated_document_count(self):
+        return len(self.documents)
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.documents if self._matches(d, query))
+
+    async def update_one(self, query, update, upsert=False):
+        document = next((d for d in self.documents if self._matches(d, query)), None)
+        if document is None:
+            if not upsert:
+                return SimpleNamespace(modified_count=0)
+            document = {path: value for path, value in query.items() if "." not in path}
+            self.documents.append(document)
+        for path, value in update.get("$set", {}).items():
+            self._set(document, path, value)
+        for path, amount in update.get("$inc", {}).items():
+            self._set(document, path, (self._get(document, path) or 0) + amount)
+        for path, value in update.get("$min", {}).items():
+            current = self._get(document, path)
+            self._set(document, path, value if current is None else min(current, value))
+        return SimpleNamespace(modified_count=1)
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            await self.update_one(
+                operation._filter, operation._doc, upsert=operation._upsert
+            )
+
+    async def delete_one(self, query):
+        self.documents = [d for d in self.documents if not self._matches(d, query)]
+
+
+class FakeCursor:
+    """Async iteration over the documents a find matched"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, field, direction=1):
+        self.documents.sort(key=lambda d: d[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.documents[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeRedis:
+    """Sorted sets with the pipeline interface of redis.asyncio"""
+
+    def __init__(self):
+        self.sorted_sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.sorted_sets.get(key, {}))
+
+    async def zrevrank(self, key, member):
+        members = sorted(
+            self.sorted_sets.get(key, {}).items(), key=lambda item: -item[1]
+        )
+        ranks = {name: index for index, (name, _) in enumerate(members)}
+        return ranks.get(member)
+
+    async def zscore(self, key, member):
+        return self.sorted_sets.get(key, {}).get(member)
+
+
+class FakePipeline:
+    """Queues FakeRedis calls and runs them on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.calls.append(method(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+class FakeCache:
+    """Cache service stand-in exposing a redis_client"""
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client
+
+
+class MemoryCacheService:
+    """Dict-backed cache service recording lock requests"""
+
+    def __init__(self):
+        self.values = {}
+        self.lock_requests = []
+
+    async def get_object(self, key, decode):
+        cached_data = self.values.get(key)
+        return decode(cached_data) if cached_data else None
+
+    async def set_object(self, key, value, encode, ttl=60, tags=None):
+        self.values[key] = encode(value)
+
+    async def acquire_lock(self, key, ttl):
+        self.lock_requests.append(key)
+        return "token"
+
+    async def release_lock(self, key, token):
+        pass
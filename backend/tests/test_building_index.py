@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+import redis.asyncio as redis
+
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_INDEX_REBUILD,
+    BackfillCheckpoints,
+)
+from app.infrastructure.building_index import RedisBuildingIndex
+from app.infrastructure.cache import RedisCacheService
+from tests.fakes import FakeCollection
+
+redislite = pytest.importorskip("redislite")
+
+
+@pytest.fixture
+def server():
+    server = redislite.Redis()
+    yield server
+    server.shutdown()
+
+
+def run(server, scenario):
+    async def main():
+        cache = RedisCacheService()
+        cache.redis_client = redis.Redis(unix_socket_path=server.socket_file)
+        checkpoints = BackfillCheckpoints(FakeCollection())
+        try:
+            return await scenario(RedisBuildingIndex(cache, checkpoints=checkpoints))
+        finally:
+            await cache.redis_client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_index_created_by_writes_is_not_searched_before_a_rebuild(server):
+    async def scenario(index):
+        await index.add(["Tower-1"])
+        return await index.search("tow")
+
+    assert run(server, scenario) is None
+
+
+def test_rebuilt_index_answers_prefix_searches(server):
+    async def scenario(index):
+        async def batches():
+            yield ["Tower-1", "tower-2", "Annex"]
+
+        await index.rebuild(batches())
+        await index.checkpoints.complete(BUILDING_INDEX_REBUILD)
+        return await index.search("TOW")
+
+    assert run(server, scenario) == ["Tower-1", "tower-2"]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_LEADERBOARD_REBUILD,
+    BUILDING_SUMMARIES_BACKFILL,
+)
+from app.infrastructure.building_leaderboard import RedisBuildingLeaderboard
+from tests.fakes import FakeCache, FakeRedis
+
+SCORES = {
+    "b1": {"total_cost_savings": 10.0, "average_efficiency_improvement": 1.0},
+    "b2": {"total_cost_savings": 30.0, "average_efficiency_improvement": 2.0},
+}
+
+
+@pytest.fixture
+def make_leaderboard(make_checkpoints):
+    def make(
+        redis_client=None,
+        completed=(BUILDING_SUMMARIES_BACKFILL, BUILDING_LEADERBOARD_REBUILD),
+    ):
+        return RedisBuildingLeaderboard(
+            FakeCache(redis_client), checkpoints=make_checkpoints(completed)
+        )
+
+    return make
+
+
+def test_get_rank_reads_the_sorted_set(make_leaderboard):
+    redis = FakeRedis()
+    leaderboard = make_leaderboard(redis)
+    asyncio.run(leaderboard.update(SCORES))
+
+    rank = asyncio.run(leaderboard.get_rank("total_cost_savings", "b1"))
+
+    assert rank is not None
+    assert (rank.rank, rank.score, rank.total_buildings) == (2, 10.0, 2)
+
+
+def test_get_rank_of_missing_building_falls_back(make_leaderboard):
+    redis = FakeRedis()
+    leaderboard = make_leaderboard(redis)
+    asyncio.run(
+        leaderboard.update(
+            {"b1": {"total_cost_savings": 10.0, "average_efficiency_improvement": 1.0}}
+        )
+    )
+
+    assert asyncio.run(leaderboard.get_rank("total_cost_savings", "b-new")) is None
+
+
+def test_rebuild_without_redis_returns_none(make_leaderboard):
+    async def batches():
+        yield {
+            "b1": {"total_cost_savings": 10.0, "average_efficiency_improvement": 1.0}
+        }
+
+    assert asyncio.run(make_leaderboard().rebuild(batches())) is None
+
+
+@pytest.mark.parametrize(
+    "completed", [(), (BUILDING_LEADERBOARD_REBUILD,), (BUILDING_SUMMARIES_BACKFILL,)]
+)
+def test_leaderboard_updated_by_writes_is_not_served_before_a_rebuild(
+    make_leaderboard, completed
+):
+    redis = FakeRedis()
+    leaderboard = make_leaderboard(redis, completed)
+    asyncio.run(leaderboard.update(SCORES))
+
+    assert asyncio.run(leaderboard.get_rank("total_cost_savings", "b1")) is None
+    assert asyncio.run(leaderboard.get_leaderboard("total_cost_savings")) is None
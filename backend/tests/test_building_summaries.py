@@ -0,0 +1,68 @@
+import asyncio
+
+from app.infrastructure.backfill_checkpoints import (
+    BUILDING_SUMMARIES_BACKFILL,
+    BackfillCheckpoints,
+)
+from tests.fakes import FakeCollection
+
+
+def test_summary_is_aggregated_until_backfill_completes(monkeypatch, make_repository):
+    # A partial summary written by the first write after deploy
+    partial = {"building_id": "b1", "total_calculations": 1}
+    repository = make_repository(summaries=FakeCollection([partial]))
+
+    async def aggregate(building_id):
+        return "aggregated"
+
+    monkeypatch.setattr(repository, "_aggregate_building_summary", aggregate)
+
+    assert asyncio.run(repository.get_building_summary("b1")) == "aggregated"
+
+
+def test_building_list_is_aggregated_until_backfill_completes(
+    monkeypatch, make_repository
+):
+    repository = make_repository(
+        checkpoint_documents=[
+            {"_id": BUILDING_SUMMARIES_BACKFILL, "last_building_id": "b1"}
+        ],
+        summaries=FakeCollection([{"building_id": "b1"}]),
+    )
+
+    async def aggregate(*args):
+        return ["aggregated"], 1
+
+    monkeypatch.setattr(repository, "_aggregate_all_buildings_summary", aggregate)
+
+    assert asyncio.run(repository.get_all_buildings_summary()) == (["aggregated"], 1)
+
+
+def test_summaries_are_served_once_backfill_completes(monkeypatch, make_repository):
+    repository = make_repository()
+
+    async def aggregate(building_id):
+        raise AssertionError("should read the summary documents")
+
+    monkeypatch.setattr(repository, "_aggregate_building_summary", aggregate)
+    asyncio.run(repository.checkpoints.complete(BUILDING_SUMMARIES_BACKFILL))
+
+    assert asyncio.run(repository.get_building_summary("missing")) is None
+
+
+def test_checkpoint_progress_round_trip():
+    checkpoints = BackfillCheckpoints(FakeCollection())
+
+    async def scenario():
+        await checkpoints.save("job", last_id="b9", processed=9)
+        progress = await checkpoints.load("job")
+        await checkpoints.complete("job")
+        completed = await checkpoints.is_completed("job")
+        await checkpoints.reset("job")
+        return progress, completed, await checkpoints.is_completed("job")
+
+    progress, completed, completed_after_reset = asyncio.run(scenario())
+
+    assert (progress["last_id"], progress["processed"]) == ("b9", 9)
+    assert completed
+    assert not completed_after_reset
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+import redis.asyncio as redis
+
+from app.infrastructure.cache import RedisCacheService
+
+redislite = pytest.importorskip("redislite")
+
+
+@pytest.fixture
+def server():
+    server = redislite.Redis()
+    yield server
+    server.shutdown()
+
+
+def run(server, scenario):
+    async def main():
+        cache = RedisCacheService()
+        cache.redis_client = redis.Redis(unix_socket_path=server.socket_file)
+        try:
+            return await scenario(cache)
+        finally:
+            await cache.redis_client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_expired_keys_are_pruned_from_tags(server):
+    async def scenario(cache):
+        await cache.set("efficiency:summary:b1:g1", "old", ttl=60, tags=["family"])
+        # Backdate the first entry as if it had expired
+        await cache.redis_client.zadd(
+            "tagsets:family", {"efficiency:summary:b1:g1": time.time() - 1}
+        )
+        await cache.set("efficiency:summary:b1:g2", "new", ttl=60, tags=["family"])
+        return await cache.redis_client.zrange("tagsets:family", 0, -1)
+
+    assert run(server, scenario) == [b"efficiency:summary:b1:g2"]
+
+
+def test_delete_tags_removes_tagged_keys(server):
+    async def scenario(cache):
+        await cache.set("a", "1", ttl=60, tags=["family", "building"])
+        await cache.set("b", "2", ttl=60, tags=["family"])
+        await cache.set("c", "3", ttl=60)
+        tracked = await cache.delete_tags(["family", "missing"])
+        keys = sorted(await cache.redis_client.keys("*"))
+        return tracked, keys
+
+    tracked, keys = run(server, scenario)
+    assert tracked == 1
+    assert keys == [b"c", b"tagsets:building"]
@@ -0,0 +1,133 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_efficiency_service
+from app.api.middleware.auth import get_current_user
+from app.api.pagination import encode_cursor
+from app.domain.entities.auth import AuthUser
+from app.domain.entities.efficiency import EfficiencyCalculation, EfficiencySummary
+from app.main import app
+
+CREATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_calculation(index: int) -> EfficiencyCalculation:
+    return EfficiencyCalculation(
+        id=f"{index:024x}",
+        building_id="b1",
+        measure_name="LED",
+        periods=[],
+        summary=EfficiencySummary(
+            total_electric_savings_kwh=1,
+            total_gas_savings_therms=1,
+            total_electric_cost_savings=1,
+            total_gas_cost_savings=1,
+            total_cost_savings=2,
+            average_electric_efficiency_improvement=10,
+            average_gas_efficiency_improvement=10,
+            overall_efficiency_improvement=10,
+            performance_grade="C",
+        ),
+        created_at=CREATED_AT,
+    )
+
+
+class FakeEfficiencyService:
+    def __init__(self, fail_after=None, history_size=3):
+        self.fail_after = fail_after
+        self.history = [make_calculation(index) for index in range(history_size)]
+
+    async def get_building_calculations(self, building_id, limit, *args):
+        return self.history if limit is None else self.history[:limit]
+
+    async def count_building_calculations(self, *args):
+        return len(self.history)
+
+    def stream_building_calculations(self, *args):
+        async def stream():
+            for index in range(3):
+                if index == self.fail_after:
+                    raise RuntimeError("connection reset")
+                yield make_calculation(index)
+
+        return stream()
+
+
+@pytest.fixture
+def client_for():
+    def make(service):
+        app.dependency_overrides[get_current_user] = lambda: AuthUser(
+            id="u1", email="user@example.com", password_hash="x"
+        )
+        app.dependency_overrides[get_efficiency_service] = lambda: service
+        return TestClient(app)
+
+    yield make
+    app.dependency_overrides.clear()
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_streams_every_calculation(client_for):
+    client = client_for(FakeEfficiencyService())
+
+    response = client.get("/api/v1/efficiency/building/b1?format=ndjson")
+
+    assert response.status_code == 200
+    assert [line["id"] for line in ndjson_lines(response)] == [
+        make_calculation(index).id for index in range(3)
+    ]
+
+
+def test_stream_failing_midway_ends_with_error_line(client_for):
+    client = client_for(FakeEfficiencyService(fail_after=2))
+
+    lines = ndjson_lines(client.get("/api/v1/efficiency/building/b1?format=ndjson"))
+
+    assert len(lines) == 3
+    assert "connection reset" in lines[-1]["error"]
+
+
+def test_stream_failing_before_first_row_is_a_500(client_for):
+    client = client_for(FakeEfficiencyService(fail_after=0))
+
+    response = client.get("/api/v1/efficiency/building/b1?format=ndjson")
+
+    assert response.status_code == 500
+
+
+@pytest.mark.parametrize("data_format", ["json", "ndjson"])
+def test_cursor_with_invalid_tie_breaker_is_a_400(client_for, data_format):
+    client = client_for(FakeEfficiencyService())
+    cursor = encode_cursor(CREATED_AT, "not-an-object-id")
+
+    response = client.get(
+        f"/api/v1/efficiency/building/b1?format={data_format}&cursor={cursor}"
+    )
+
+    assert response.status_code == 400
+
+
+def test_history_without_paging_returns_everything(client_for):
+    client = client_for(FakeEfficiencyService(history_size=150))
+
+    body = client.get("/api/v1/efficiency/building/b1").json()
+
+    assert len(body["calculations"]) == 150
+    assert body["total_count"] == 150
+    assert body["next_cursor"] is None
+
+
+def test_history_with_limit_returns_a_page_and_the_real_total(client_for):
+    client = client_for(FakeEfficiencyService(history_size=150))
+
+    body = client.get("/api/v1/efficiency/building/b1?limit=2").json()
+
+    assert len(body["calculations"]) == 2
+    assert body["total_count"] == 150
+    assert body["next_cursor"] is not None
@@ -0,0 +1,73 @@
+import asyncio
+import copy
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from tests.fakes import FakeCollection
+
+
+class RejectingCollection(FakeCollection):
+    """Rejects the documents of some buildings in insert_many, as a validator would"""
+
+    def __init__(self, rejected_building_ids):
+        super().__init__()
+        self.rejected_building_ids = rejected_building_ids
+
+    async def insert_many(self, documents, ordered=True):
+        errors = []
+        for index, document in enumerate(documents):
+            # Like pymongo, ids are assigned client-side to every document
+            document["_id"] = ObjectId()
+            if document["building_id"] in self.rejected_building_ids:
+                errors.append({"index": index, "errmsg": "Document failed validation"})
+            else:
+                self.documents.append(copy.deepcopy(document))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+def test_partial_failure_updates_derived_data_for_inserted_rows_only(
+    monkeypatch, make_repository, make_calculation
+):
+    repository = make_repository(collection=RejectingCollection({"b2"}))
+    updated = {}
+
+    def record(name, building_ids):
+        async def update(arg):
+            updated[name] = building_ids(arg)
+
+        monkeypatch.setattr(repository, name, update)
+
+    def from_documents(calculation_dicts):
+        return [
+            calculation_dict["building_id"] for calculation_dict in calculation_dicts
+        ]
+
+    record("_update_building_summaries", from_documents)
+    record("_update_portfolio_rollups", from_documents)
+    record("_update_quantile_sketches", list)
+
+    results = asyncio.run(
+        repository.create_many([make_calculation(b) for b in ("b1", "b2", "b3")])
+    )
+
+    assert [result.error for result in results] == [
+        None,
+        "Document failed validation",
+        None,
+    ]
+    assert [result.calculation is not None for result in results] == [
+        True,
+        False,
+        True,
+    ]
+    assert updated == {
+        "_update_building_summaries": ["b1", "b3"],
+        "_update_portfolio_rollups": ["b1", "b3"],
+        "_update_quantile_sketches": ["b1", "b3"],
+    }
+    assert [
+        metric_doc["meta"]["building_id"]
+        for metric_doc in repository.period_metrics.documents
+    ] == ["b1", "b3"]
@@ -0,0 +1,120 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.application.services import efficiency_engine
+from app.application.services.efficiency_service import EfficiencyService
+from app.domain.entities.efficiency import PeriodData
+
+
+def make_periods(rng: random.Random, count: int) -> list[PeriodData]:
+    return [
+        PeriodData(
+            period=f"period_{i}",
+            time_range="08:00-18:00",
+            days=["monday"],
+            baseline_electric_kwh=rng.uniform(1, 10_000),
+            current_electric_kwh=rng.uniform(1, 10_000),
+            baseline_gas_therms=rng.uniform(1, 1_000),
+            current_gas_therms=rng.uniform(1, 1_000),
+            electric_rate=rng.uniform(0.01, 0.5),
+            gas_rate=rng.uniform(0.1, 3),
+        )
+        for i in range(count)
+    ]
+
+
+def python_results(batches):
+    results = []
+    for periods in batches:
+        metrics = EfficiencyService._calculate_period_metrics(periods)
+        results.append((metrics, EfficiencyService._calculate_summary(metrics)))
+    return results
+
+
+@pytest.mark.parametrize("sizes", [[1], [3, 1, 7], [200], [2] * 300, [1, 500, 4]])
+def test_calculate_batch_matches_python_path_exactly(sizes):
+    rng = random.Random(sum(sizes))
+    batches = [make_periods(rng, size) for size in sizes]
+
+    assert efficiency_engine.calculate_batch(batches) == python_results(batches)
+
+
+def test_calculate_batch_rejects_empty_calculation():
+    with pytest.raises(ValueError):
+        efficiency_engine.calculate_batch([make_periods(random.Random(0), 2), []])
+
+
+def test_python_sum_matches_builtin_sum():
+    rng = random.Random(1)
+    rows = [[rng.uniform(-1e12, 1e12) for _ in range(50)] for _ in range(20)]
+
+    assert efficiency_engine.python_sum(np.array(rows)).tolist() == [
+        sum(row) for row in rows
+    ]
+
+
+def test_tariff_sweep_prices_every_rate_pair():
+    electric_savings = [10.0, 20.0]
+    gas_savings = [1.0, 3.0]
+    electric_rates = efficiency_engine.rate_grid(0.1, 0.2, 2)
+    gas_rates = efficiency_engine.rate_grid(1.0, 2.0, 3)
+
+    grid = efficiency_engine.tariff_sweep(
+        electric_savings, gas_savings, electric_rates, gas_rates
+    )
+
+    assert grid.shape == (2, 3)
+    assert grid[1, 2] == pytest.approx(30 * 0.2 + 4 * 2.0)
+
+
+def reference_lttb(x, y, max_points):
+    """Textbook LTTB with the same bucket edges, one triangle at a time"""
+    n = len(x)
+    edges = [int(v) for v in np.floor(np.linspace(1, n - 1, max_points - 1))]
+    selected = [0]
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = end, edges[bucket + 2]
+            avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        ax, ay = x[selected[-1]], y[selected[-1]]
+        areas = [
+            abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) * (avg_y - ay))
+            for i in range(start, end)
+        ]
+        selected.append(start + areas.index(max(areas)))
+    selected.append(n - 1)
+    return selected
+
+
+@pytest.mark.parametrize("n,max_points", [(100, 10), (1000, 37), (5000, 500)])
+def test_lttb_matches_reference(n, max_points):
+    rng = random.Random(n)
+    x = [float(i) for i in range(n)]
+    y = [rng.gauss(0, 1) for _ in range(n)]
+
+    kept = efficiency_engine.lttb_indices(x, y, max_points)
+
+    assert kept.tolist() == reference_lttb(x, y, max_points)
+
+
+def test_lttb_keeps_spikes_and_endpoints():
+    y = [0.0] * 1000
+    y[437] = 50.0
+    kept = efficiency_engine.lttb_indices([float(i) for i in range(1000)], y, 20)
+
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 437 in kept.tolist()
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_returns_short_series_unchanged():
+    assert efficiency_engine.lttb_indices(
+        [0.0, 1.0, 2.0], [1.0, 2.0, 3.0], 10
+    ).tolist() == [0, 1, 2]
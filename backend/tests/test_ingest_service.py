@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from app.application.services.ingest_service import IngestService
+from app.domain.entities.efficiency import BatchItemResult
+from app.infrastructure.config import settings
+
+HEADER = (
+    "building_id,measure_name,period,time_range,days,current_electric_kwh,"
+    "current_gas_therms,baseline_electric_kwh,baseline_gas_therms,electric_rate,gas_rate"
+)
+
+
+def csv_row(building_id: str, period: str = "business_hours") -> str:
+    return f"{building_id},LED,{period},08:00-18:00,Mon|Tue,80,8,100,10,0.1,1.0"
+
+
+class FakeEfficiencyService:
+    def __init__(self):
+        self.requests = []
+
+    async def calculate_efficiency_batch(self, requests):
+        self.requests.extend(requests)
+        return [BatchItemResult(index=i) for i in range(len(requests))]
+
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=60, tags=None):
+        self.values[key] = value
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def run_ingest(body: str, data_format: str = "csv", chunk_size: int = 7):
+    efficiency_service = FakeEfficiencyService()
+    service = IngestService(efficiency_service, FakeCache())
+    report = asyncio.run(
+        service.ingest(chunked(body.encode(), chunk_size), data_format, "job", "user-1")
+    )
+    return report, efficiency_service.requests, service
+
+
+def test_groups_consecutive_rows_into_calculations():
+    body = "\n".join([HEADER, csv_row("b1"), csv_row("b1", "weekend"), csv_row("b2")])
+
+    report, requests, _ = run_ingest(body)
+
+    assert report.status == "completed"
+    assert report.rows_read == 3
+    assert [(r.building_id, len(r.periods)) for r in requests] == [("b1", 2), ("b2", 1)]
+
+
+def test_strips_bom_and_crlf():
+    body = "﻿" + "\r\n".join([HEADER, csv_row("b1")]) + "\r\n"
+
+    report, requests, _ = run_ingest(body, chunk_size=2)
+
+    assert report.rows_rejected == 0
+    assert requests[0].building_id == "b1"
+
+
+def test_quoted_field_may_span_lines():
+    row = csv_row("b1").replace("08:00-18:00", '"08:00-\n18:00"')
+    body = "\n".join([HEADER, row, csv_row("b2")])
+
+    report, requests, _ = run_ingest(body)
+
+    assert report.rows_rejected == 0
+    assert requests[0].periods[0].time_range == "08:00-\n18:00"
+    assert requests[1].building_id == "b2"
+
+
+def test_rejects_lines_over_the_byte_limit(monkeypatch):
+    monkeypatch.setattr(settings, "ingest_max_line_bytes", 160)
+    # Multi-byte measure name: short in characters, long in bytes
+    long_row = csv_row("b1").replace("LED", "é" * 60)
+    body = "\n".join([HEADER, long_row, csv_row("b2")])
+
+    report, requests, _ = run_ingest(body, chunk_size=4096)
+
+    assert report.rows_rejected == 1
+    assert report.errors[0].line == 2
+    assert [r.building_id for r in requests] == ["b2"]
+
+
+def test_progress_is_scoped_to_owner():
+    body = "\n".join([HEADER, csv_row("b1")])
+    _, _, service = run_ingest(body)
+
+    assert asyncio.run(service.get_progress("job", "user-1")).status == "completed"
+    assert asyncio.run(service.get_progress("job", "user-2")) is None
+
+
+@pytest.mark.parametrize("line", ["{not json", "[1, 2]"])
+def test_ndjson_rejects_invalid_rows(line):
+    valid = json.dumps(
+        {
+            "building_id": "b1",
+            "measure_name": "LED",
+            "period": "p",
+            "time_range": "08:00-18:00",
+            "days": "Mon",
+            "current_electric_kwh": 1,
+            "current_gas_therms": 1,
+            "baseline_electric_kwh": 2,
+            "baseline_gas_therms": 2,
+            "electric_rate": 0.1,
+            "gas_rate": 1,
+        }
+    )
+
+    report, requests, _ = run_ingest(f"{line}\n{valid}", "ndjson")
+
+    assert report.rows_rejected == 1
+    assert len(requests) == 1
@@ -0,0 +1,37 @@
+from datetime import UTC, datetime
+
+import pytest
+from bson import ObjectId
+
+from app.api.pagination import decode_cursor, decode_object_id_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=UTC)
+
+    assert decode_cursor(encode_cursor(created_at, "building-1")) == (
+        created_at,
+        "building-1",
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "not-base64!", "bnVsbA", "WyJub3QgYSBkYXRlIiwiYSJd"]
+)
+def test_malformed_cursor_is_a_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_object_id_cursor_accepts_object_ids():
+    object_id = str(ObjectId())
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+
+    assert decode_object_id_cursor(encode_cursor(created_at, object_id))[1] == object_id
+
+
+def test_object_id_cursor_rejects_other_tie_breakers():
+    cursor = encode_cursor(datetime(2025, 1, 1, tzinfo=UTC), "building-1")
+
+    with pytest.raises(ValueError):
+        decode_object_id_cursor(cursor)
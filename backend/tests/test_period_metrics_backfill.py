@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.commands import backfill_period_metrics
+
+
+@pytest.fixture
+def repository(monkeypatch, make_repository):
+    repository = make_repository()
+
+    async def skip(*args):
+        pass
+
+    for name in (
+        "_update_building_summaries",
+        "_update_quantile_sketches",
+        "_update_portfolio_rollups",
+    ):
+        monkeypatch.setattr(repository, name, skip)
+    monkeypatch.setattr(
+        backfill_period_metrics, "MongodbEfficiencyRepository", lambda: repository
+    )
+    monkeypatch.setattr(
+        backfill_period_metrics, "BackfillCheckpoints", lambda: repository.checkpoints
+    )
+    return repository
+
+
+def calculation_ids(repository):
+    return sorted(str(d["calculation_id"]) for d in repository.period_metrics.documents)
+
+
+def test_backfill_after_live_writes_copies_each_calculation_once(
+    repository, make_calculation
+):
+    # Written before deploy: no period metrics yet
+    old = {**make_calculation("b1").model_dump(exclude={"id"}), "_id": ObjectId()}
+    old["created_at"] = old["_id"].generation_time
+    repository.collection.documents.append(old)
+
+    async def scenario():
+        await repository.create(make_calculation("b2"))
+        await repository.create(make_calculation("b3"))
+        await backfill_period_metrics.backfill(batch_size=1, restart=False)
+
+    asyncio.run(scenario())
+
+    assert calculation_ids(repository) == sorted(
+        str(d["_id"]) for d in repository.collection.documents
+    )
+
+
+def test_backfill_without_live_writes_copies_everything(repository, make_calculation):
+    for building_id in ("b1", "b2"):
+        calculation = make_calculation(building_id).model_dump(exclude={"id"})
+        calculation["_id"] = ObjectId()
+        calculation["created_at"] = calculation["_id"].generation_time
+        repository.collection.documents.append(calculation)
+
+    asyncio.run(backfill_period_metrics.backfill(batch_size=10, restart=False))
+
+    assert len(calculation_ids(repository)) == 2
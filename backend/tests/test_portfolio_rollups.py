@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.backfill_checkpoints import PORTFOLIO_ROLLUPS_RECONCILE
+from tests.fakes import FakeCollection
+
+# Rollups incremented by the first writes after deploy, before any reconcile
+ROLLUPS = [
+    {"_id": "portfolio", "kind": "portfolio", "key": None, "count": 1},
+    {"_id": "measure:LED", "kind": "measure", "key": "LED", "count": 1},
+]
+
+
+@pytest.fixture
+def make_rollups_repository(make_repository):
+    def make(completed=()):
+        return make_repository(
+            completed,
+            summaries=FakeCollection([{"building_id": "b1"}]),
+            rollups=FakeCollection(ROLLUPS),
+        )
+
+    return make
+
+
+def test_portfolio_is_aggregated_until_rollups_are_reconciled(
+    monkeypatch, make_rollups_repository
+):
+    repository = make_rollups_repository()
+
+    async def aggregate():
+        return "aggregated"
+
+    monkeypatch.setattr(repository, "_aggregate_portfolio_rollup", aggregate)
+
+    assert asyncio.run(repository.get_portfolio_rollup()) == "aggregated"
+
+
+def test_portfolio_is_read_from_rollups_once_reconciled(
+    monkeypatch, make_rollups_repository
+):
+    repository = make_rollups_repository([PORTFOLIO_ROLLUPS_RECONCILE])
+
+    async def aggregate():
+        raise AssertionError("should read the rollup documents")
+
+    monkeypatch.setattr(repository, "_aggregate_portfolio_rollup", aggregate)
+    portfolio = asyncio.run(repository.get_portfolio_rollup())
+
+    assert portfolio.totals.count == 1
+    assert [rollup.key for rollup in portfolio.by_measure] == ["LED"]
+
+
+def test_measures_are_aggregated_until_rollups_are_reconciled(
+    monkeypatch, make_rollups_repository
+):
+    repository = make_rollups_repository()
+
+    async def aggregate(measure_name):
+        return []
+
+    monkeypatch.setattr(repository, "_aggregate_measure_analytics", aggregate)
+
+    # The partial LED rollup is not served
+    assert asyncio.run(repository.get_measure_analytics()) == []
+
+
+def test_measures_are_read_from_rollups_once_reconciled(
+    monkeypatch, make_rollups_repository
+):
+    repository = make_rollups_repository([PORTFOLIO_ROLLUPS_RECONCILE])
+
+    async def aggregate(measure_name):
+        raise AssertionError("should read the rollup documents")
+
+    monkeypatch.setattr(repository, "_aggregate_measure_analytics", aggregate)
+    analytics = asyncio.run(repository.get_measure_analytics("LED"))
+
+    assert [(measure.measure_name, measure.count) for measure in analytics] == [
+        ("LED", 1)
+    ]
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.domain.entities.quantile_sketch import QuantileSketch
+from tests.fakes import FakeCollection
+
+
+def summary(building_id, total_cost_savings, sum_efficiency_improvement):
+    return {
+        "building_id": building_id,
+        "total_calculations": 1,
+        "total_cost_savings": total_cost_savings,
+        "sum_efficiency_improvement": sum_efficiency_improvement,
+    }
+
+
+def sketch_counts(sketches_collection, metric):
+    document = next(d for d in sketches_collection.documents if d["_id"] == metric)
+    return {
+        bin_index: count for bin_index, count in document["counts"].items() if count
+    }
+
+
+def test_empty_sketch_uses_metric_layout():
+    sketch = QuantileSketch.empty("total_cost_savings")
+
+    assert (sketch.low, sketch.high, sketch.bins, sketch.log_scale) == (
+        -7.0,
+        7.0,
+        1400,
+        True,
+    )
+
+
+def test_percentile_and_quantile():
+    sketch = QuantileSketch.empty("average_efficiency_improvement")
+    for value in range(100):
+        index = sketch.bin_index(float(value))
+        sketch.counts[index] = sketch.counts.get(index, 0) + 1
+
+    # Half of the value's own bin counts as below
+    assert sketch.percentile(50.0) == pytest.approx(50.5)
+    # The 50th value (49) is interpolated to the top of its 0.25 wide bin
+    assert sketch.quantile(0.5) == pytest.approx(49.25)
+
+
+def test_update_moves_building_between_bins(make_repository):
+    summaries = FakeCollection([summary("b1", 100.0, 10.0)])
+    sketches = FakeCollection()
+    repository = make_repository(summaries=summaries, sketches=sketches)
+    sketch = QuantileSketch.empty("average_efficiency_improvement")
+
+    asyncio.run(repository._update_quantile_sketches(["b1"]))
+    first_bin = sketch.bin_index(10.0)
+    assert sketch_counts(sketches, "average_efficiency_improvement") == {
+        str(first_bin): 1
+    }
+
+    summaries.documents[0]["sum_efficiency_improvement"] = 40.0
+    asyncio.run(repository._update_quantile_sketches(["b1"]))
+
+    counts = sketch_counts(sketches, "average_efficiency_improvement")
+    assert counts == {str(sketch.bin_index(40.0)): 1}
+    assert summaries.documents[0]["sketch_bins"]["average_efficiency_improvement"] == (
+        sketch.bin_index(40.0)
+    )
+
+
+def test_update_that_loses_the_race_is_not_applied_twice(make_repository):
+    class RacingCollection(FakeCollection):
+        """Applies the same move from another writer before the first compare-and-set"""
+
+        raced = False
+
+        async def update_one(self, query, update, upsert=False):
+            if not self.raced:
+                self.raced = True
+                await FakeCollection.update_one(self, {"building_id": "b1"}, update)
+                await repository_sketches.update_one(
+                    {"_id": "average_efficiency_improvement"},
+                    {"$inc": {f"counts.{bins['average_efficiency_improvement']}": 1}},
+                    upsert=True,
+                )
+                await repository_sketches.update_one(
+                    {"_id": "total_cost_savings"},
+                    {"$inc": {f"counts.{bins['total_cost_savings']}": 1}},
+                    upsert=True,
+                )
+            return await FakeCollection.update_one(self, query, update, upsert)
+
+    summaries = RacingCollection([summary("b1", 100.0, 10.0)])
+    repository_sketches = FakeCollection()
+    repository = make_repository(summaries=summaries, sketches=repository_sketches)
+    bins = {
+        metric: QuantileSketch.empty(metric).bin_index(value)
+        for metric, value in [
+            ("average_efficiency_improvement", 10.0),
+            ("total_cost_savings", 100.0),
+        ]
+    }
+
+    asyncio.run(repository._update_quantile_sketches(["b1"]))
+
+    for metric, bin_index in bins.items():
+        assert sketch_counts(repository_sketches, metric) == {str(bin_index): 1}
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_load():
+    single_flight = SingleFlight()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(single_flight.do("key", load) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["value"] * 5
+    assert loads == 1
+    assert single_flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+def test_exception_reaches_every_waiter():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("load failed")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(single_flight.do("key", load) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [str(result) for result in results] == ["load failed"] * 3
+    assert single_flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_load():
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "value"
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(single_flight.do("key", load))
+        waiter = asyncio.ensure_future(single_flight.do("key", load))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        release.set()
+        return await waiter
+
+    assert asyncio.run(scenario()) == "value"
+
+
+def test_finished_call_is_forgotten():
+    single_flight = SingleFlight()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return loads
+
+    async def scenario():
+        return [await single_flight.do("key", load) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [1, 2]
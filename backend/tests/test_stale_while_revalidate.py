@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from app.application.services.efficiency_service import EfficiencyService
+from app.infrastructure.config import settings
+from app.infrastructure.single_flight import SingleFlight
+from tests.fakes import MemoryCacheService
+
+
+def identity(value):
+    return value
+
+
+def test_entry_envelope_round_trip():
+    encoded = EfficiencyService._entry_encoder(identity)(("line one", 12.5))
+    decode = EfficiencyService._entry_decoder(identity)
+
+    assert decode(encoded) == ("line one", 12.5)
+    assert decode(encoded.encode()) == ("line one", 12.5)
+
+
+def test_entry_without_soft_expiry_never_goes_stale(make_service):
+    cache = MemoryCacheService()
+    service = make_service(cache, soft_ttl=0)
+
+    asyncio.run(service._set_cached("key", "value", identity, "b1", "summary"))
+
+    assert cache.values["key"] == "inf\nvalue"
+
+
+def cached_value(service, loader):
+    return service._cached("key", loader, identity, identity, "b1", "summary")
+
+
+def test_fresh_entry_is_served_without_loading(make_service):
+    cache = MemoryCacheService()
+    cache.values["key"] = f"{time.time() + 60!r}\ncached"
+    service = make_service(cache)
+
+    async def loader():
+        raise AssertionError("fresh entries are not reloaded")
+
+    assert asyncio.run(cached_value(service, loader)) == "cached"
+
+
+@pytest.mark.parametrize("lock_enabled", [True, False])
+def test_stale_entry_is_served_while_refreshing(
+    monkeypatch, make_service, lock_enabled
+):
+    monkeypatch.setattr(settings, "cache_lock_enabled", lock_enabled)
+    cache = MemoryCacheService()
+    cache.values["key"] = f"{time.time() - 1!r}\nstale"
+    single_flight = SingleFlight()
+    service = make_service(cache, single_flight=single_flight)
+
+    async def loader():
+        return "fresh"
+
+    async def scenario():
+        value = await cached_value(service, loader)
+        while single_flight.stats()["in_flight"]:
+            await asyncio.sleep(0)
+        return value
+
+    assert asyncio.run(scenario()) == "stale"
+    assert cache.values["key"].endswith("\nfresh")
+    assert cache.lock_requests == (["key"] if lock_enabled else [])
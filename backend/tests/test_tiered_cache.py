@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.cache import RedisCacheService
+from app.infrastructure.config import settings
+from app.infrastructure.memory_cache import TTLCache
+from app.infrastructure.tiered_cache import TieredCacheService
+
+redislite = pytest.importorskip("redislite")
+
+CHANNEL = "cache:invalidations"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = redislite.Redis()
+    monkeypatch.setattr(settings, "redis_url", f"unix://{server.socket_file}")
+    yield server
+    server.shutdown()
+
+
+def run(scenario):
+    """Run a scenario with two replicas subscribed to the invalidation channel"""
+
+    async def main():
+        replicas = []
+        for _ in range(2):
+            remote = RedisCacheService()
+            await remote.connect()
+            replica = TieredCacheService(remote, TTLCache(maxsize=100, ttl=60), CHANNEL)
+            replica._listener = asyncio.create_task(replica._listen())
+            replicas.append(replica)
+        try:
+            while (await remote.redis_client.pubsub_numsub(CHANNEL))[0][1] < 2:
+                await asyncio.sleep(0.01)
+            return await scenario(*replicas)
+        finally:
+            for replica in replicas:
+                replica._listener.cancel()
+                await asyncio.gather(replica._listener, return_exceptions=True)
+                await replica.remote.redis_client.aclose()
+
+    return asyncio.run(main())
+
+
+async def settle(replica, invalidations):
+    """Wait until a replica has applied a number of invalidations"""
+    async with asyncio.timeout(5):
+        while replica._invalidations < invalidations:
+            await asyncio.sleep(0.01)
+
+
+async def cache_on_both(writer, reader, key, tags):
+    await writer.set_object(key, key, str, tags=tags)
+    await reader.get_object(key, bytes.decode)
+
+
+def test_delete_tags_evicts_only_the_tagged_keys_on_other_replicas(server):
+    async def scenario(writer, reader):
+        await cache_on_both(writer, reader, "efficiency:summary:b1:g1", ["building:b1"])
+        await cache_on_both(writer, reader, "efficiency:summary:b2:g1", ["building:b2"])
+        invalidations = reader._invalidations
+
+        await writer.delete_tags(["building:b1"])
+        await settle(reader, invalidations + 1)
+
+        return (
+            reader.local.get("efficiency:summary:b1:g1"),
+            reader.local.get("efficiency:summary:b2:g1"),
+        )
+
+    assert run(scenario) == (None, "efficiency:summary:b2:g1")
+
+
+def test_bump_generations_evicts_the_counter_on_other_replicas(server):
+    async def scenario(writer, reader):
+        generation = await reader.get_generation("efficiency:generation:b1")
+        await reader.get_generation("efficiency:generation:b2")
+        invalidations = reader._invalidations
+
+        await writer.bump_generations(["efficiency:generation:b1"])
+        await settle(reader, invalidations + 1)
+
+        return (
+            reader.local.get("efficiency:generation:b1"),
+            reader.local.get("efficiency:generation:b2") is not None,
+            await reader.get_generation("efficiency:generation:b1") > generation,
+        )
+
+    assert run(scenario) == (None, True, True)
+
+
+def test_delete_pattern_evicts_matching_keys_on_other_replicas(server):
+    async def scenario(writer, reader):
+        await cache_on_both(writer, reader, "efficiency:summary:b1:g1", None)
+        await cache_on_both(writer, reader, "other:b1", None)
+        invalidations = reader._invalidations
+
+        await writer.delete_pattern("efficiency:*")
+        await settle(reader, invalidations + 1)
+
+        return reader.local.get("efficiency:summary:b1:g1"), reader.local.get(
+            "other:b1"
+        )
+
+    assert run(scenario) == (None, "other:b1")
@@ -322,7 +322,9 @@ export default function BuildingsTable({
                     </TableCell>
                     <TableCell>
                       <span className="truncate block">
-                        {building.latest_calculation?.measure_name || "N/A"}
+                        {building.latest_measure_name ||
+                          building.latest_calculation?.measure_name ||
+                          "N/A"}
                       </span>
                     </TableCell>
                     <TableCell>
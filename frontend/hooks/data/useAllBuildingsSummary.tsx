@@ -33,7 +33,7 @@ const useAllBuildingsSummary = (page: number, limit: number, search?: string) =>
     queryFn: () =>
       GET<AllBuildingsSummaryResponse>(
         `/efficiency/buildings`,
-        { page, limit, search },
+        { page, limit, search, view: "compact" },
         headers
       ),
     enabled: !!token && !!page && !!limit,
@@ -56,9 +56,12 @@ export interface BuildingEfficiencySummary {
   building_id: string
   total_calculations: number
   latest_calculation?: EfficiencyCalculation
+  latest_measure_name?: string
   best_performance_grade?: string
   average_efficiency_improvement?: number
   total_cost_savings?: number
+  efficiency_improvement_percentile?: number
+  cost_savings_percentile?: number
   created_at: string
 }
 